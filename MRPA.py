@@ -10,6 +10,8 @@ Fonctionnement
 1. Télécharge les séries macro via FRED :
    • CPI YoY, PIB réel, taux directeur, chômage  
    • Codes définis dans le dict SERIES (US, FR ; EZ en cours de dev)  
+   • Séries mises en cache localement (SQLite, voir fred_cache.py) :
+     seules les nouvelles observations sont téléchargées  
 2. Calcule :
    • niveaux d’inflation & croissance (levels 0-5)  
    • position relative dans chaque niveau (0-100 %)  
@@ -19,22 +21,26 @@ Fonctionnement
 
 Dépendances
 -----------
-pandas_datareader · numpy · rich
+pandas · requests · numpy · rich
 
 Installation rapide :
-    pip install pandas_datareader numpy rich
+    pip install pandas requests numpy rich
 
 Usage
 -----
-    python MRPA.py [REGION] [YYYY-MM-DD]
+    python MRPA.py [--country REGION] [--start YYYY-MM[-DD]]
 
 Exemples :
-    python MRPA.py US 2023-10-01   # marché américain
-    python MRPA.py FR              # marché français, start par défaut
+    python MRPA.py --country US --start 2023-10   # marché américain
+    python MRPA.py                                # marché français, start par défaut
+
+Toutes les régions (ou une sélection) en une seule exécution :
+    python dashboard.py --regions FR DE IT --start 2000-01
 
 Limites connues
 ---------------
-• Zone euro (EZ) : CPI et PIB OK mais les autres séries sont en validation.  
+• Zone euro (EZ) : CPI et PIB OK mais les autres séries sont en validation ;
+  agrégats pondérés des pays membres : composites.py (dashboard.py --composites).  
 • Pas de gestion des devises ni des effets de couverture FX.  
 • Aucune garantie de performance financière – outil pédagogique.
 
@@ -42,14 +48,18 @@ Auteur : Loïc (2025)
 """
 
 
-import pandas_datareader as pdr
+import argparse
+import warnings
 from datetime import datetime
 from math import tanh
-import numpy as np
 
-from rich.console import Console
-from rich.table  import Table
-from rich.panel  import Panel
+import profiling
+from bands import GROWTH_LEVELS, INFLATION_LEVELS, classify, describe, position_pct
+from cli import parse_start
+from results import Snapshot
+
+# pandas, la couche de téléchargement et rich sont importés dans les fonctions
+# qui s'en servent : importer MRPA (SERIES, seuils, libellés) reste léger.
 
 SERIES = {
     "US": {
@@ -102,97 +112,118 @@ SERIES = {
     },
 }
 
-def get_macro_data(region="FR", start=datetime(2023, 10, 1)):
+def get_macro_data(region="FR", start=datetime(2023, 10, 1), cache=None):
+    """
+    Returns the CPI, GDP, policy-rate and unemployment series of a region.
+    Series are served from the local FRED cache (see fred_cache.py).
+    """
+    from fred_cache import default_cache
+
     codes = SERIES[region]
     end = datetime.now()
+    cache = cache or default_cache()
+
+    with profiling.stage("get_macro_data", region):
+        cpi  = cache.get(codes["cpi"],  start, end)
+        if cpi.empty:
+            raise ValueError(f"Data retrieval failed for CPI in {region}. Please check the data source or the date range.")
+        gdp  = cache.get(codes["gdp"],  start, end)
+        if gdp.empty:
+            raise ValueError(f"Data retrieval failed for GDP in {region}. Please check the data source or the date range.")
+        pol  = cache.get(codes["policy"], start, end)
+        if pol.empty:
+            raise ValueError(f"Data retrieval failed for Policy Rate in {region}. Please check the data source or the date range.")
+        unrt = cache.get(codes["unemp"], start, end)
+        if unrt.empty:
+            raise ValueError(f"Data retrieval failed for Unemployment Rate in {region}. Please check the data source or the date range.")
+
+        return cpi, gdp, pol, unrt
+
+
+def get_macro_data_batch(regions=None, start=datetime(2023, 10, 1), cache=None, max_workers=8):
+    """
+    Fetches the series of several regions at once (all of SERIES by default).
+    Codes shared between regions (ECBMRRFR...) are downloaded only once and
+    the downloads run concurrently. Returns a dict region -> (cpi, gdp, pol, unrt).
+    """
+    from fetch import fetch_series
+    from fred_cache import default_cache
+
+    regions = list(regions or SERIES)
+    end = datetime.now()
+    cache = cache or default_cache()
 
-    cpi  = pdr.get_data_fred(codes["cpi"],  start, end)
-    if cpi.empty:
-        raise ValueError(f"Data retrieval failed for CPI in {region}. Please check the data source or the date range.")
-    gdp  = pdr.get_data_fred(codes["gdp"],  start, end)
-    if gdp.empty:
-        raise ValueError(f"Data retrieval failed for GDP in {region}. Please check the data source or the date range.")
-    pol  = pdr.get_data_fred(codes["policy"], start, end)
-    if pol.empty:
-        raise ValueError(f"Data retrieval failed for Policy Rate in {region}. Please check the data source or the date range.")
-    unrt = pdr.get_data_fred(codes["unemp"], start, end)
-    if unrt.empty:
-        raise ValueError(f"Data retrieval failed for Unemployment Rate in {region}. Please check the data source or the date range.")
+    codes = [SERIES[region][kind] for region in regions for kind in ("cpi", "gdp", "policy", "unemp")]
+    with profiling.stage("get_macro_data_batch"):
+        frames = fetch_series(codes, start, end, cache.get, max_workers=max_workers)
 
-    print()
-    return cpi, gdp, pol, unrt
+    data = {}
+    for region in regions:
+        series = tuple(frames[SERIES[region][kind]] for kind in ("cpi", "gdp", "policy", "unemp"))
+        for name, frame in zip(("CPI", "GDP", "Policy Rate", "Unemployment Rate"), series):
+            if frame.empty:
+                raise ValueError(f"Data retrieval failed for {name} in {region}. Please check the data source or the date range.")
+        data[region] = series
+    return data
 
 
+@profiling.profiled()
 def data_optimization(cpi, gdp, pol, unrt):
+    import numpy as np
+
+    from online_stats import RunningStats
+
     latest_inflation = ((cpi.iloc[-1].item() / cpi.iloc[-13].item()) - 1) * 100
     latest_gdp = ((gdp.iloc[-1].item() / gdp.iloc[-5].item()) - 1) * 100
-    pol_mean = pol.rolling(3).mean()
-    unrt_mean = unrt.rolling(3).mean()
+    pol_mean = np.asarray(pol.rolling(3).mean(), dtype=float).ravel()
+    unrt_mean = np.asarray(unrt.rolling(3).mean(), dtype=float).ravel()
 
-    z_unrate = (unrt_mean.iloc[-1] - unrt_mean.mean()) / unrt_mean.std()
-    z_fed = (pol_mean.iloc[-1] - pol_mean.mean()) / pol_mean.std()
+    # z-score du dernier point sur toute la fenêtre (online_stats, fusion par lot de Welford)
+    z_unrate = RunningStats().extend(unrt_mean).zscore(unrt_mean[-1])
+    z_fed = RunningStats().extend(pol_mean).zscore(pol_mean[-1])
 
     inflation_pressure = z_fed
     growth_pressure = -z_unrate
 
-    inflation_adj = np.tanh(inflation_pressure)
-    growth_adj = np.tanh(growth_pressure)
+    inflation_adj = tanh(inflation_pressure)
+    growth_adj = tanh(growth_pressure)
 
-    return latest_inflation, latest_gdp, pol_mean, unrt_mean, z_unrate, z_fed, inflation_adj, growth_adj
+    return latest_inflation, latest_gdp, z_unrate, z_fed, inflation_adj, growth_adj
 
 
-def analyze_inflation_data(latest_inflation):
-    inflation_level = 0
-    print("Inflation Analysis:")
-
-    if latest_inflation < 0:
-        inflation_level += 0
-        print("Risque déflationniste")
-    elif 0 < latest_inflation < 1:
-        inflation_level += 1
-        print("Très faible dynamique des prix")
-    elif 1 < latest_inflation < 2.5:
-        inflation_level += 2
-        print("Dynamique des prix faible")
-    elif 2.5 < latest_inflation < 3.5:
-        inflation_level += 3
-        print("Dynamique des prix modérée")
-    elif 3.5 < latest_inflation < 4.5:
-        inflation_level += 4
-        print("Dynamique des prix forte")
-    else:
-        inflation_level += 5
-        print("Risque d'hyperinflation")
+def pressure_history(pol, unrt, kind="expanding", **kwargs):
+    """
+    Full point-in-time series of the z-scores and tanh adjustments of
+    data_optimization, z-scored with online_stats.zscores (`kind`: expanding,
+    ewm or rolling).
+    """
+    import numpy as np
+    import pandas as pd
 
-    print()
-    return inflation_level
+    from online_stats import zscores
 
+    z_fed = zscores(pol.rolling(3).mean(), kind, **kwargs)
+    z_unrate = zscores(unrt.rolling(3).mean(), kind, **kwargs)
+    return pd.DataFrame({
+        "z_fed": z_fed,
+        "z_unrate": z_unrate,
+        "inflation_adj": np.tanh(z_fed),
+        "growth_adj": np.tanh(-z_unrate),
+    })
+
+
+def analyze_inflation_data(latest_inflation):
+    """
+    Inflation level 0-5 (description : describe(level, INFLATION_LEVELS)).
+    """
+    return classify(latest_inflation, INFLATION_LEVELS)
 
-def analyze_growth_data(latest_gdp):
-    growth_level = 0
-    print("Growth Analysis:")
-
-    if latest_gdp < -2:
-        growth_level += 0
-        print("Risque de récession")
-    elif -2 <= latest_gdp < 0:
-        growth_level += 1
-        print("Croissance négative")
-    elif 0 <= latest_gdp < 1:
-        growth_level += 2
-        print("Croissance faible")
-    elif 1 <= latest_gdp < 2.5:
-        growth_level += 3
-        print("Croissance modérée")
-    elif 2.5 <= latest_gdp < 4:
-        growth_level += 4
-        print("Croissance forte")
-    else:
-        growth_level += 5
-        print("Risque de surchauffe économique")
 
-    print()
-    return growth_level
+def analyze_growth_data(latest_gdp):
+    """
+    Growth level 0-5 (description : describe(level, GROWTH_LEVELS)).
+    """
+    return classify(latest_gdp, GROWTH_LEVELS)
 
 
 def unemployment_score(unemployment_mean):
@@ -234,36 +265,13 @@ def detect_macro_regime(inflation_level, gdp_level):
 
 def precision_macro_regime(inflation_level, gdp_level, latest_inflation, latest_gdp):
 
-    if inflation_level == 0:
-        infl_pos_pct = ((latest_inflation + 4 ) / ( 4 )) * 100
-    elif inflation_level == 1:
-        infl_pos_pct = ((latest_inflation - 0 ) / (1 - 0)) * 100
-    elif inflation_level == 2:
-        infl_pos_pct = ((latest_inflation - 1 ) / (2.5 - 1)) * 100
-    elif inflation_level == 3:
-        infl_pos_pct = ((latest_inflation - 2.5 ) / (3.5 - 2.5)) * 100
-    elif inflation_level == 4:
-        infl_pos_pct = ((latest_inflation - 3.5 ) / (4.5 - 3.5)) * 100
-    else:
-        infl_pos_pct = ((latest_inflation - 4.5 ) / (8 - 4.5)) * 100
-
-    if gdp_level == 0:
-        gdp_pos_pct = ((latest_gdp + 6 ) / (-2 + 6 )) * 100
-    elif gdp_level == 1:
-        gdp_pos_pct = ((latest_gdp - 2 ) / (0 + 2)) * 100
-    elif gdp_level == 2:
-        gdp_pos_pct = ((latest_gdp - 0 ) / (1 - 0)) * 100
-    elif gdp_level == 3:
-        gdp_pos_pct = ((latest_gdp - 1 ) / (2.5 - 1)) * 100
-    elif gdp_level == 4:
-        gdp_pos_pct = ((latest_gdp - 2.5 ) / (4 - 2.5)) * 100
-    else:
-        gdp_pos_pct = ((latest_gdp - 4 ) / (8 - 4)) * 100
+    infl_pos_pct = position_pct(latest_inflation, inflation_level, INFLATION_LEVELS)
+    gdp_pos_pct = position_pct(latest_gdp, gdp_level, GROWTH_LEVELS)
 
     if infl_pos_pct < 0 or gdp_pos_pct < 0:
-        print("Warning: Negative position percentage detected. Please check the data.")
+        warnings.warn("Negative position percentage detected. Please check the data.")
     if infl_pos_pct > 100 or gdp_pos_pct > 100:
-        print("Warning: Position percentage exceeds 100%. Please check the data.")
+        warnings.warn("Position percentage exceeds 100%. Please check the data.")
     
     return infl_pos_pct, gdp_pos_pct
 
@@ -280,46 +288,76 @@ def portflio_macro_alocation(inflation_level, gdp_level):
     else:
         return "Stratégie d'allocation indéterminée"
     
-def compute_latest_snapshot(region="FR", start=datetime(2023, 10, 1)):
-    cpi, gdp, pol, unrt = get_macro_data(region, start)
-    latest_inflation, latest_gdp, *_ = data_optimization(cpi, gdp, pol, unrt)
-    infl_lvl = analyze_inflation_data(latest_inflation)
-    gdp_lvl  = analyze_growth_data(latest_gdp)
-    regime   = detect_macro_regime(infl_lvl, gdp_lvl)
-    return {
-        "date": cpi.index[-1],             # ou datetime.today()
-        "inflation": latest_inflation,
-        "growth": latest_gdp,
-        "infl_lvl": infl_lvl,
-        "gdp_lvl": gdp_lvl,
-        "regime": regime,
-    }
-    
-def main():
-    cpi, gdp, pol, unrt = get_macro_data("FR", datetime(2023, 10, 1))
-    latest_inflation, latest_gdp, pol_mean, unrt_mean, z_unrate, z_fed, inflation_adj, growth_adj = data_optimization(cpi, gdp, pol, unrt)
+@profiling.profiled("snapshot")
+def snapshot_from_data(cpi, gdp, pol, unrt, region=None):
+    """
+    Latest levels, position %, regime and allocation of already fetched series.
+    """
+    latest_inflation, latest_gdp, _, _, inflation_adj, growth_adj = data_optimization(cpi, gdp, pol, unrt)
+    infl_lvl = classify(latest_inflation, INFLATION_LEVELS)
+    gdp_lvl  = classify(latest_gdp, GROWTH_LEVELS)
+    return Snapshot(
+        region=region,
+        date=str(cpi.index[-1].date()),    # ou datetime.today()
+        inflation=latest_inflation,
+        growth=latest_gdp,
+        infl_lvl=infl_lvl,
+        gdp_lvl=gdp_lvl,
+        infl_pos_pct=position_pct(latest_inflation, infl_lvl, INFLATION_LEVELS),
+        gdp_pos_pct=position_pct(latest_gdp, gdp_lvl, GROWTH_LEVELS),
+        inflation_adj=inflation_adj,
+        growth_adj=growth_adj,
+        regime=detect_macro_regime(infl_lvl, gdp_lvl),
+        allocation=portflio_macro_alocation(infl_lvl, gdp_lvl),
+    )
+
+
+def compute_latest_snapshot(region="FR", start=datetime(2023, 10, 1), cache=None):
+    cpi, gdp, pol, unrt = get_macro_data(region, start, cache=cache)
+    return snapshot_from_data(cpi, gdp, pol, unrt, region)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Macro dashboard of one region.")
+    parser.add_argument("--country", default="FR", choices=sorted(SERIES), help="région (clé de SERIES)")
+    parser.add_argument("--start", default=datetime(2023, 10, 1), type=parse_start, help="début des séries, YYYY-MM[-DD]")
+    profiling.add_argument(parser)
+    args = parser.parse_args(argv)
+
+    with profiling.from_args(args):
+        _main(args)
+
+
+def _main(args):
+    from rich.console import Console
+    from rich.table  import Table
+    from rich.panel  import Panel
+
+    cpi, gdp, pol, unrt = get_macro_data(args.country, args.start)
+    latest_inflation, latest_gdp, z_unrate, z_fed, inflation_adj, growth_adj = data_optimization(cpi, gdp, pol, unrt)
     inflation_level = analyze_inflation_data(latest_inflation)
     growth_level = analyze_growth_data(latest_gdp)
     macro_regime = detect_macro_regime(inflation_level, growth_level)
     infl_pos_pct, gdp_pos_pct = precision_macro_regime(inflation_level, growth_level, latest_inflation, latest_gdp)
 
+    with profiling.stage("render"):
+        console = Console()
 
-    console = Console()
+        table = Table(title="Macro Dashboard", show_header=True, header_style="bold magenta")
+        table.add_column("Metric",  justify="left")
+        table.add_column("Value",   justify="right")
 
-    table = Table(title="Macro Dashboard", show_header=True, header_style="bold magenta")
-    table.add_column("Metric",  justify="left")
-    table.add_column("Value",   justify="right")
+        table.add_row("Latest CPI YoY",  f"{latest_inflation:,.2f} %")
+        table.add_row("Inflation level", f"{inflation_level} – {describe(inflation_level, INFLATION_LEVELS)}")
+        table.add_row("Infl pos %",      f"{infl_pos_pct:.1f} %")
+        table.add_row("Latest GDP YoY",  f"{latest_gdp:,.2f} %")
+        table.add_row("Growth level",    f"{growth_level} – {describe(growth_level, GROWTH_LEVELS)}")
+        table.add_row("GDP pos %",       f"{gdp_pos_pct:.1f} %")
 
-    table.add_row("Latest CPI YoY",  f"{latest_inflation:,.2f} %")
-    table.add_row("Inflation level", str(inflation_level))
-    table.add_row("Infl pos %",      f"{infl_pos_pct:.1f} %")
-    table.add_row("Latest GDP YoY",  f"{latest_gdp:,.2f} %")
-    table.add_row("Growth level",    str(growth_level))
-    table.add_row("GDP pos %",       f"{gdp_pos_pct:.1f} %")
+        console.print(table)
+        console.print(Panel(f"[bold yellow]Macro Regime[/bold yellow]\n{macro_regime}", expand=False))
+        console.print(Panel(f"[bold blue]Macro Portfolio[/bold blue]\n{portflio_macro_alocation(inflation_level, growth_level)}", expand=False))
 
-    console.print(table)
-    console.print(Panel(f"[bold yellow]Macro Regime[/bold yellow]\n{macro_regime}", expand=False))
-    console.print(Panel(f"[bold blue]Macro Portfolio[/bold blue]\n{portflio_macro_alocation(inflation_level, growth_level)}", expand=False))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
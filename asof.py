@@ -0,0 +1,229 @@
+"""
+Point-in-time ("as-of") view of the macro series.
+
+FRED serves the latest revised vintage, dated by observation period. An
+observation is only known once it is published: AsOfSeries attaches a
+release date to every observation (period end + a per-series lag, or the
+realtime_start of stored ALFRED-style vintages) and answers "what was known
+on date t" for many dates at once — one searchsorted over the sorted release
+dates, not one re-slice per date.
+
+    engine = AsOfEngine(cpi, gdp, pol, unrt)
+    engine.truncate("2008-10-15")            # séries connues à cette date
+    engine.regimes(pd.date_range("2000-01-31", "2024-12-31", freq="ME"))
+
+Without vintages the values are the current vintage (revisions still leak,
+only the publication timing is honest); with vintages every value is the
+one published at the as-of date.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bands import GROWTH_LEVELS, GROWTH_STEPS, INFLATION_LEVELS, INFLATION_STEPS, classify, position_pct
+from transforms import as_series
+
+
+# kind -> (months per observation, days between the end of the period and the release)
+# CPI : ~mi-mois suivant ; PIB : estimation avancée ~30 j après le trimestre ;
+# taux directeur : connu en fin de période ; chômage harmonisé (OCDE) : ~5 semaines
+RELEASE_LAGS = {
+    "cpi": (1, 15),
+    "gdp": (3, 30),
+    "policy": (1, 0),
+    "unemp": (1, 35),
+}
+
+_KINDS = ("cpi", "gdp", "policy", "unemp")
+
+
+def _days(dates):
+    return np.asarray(pd.DatetimeIndex(dates).values.astype("datetime64[D]"), dtype=np.int64)
+
+
+def release_dates(obs_dates, months, lag_days):
+    """
+    Publication date of each observation: end of its period + lag_days.
+    """
+    start = pd.DatetimeIndex(obs_dates).values.astype("datetime64[M]")
+    return (start + months).astype("datetime64[D]") + np.timedelta64(lag_days, "D")
+
+
+class AsOfSeries:
+    """
+    One series with the release date of each observation, and optionally
+    several published values (vintages) per observation.
+    """
+
+    def __init__(self, obs_dates, values, releases, vintage_obs=None):
+        """
+        obs_dates     sorted observation dates (one per observation)
+        values        value of each observation, or of each vintage when
+                      vintage_obs is given
+        releases      release date of each observation, or of each vintage
+        vintage_obs   observation index of each vintage (None: one vintage each)
+        """
+        self.obs_dates = pd.DatetimeIndex(obs_dates)
+        values = np.asarray(values, dtype=float)
+        releases = _days(releases)
+        if vintage_obs is None:
+            vintage_obs = np.arange(len(self.obs_dates))
+        vintage_obs = np.asarray(vintage_obs, dtype=np.int64)
+
+        order = np.lexsort((releases, vintage_obs))
+        self._vintage_obs, self._releases, self._values = vintage_obs[order], releases[order], values[order]
+        first = np.full(len(self.obs_dates), np.iinfo(np.int64).max)
+        np.minimum.at(first, self._vintage_obs, self._releases)
+        # an observation is only usable once it and every earlier one are published
+        self._first_release = np.maximum.accumulate(first)
+        # clé de recherche unique (observation, date de publication), triée
+        self._origin = int(self._releases.min()) if releases.size else 0
+        self._span = int(self._releases.max()) - self._origin + 1 if releases.size else 1
+        self._keys = self._vintage_obs * self._span + (self._releases - self._origin)
+
+    @classmethod
+    def from_frame(cls, data, kind=None, months=1, lag_days=0):
+        """
+        Current-vintage FRED series, released `lag_days` after each period
+        (RELEASE_LAGS[kind] when kind is given).
+        """
+        series = as_series(data).dropna()
+        if kind is not None:
+            months, lag_days = RELEASE_LAGS[kind]
+        return cls(series.index, series.to_numpy(), release_dates(series.index, months, lag_days))
+
+    @classmethod
+    def from_vintages(cls, table):
+        """
+        Vintages in ALFRED layout: columns date, realtime_start, value
+        (one row per published value of an observation).
+        """
+        table = table.dropna(subset=["value"])
+        obs_dates, vintage_obs = np.unique(table["date"].to_numpy(dtype="datetime64[ns]"), return_inverse=True)
+        return cls(obs_dates, table["value"].to_numpy(), table["realtime_start"].to_numpy(), vintage_obs)
+
+    def known_count(self, asof):
+        """
+        Number of observations published at each as-of date.
+        """
+        return np.searchsorted(self._first_release, _days(np.atleast_1d(asof)), side="right")
+
+    def latest(self, asof, offset=0):
+        """
+        (observation dates, values) of the latest observation minus `offset`
+        known at each as-of date, with the value published at that date.
+        NaT / NaN where not enough observations were known.
+        """
+        days = _days(np.atleast_1d(asof))
+        idx = np.searchsorted(self._first_release, days, side="right") - 1 - offset
+        valid = idx >= 0
+        idx = np.where(valid, idx, 0)
+        pos = self._vintage(idx, days)
+        valid &= self._vintage_obs[pos] == idx
+        values = np.where(valid, self._values[pos], np.nan)
+        dates = np.where(valid, self.obs_dates.values[idx], np.datetime64("NaT"))
+        return pd.DatetimeIndex(dates), values
+
+    def _vintage(self, idx, days):
+        # position of the last vintage of observation idx published by `days`
+        query = idx * self._span + np.clip(days - self._origin, -1, self._span - 1)
+        return np.maximum(np.searchsorted(self._keys, query, side="right") - 1, 0)
+
+    def asof(self, date):
+        """
+        The series as it was known on `date` (DATE-indexed Series).
+        """
+        day = _days([date])
+        n = int(np.searchsorted(self._first_release, day[0], side="right"))
+        idx = np.arange(n)
+        pos = self._vintage(idx, np.repeat(day, n))
+        values = np.where(self._vintage_obs[pos] == idx, self._values[pos], np.nan)
+        return pd.Series(values, index=pd.DatetimeIndex(self.obs_dates[:n], name="DATE"))
+
+
+class AsOfEngine:
+    """
+    Point-in-time inputs and regimes of one region.
+    `vintages` optionally maps a kind (cpi, gdp, policy, unemp) to an
+    ALFRED-style table that replaces the current vintage of that series.
+    """
+
+    def __init__(self, cpi, gdp, pol, unrt, lags=RELEASE_LAGS, vintages=None):
+        vintages = vintages or {}
+        self.series = {}
+        for kind, data in zip(_KINDS, (cpi, gdp, pol, unrt)):
+            if kind in vintages:
+                self.series[kind] = AsOfSeries.from_vintages(vintages[kind])
+            else:
+                self.series[kind] = AsOfSeries.from_frame(data, months=lags[kind][0], lag_days=lags[kind][1])
+
+    @classmethod
+    def from_cache(cls, region, start, cache=None, lags=RELEASE_LAGS):
+        """
+        Engine of a region from the FRED cache, using the vintages stored in
+        the cache (FredCache.seed_vintages) for the series that have some.
+        """
+        from fred_cache import default_cache
+        from MRPA import SERIES, get_macro_data
+
+        cache = cache or default_cache()
+        data = get_macro_data(region, start, cache=cache)
+        vintages = {kind: cache.vintages(SERIES[region][kind]) for kind in _KINDS}
+        return cls(*data, lags=lags, vintages={kind: table for kind, table in vintages.items() if not table.empty})
+
+    def truncate(self, date):
+        """
+        (cpi, gdp, pol, unrt) as known on `date`, in the FRED DataFrame
+        shape: snapshot_from_data(*engine.truncate(date)) is the snapshot
+        that could have been computed that day.
+        """
+        return tuple(self.series[kind].asof(date).to_frame(kind) for kind in _KINDS)
+
+    def inputs(self, asof):
+        """
+        One row per as-of date: dates of the latest known CPI / GDP
+        observations, inflation and growth YoY from them, and the 3-month
+        means of the policy and unemployment rates.
+        """
+        asof = pd.DatetimeIndex(np.atleast_1d(asof))
+        cpi_date, cpi_now = self.series["cpi"].latest(asof)
+        _, cpi_year = self.series["cpi"].latest(asof, 12)
+        gdp_date, gdp_now = self.series["gdp"].latest(asof)
+        _, gdp_year = self.series["gdp"].latest(asof, 4)
+        pol = np.column_stack([self.series["policy"].latest(asof, k)[1] for k in range(3)])
+        unrt = np.column_stack([self.series["unemp"].latest(asof, k)[1] for k in range(3)])
+        return pd.DataFrame(
+            {
+                "cpi_date": cpi_date,
+                "inflation": (cpi_now / cpi_year - 1) * 100,
+                "gdp_date": gdp_date,
+                "growth": (gdp_now / gdp_year - 1) * 100,
+                "pol_mean": pol.mean(axis=1),
+                "unrt_mean": unrt.mean(axis=1),
+            },
+            index=pd.DatetimeIndex(asof, name="asof"),
+        )
+
+    def regimes(self, asof):
+        """
+        inputs() plus the levels, position % and quadrant index (QUADRANTS of
+        regime_duration, 4 "Zone grise" when unknown) that were computable at
+        each date. The quadrant uses the 0.5-point steps of
+        advanced_portfolio_allocation (backtest.quadrant_index of the steps),
+        so it feeds backtest.backtest_quadrants directly.
+        """
+        from backtest import quadrant_index
+
+        frame = self.inputs(asof)
+        inflation, growth = frame["inflation"].to_numpy(), frame["growth"].to_numpy()
+        known = ~(np.isnan(inflation) | np.isnan(growth))
+        infl_lvl = classify(inflation, INFLATION_LEVELS)
+        gdp_lvl = classify(growth, GROWTH_LEVELS)
+        frame["infl_lvl"] = np.where(known, infl_lvl, -1).astype(np.int8)
+        frame["gdp_lvl"] = np.where(known, gdp_lvl, -1).astype(np.int8)
+        frame["infl_pos_pct"] = np.where(known, position_pct(inflation, infl_lvl, INFLATION_LEVELS), np.nan)
+        frame["gdp_pos_pct"] = np.where(known, position_pct(growth, gdp_lvl, GROWTH_LEVELS), np.nan)
+        # paliers de 0.5 point, comme l'allocation backtestée (pas les niveaux affichés)
+        quadrant = quadrant_index(classify(inflation, INFLATION_STEPS), classify(growth, GROWTH_STEPS))
+        frame["quadrant"] = np.where(known, quadrant, 4).astype(np.int8)
+        return frame
@@ -0,0 +1,177 @@
+"""
+Walk-forward backtest of the quadrant allocations of advanced_portfolio_allocation.
+
+The whole quadrant history is mapped to weights and applied to monthly asset
+returns (Actions, Or, Cash, Obligations) loaded from a local CSV/Parquet file.
+Everything is computed with NumPy over the time axis — no per-month loop —
+and any leading dimensions of the weights array are treated as independent
+variants, so a grid of thresholds is backtested in a single call.
+
+Return files hold one row per month (date index, first column) and simple
+returns in decimal form (0.01 = +1 %), one column per asset of ASSETS.
+"""
+
+import numpy as np
+import pandas as pd
+
+from regime_duration import ASSETS, QUADRANT_WEIGHTS, QUADRANTS
+
+
+# (5, 4) matrix: row = quadrant index in QUADRANTS, column = asset of ASSETS
+WEIGHT_TABLE = np.array(
+    [[QUADRANT_WEIGHTS[quadrant][asset] for asset in ASSETS] for quadrant in QUADRANTS],
+    dtype=float,
+) / 100
+
+
+def load_returns(path):
+    """
+    Reads monthly asset returns from a .csv or .parquet file.
+    """
+    if str(path).endswith(".parquet"):
+        returns = pd.read_parquet(path)
+    else:
+        returns = pd.read_csv(path, index_col=0, parse_dates=True)
+    returns.index = pd.DatetimeIndex(returns.index).to_period("M").to_timestamp("M")
+    return returns[ASSETS].astype(float)
+
+
+def quadrant_index(infl_lvl, gdp_lvl, infl_threshold=2, gdp_threshold=2):
+    """
+    Quadrant index (position in QUADRANTS) of each month. Thresholds may be
+    arrays: they broadcast against the levels, e.g. thresholds of shape
+    (V, 1) and levels of shape (T,) give (V, T) codes. NaN levels are
+    "Zone grise" (index 4).
+    """
+    infl_lvl = np.asarray(infl_lvl, dtype=float)
+    gdp_lvl = np.asarray(gdp_lvl, dtype=float)
+    infl_plus = infl_lvl >= np.asarray(infl_threshold)
+    gdp_plus = gdp_lvl >= np.asarray(gdp_threshold)
+    codes = np.where(infl_plus, 0, 2) + np.where(gdp_plus, 0, 1)
+    return np.where(np.isnan(infl_lvl) | np.isnan(gdp_lvl), 4, codes)
+
+
+def weights_from_codes(codes, table=WEIGHT_TABLE):
+    """
+    Maps quadrant indices (..., T) to target weights (..., T, n_assets).
+    """
+    return np.asarray(table)[np.asarray(codes)]
+
+
+def backtest(weights, returns, rebalance=1, lag=1, cost=0.0):
+    """
+    Runs the backtest of target weights (..., T, A) on returns (T, A).
+
+    lag        months between the signal date and the first month it is traded
+               (publication delay); earlier months are left uninvested
+    rebalance  rebalancing period in months; weights drift with the assets in
+               between
+    cost       proportional cost charged on the one-way turnover
+
+    Weights that sum to less than one leave the remainder uninvested at a
+    zero return. Returns a dict of arrays over (..., T): returns, equity,
+    turnover and drawdown.
+    """
+    weights = np.asarray(weights, dtype=float)
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    n = returns.shape[0]
+    if weights.shape[-2] != n:
+        raise ValueError(f"Weights cover {weights.shape[-2]} months but returns cover {n}.")
+    if not 0 <= lag < n:
+        raise ValueError(f"A lag of {lag} months leaves no month to trade in {n} months of returns.")
+    if rebalance < 1:
+        raise ValueError(f"The rebalancing period must be at least one month, got {rebalance}.")
+
+    # publication lag
+    if lag:
+        lagged = np.zeros_like(weights)
+        lagged[..., lag:, :] = weights[..., :n - lag, :]
+        weights = lagged
+
+    # weights held since the last rebalancing date
+    t = np.arange(n)
+    start = np.maximum.accumulate(np.where(t % rebalance == 0, t, 0))
+    held = weights[..., start, :]
+
+    # log growth of each asset: growth over [s, t] = exp(log_growth[t + 1] - log_growth[s])
+    log_growth = np.vstack([np.zeros(returns.shape[1]), np.cumsum(np.log1p(returns), axis=0)])
+    cash = 1 - held.sum(axis=-1)
+    growth_open = np.exp(log_growth[t] - log_growth[start])
+    growth_close = np.exp(log_growth[t + 1] - log_growth[start])
+    value_open = (held * growth_open).sum(axis=-1) + cash
+    value_close = (held * growth_close).sum(axis=-1) + cash
+    gross = value_close / value_open - 1
+
+    # drifted weights just before each rebalancing (from the previous period)
+    prev_held = np.zeros_like(held)
+    prev_held[..., 1:, :] = held[..., :-1, :]
+    prev_value = np.ones_like(value_close)
+    prev_value[..., 1:] = value_close[..., :-1]
+    prev_growth = np.ones_like(growth_open)
+    prev_growth[1:] = growth_close[:-1]
+    drifted = prev_held * prev_growth / prev_value[..., None]
+    rebalanced = start == t
+    turnover = np.where(rebalanced, 0.5 * np.abs(held - drifted).sum(axis=-1), 0.0)
+
+    net = gross - cost * turnover
+    equity = np.exp(np.cumsum(np.log1p(net), axis=-1))
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1
+    return {"returns": net, "equity": equity, "turnover": turnover, "drawdown": drawdown}
+
+
+def summary(result, periods_per_year=12):
+    """
+    Reduces a backtest result to per-variant metrics (arrays over the leading dims).
+    """
+    net = result["returns"]
+    years = net.shape[-1] / periods_per_year
+    vol = net.std(axis=-1, ddof=1) * np.sqrt(periods_per_year)
+    cagr = result["equity"][..., -1] ** (1 / years) - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, net.mean(axis=-1) * periods_per_year / vol, np.nan)
+    return {
+        "total_return": result["equity"][..., -1] - 1,
+        "cagr": cagr,
+        "volatility": vol,
+        "sharpe": sharpe,
+        "max_drawdown": result["drawdown"].min(axis=-1),
+        "turnover": result["turnover"].sum(axis=-1) / years,
+    }
+
+
+def align_quadrants(quadrant_codes, index):
+    """
+    Quadrant indices of a date-indexed Series of quadrant labels (or
+    indices), carried forward onto the month-end dates of `index` (4 before
+    the first known quadrant).
+    """
+    codes = pd.Series(quadrant_codes)
+    if codes.dtype == object:
+        codes = codes.map({label: i for i, label in enumerate(QUADRANTS)})
+    codes.index = pd.DatetimeIndex(codes.index).to_period("M").to_timestamp("M")
+    return codes.reindex(index, method="ffill").fillna(4).astype(int).to_numpy()
+
+
+def backtest_quadrants(quadrant_codes, returns, rebalance=1, lag=1, cost=0.0):
+    """
+    Backtests a date-indexed Series of quadrant labels (or indices) against a
+    returns DataFrame. Quadrants are carried forward onto the returns dates.
+    Returns a DataFrame with returns, equity, turnover and drawdown.
+    """
+    codes = align_quadrants(quadrant_codes, returns.index)
+    result = backtest(weights_from_codes(codes), returns.to_numpy(), rebalance, lag, cost)
+    return pd.DataFrame(result, index=returns.index)
+
+
+def threshold_grid(infl_lvl, gdp_lvl, returns, infl_thresholds, gdp_thresholds, rebalance=1, lag=1, cost=0.0):
+    """
+    Backtests every (inflation, growth) threshold pair at once. Levels and
+    returns must be aligned on the same T months. Returns a DataFrame of
+    metrics indexed by the threshold pair.
+    """
+    ti, tg = np.meshgrid(np.asarray(infl_thresholds, dtype=float), np.asarray(gdp_thresholds, dtype=float), indexing="ij")
+    ti, tg = ti.ravel(), tg.ravel()
+    codes = quadrant_index(infl_lvl, gdp_lvl, ti[:, None], tg[:, None])
+    metrics = summary(backtest(weights_from_codes(codes), returns, rebalance, lag, cost))
+    index = pd.MultiIndex.from_arrays([ti, tg], names=["infl_threshold", "gdp_threshold"])
+    return pd.DataFrame(metrics, index=index)
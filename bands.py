@@ -0,0 +1,109 @@
+"""
+Declarative band tables used to turn indicator values into levels.
+
+Each table lists the band edges (ascending) and one label per band, so a
+table with n edges has n + 1 labels. Bands are closed on the left:
+``edges[i-1] <= x < edges[i]`` gets ``labels[i]``, values below the first
+edge get ``labels[0]`` and values at or above the last edge (or NaN) get
+``labels[-1]``.
+
+The functions return NumPy arrays (scalars for scalar input) whatever the
+input; pandas callers put the result back on their index. NumPy itself is
+only imported on the first call, so importing the tables stays cheap.
+"""
+
+
+# Niveaux 0-5 du dashboard (MRPA.analyze_inflation_data / analyze_growth_data)
+INFLATION_LEVELS = {
+    "edges":  [0, 1, 2.5, 3.5, 4.5],
+    "labels": [0, 1, 2, 3, 4, 5],
+    # bornes utilisées pour la position % dans chaque niveau (precision_macro_regime)
+    "bounds": [-4, 0, 1, 2.5, 3.5, 4.5, 8],
+    "descriptions": [
+        "Risque déflationniste",
+        "Très faible dynamique des prix",
+        "Dynamique des prix faible",
+        "Dynamique des prix modérée",
+        "Dynamique des prix forte",
+        "Risque d'hyperinflation",
+    ],
+}
+
+GROWTH_LEVELS = {
+    "edges":  [-2, 0, 1, 2.5, 4],
+    "labels": [0, 1, 2, 3, 4, 5],
+    "bounds": [-6, -2, 0, 1, 2.5, 4, 8],
+    "descriptions": [
+        "Risque de récession",
+        "Croissance négative",
+        "Croissance faible",
+        "Croissance modérée",
+        "Croissance forte",
+        "Risque de surchauffe économique",
+    ],
+}
+
+# Paliers de 0.5 point de regime_duration.detect_previous_regime : chaque
+# palier est étiqueté par sa borne haute.
+INFLATION_STEPS = {
+    "edges":  [0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5],
+    "labels": [0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5],
+}
+
+GROWTH_STEPS = {
+    "edges":  [-2, -1, 0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4],
+    "labels": [-2, -1, 0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 5],
+}
+
+# Bandes de régime appliquées aux paliers ci-dessus
+INFLATION_BANDS = {
+    "edges":  [0, 1, 2, 3, 4],
+    "labels": [0, 1, 2, 3, 4, 5],
+}
+
+GROWTH_BANDS = {
+    "edges":  [-2, 0, 2, 4],
+    "labels": [0, 1, 2, 3, 4],
+}
+
+
+def band_index(values, table):
+    """
+    Returns the band number (0 .. len(edges)) of each value.
+    """
+    import numpy as np
+
+    return np.searchsorted(np.asarray(table["edges"], dtype=float), values, side="right")
+
+
+def classify(values, table):
+    """
+    Maps a scalar, list, NumPy array or pandas Series to the table labels in
+    one vectorized call: an array of labels, or a scalar for a scalar.
+    """
+    import numpy as np
+
+    labels = np.asarray(table["labels"])
+    out = labels[band_index(np.asarray(values, dtype=float), table)]
+    return out if out.ndim else out.item()
+
+
+def position_pct(values, levels, table):
+    """
+    Position (in %) of each value inside the band of its level, using the
+    table "bounds" (one more entry than labels). Scalars or arrays.
+    """
+    import numpy as np
+
+    bounds = np.asarray(table["bounds"], dtype=float)
+    idx = np.searchsorted(np.asarray(table["labels"]), levels)
+    lower, upper = bounds[idx], bounds[idx + 1]
+    out = (np.asarray(values, dtype=float) - lower) / (upper - lower) * 100
+    return out if out.ndim else out.item()
+
+
+def describe(level, table):
+    """
+    Returns the description of a level of the table.
+    """
+    return table["descriptions"][table["labels"].index(level)]
@@ -0,0 +1,64 @@
+"""
+Compares the vectorized band classification (bands.classify) with the
+per-element if/elif ladder it replaced in detect_previous_regime.
+
+    python benchmarks/bench_classification.py [N_MONTHS]
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bands import INFLATION_STEPS, classify
+
+
+def ladder_inflation_steps(inflation_list):
+    """Ancienne boucle de detect_previous_regime (référence)."""
+    infl_lvl_list = []
+    for x in inflation_list:
+        if x < 0:
+            infl_lvl_list.append(0)
+        elif x < 0.5:
+            infl_lvl_list.append(0.5)
+        elif x < 1:
+            infl_lvl_list.append(1)
+        elif x < 1.5:
+            infl_lvl_list.append(1.5)
+        elif x < 2:
+            infl_lvl_list.append(2)
+        elif x < 2.5:
+            infl_lvl_list.append(2.5)
+        elif x < 3:
+            infl_lvl_list.append(3)
+        elif x < 3.5:
+            infl_lvl_list.append(3.5)
+        elif x < 4:
+            infl_lvl_list.append(4)
+        elif x < 4.5:
+            infl_lvl_list.append(4.5)
+        else:
+            infl_lvl_list.append(5)
+    return infl_lvl_list
+
+
+def main(n_months):
+    rng = np.random.default_rng(0)
+    values = rng.normal(2.5, 2.0, n_months)
+    as_list = values.tolist()
+
+    assert np.array_equal(classify(values, INFLATION_STEPS), ladder_inflation_steps(as_list))
+
+    repeat = 20
+    loop = min(timeit.repeat(lambda: ladder_inflation_steps(as_list), number=1, repeat=repeat))
+    vect = min(timeit.repeat(lambda: classify(values, INFLATION_STEPS), number=1, repeat=repeat))
+    print(f"{n_months} months  ladder: {loop * 1e3:8.3f} ms  classify: {vect * 1e3:8.3f} ms  speedup: x{loop / vect:.1f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [600, 8 * 600, 100_000]
+    for size in sizes:
+        main(size)
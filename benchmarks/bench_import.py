@@ -0,0 +1,62 @@
+"""
+Start-up cost of the entry points, measured with ``python -X importtime``.
+
+    python benchmarks/bench_import.py                 # rapport
+    python benchmarks/bench_import.py --max-ms 400    # échoue au-delà (CI)
+
+For each module, prints the cumulative import time of the module itself and
+the heaviest imports it pulls in, plus whether pandas / matplotlib were loaded.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["paths", "dashboard", "MRPA", "regime_duration"]
+
+
+def import_times(module=None):
+    """
+    Returns {imported module: cumulative microseconds} for `import module`
+    (interpreter start-up only when module is None).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times[name.strip()] = max(times.get(name.strip(), 0), int(cumulative))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--max-ms", type=float, help="échec si un module dépasse cette durée")
+    parser.add_argument("--top", type=int, default=5, help="imports les plus lourds à afficher")
+    args = parser.parse_args(argv)
+
+    startup = set(import_times())
+    failed = False
+    for module in args.modules:
+        times = {name: t for name, t in import_times(module).items() if name not in startup}
+        total = times.get(module, 0) / 1000
+        heavy = [name for name in ("numpy", "pandas", "matplotlib", "rich", "requests") if name in times]
+        print(f"{module:<18} {total:8.1f} ms   loads: {', '.join(heavy) or '-'}")
+        top = sorted(((t, n) for n, t in times.items() if "." not in n and n != module), reverse=True)
+        for t, name in top[:args.top]:
+            print(f"    {name:<24} {t / 1000:8.1f} ms")
+        if args.max_ms is not None and total > args.max_ms:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
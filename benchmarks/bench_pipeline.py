@@ -0,0 +1,161 @@
+"""
+Timings of the regime pipeline on synthetic data (synthetic.py), from 10 to
+10,000 years of monthly observations.
+
+    python benchmarks/bench_pipeline.py                        # toutes les tailles
+    python benchmarks/bench_pipeline.py --sizes 10 100 --repeat 3
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<commit>.json
+
+Each run is stored in benchmarks/results/<commit>.json (median seconds per
+benchmark and size) so that two commits can be compared with --compare.
+The classes follow the asv layout (params, setup, time_*), so the same file
+can be collected by ``asv run`` as well.
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from history import regime_history
+from MRPA import SERIES, data_optimization, get_macro_data_batch, snapshot_from_data
+from regime_duration import advanced_portfolio_allocation, detect_previous_regime, long_data_optimization
+from results import write_records
+from synthetic import region_series, synthetic_macro
+
+SIZES = [10, 100, 1000, 10000]
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+class Pipeline:
+    """
+    One region, every stage of MRPA.py and regime_duration.py.
+    """
+
+    params = SIZES
+    param_names = ["years"]
+
+    def setup(self, years):
+        self.data = synthetic_macro(years)
+        self.long = long_data_optimization(*self.data)
+        _, _, self.inflation_list, self.gdp_list, self.gdp_m_list, _, _, self.unrt_chg = self.long
+        self.analysis = detect_previous_regime(self.inflation_list, self.gdp_list, self.gdp_m_list, self.unrt_chg)
+
+    def time_data_optimization(self, years):
+        data_optimization(*self.data)
+
+    def time_long_data_optimization(self, years):
+        long_data_optimization(*self.data)
+
+    def time_detect_previous_regime(self, years):
+        detect_previous_regime(self.inflation_list, self.gdp_list, self.gdp_m_list, self.unrt_chg)
+
+    def time_advanced_portfolio_allocation(self, years):
+        advanced_portfolio_allocation(self.analysis.infl_lvl_list, self.analysis.gdp_m_lvl_list, *self.long[:2])
+
+    def time_regime_history(self, years):
+        regime_history(*self.data)
+
+
+class Dashboard:
+    """
+    End-to-end dashboard run over every region of SERIES, from an offline
+    FredCache seeded with synthetic series (cached dates are read back in ns,
+    hence the smaller sizes).
+    """
+
+    params = [10, 100]
+    param_names = ["years"]
+
+    def setup(self, years):
+        from fred_cache import FredCache
+
+        self.directory = tempfile.mkdtemp(prefix="mrpa-bench-")
+        self.cache = FredCache(os.path.join(self.directory, "fred.sqlite"), offline=True)
+        for code, frame in region_series(years=years).items():
+            self.cache.seed(code, frame)
+        self.start = datetime(2025 - years, 1, 1)
+
+    def teardown(self, years):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_dashboard(self, years):
+        data = get_macro_data_batch(list(SERIES), self.start, cache=self.cache)
+        snapshots = [snapshot_from_data(*data[region], region) for region in SERIES]
+        write_records(snapshots, "ndjson", stream=io.StringIO())
+
+
+def commit_id():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(sizes, repeat):
+    """
+    Returns {"Class.time_x": {years: median seconds}}.
+    """
+    timings = {}
+    for cls in (Pipeline, Dashboard):
+        for years in cls.params:
+            if years not in sizes:
+                continue
+            bench = cls()
+            bench.setup(years)
+            try:
+                for name in sorted(n for n in dir(cls) if n.startswith("time_")):
+                    method = getattr(bench, name)
+                    seconds = statistics.median(timeit.repeat(lambda: method(years), number=1, repeat=repeat))
+                    timings.setdefault(f"{cls.__name__}.{name}", {})[str(years)] = seconds
+                    print(f"{cls.__name__}.{name:<36} {years:>6} y  {seconds * 1e3:10.2f} ms")
+            finally:
+                if hasattr(bench, "teardown"):
+                    bench.teardown(years)
+    return timings
+
+
+def compare(timings, reference):
+    print(f"\n{'benchmark':<48} {'years':>6} {'ref ms':>10} {'now ms':>10} {'ratio':>7}")
+    for name, by_size in timings.items():
+        for years, seconds in by_size.items():
+            before = reference.get(name, {}).get(years)
+            if before:
+                print(f"{name:<48} {years:>6} {before * 1e3:10.2f} {seconds * 1e3:10.2f} {seconds / before:7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="années de données mensuelles")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions par mesure (médiane)")
+    parser.add_argument("--output", help="fichier de résultats (défaut : benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="FILE", help="résultats d'un autre commit à comparer")
+    args = parser.parse_args(argv)
+
+    commit = commit_id()
+    timings = run(args.sizes, args.repeat)
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"commit": commit, "date": datetime.now().isoformat(timespec="seconds"), "timings": timings}, f, indent=1)
+    print(f"\nresults: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(timings, json.load(f)["timings"])
+
+
+if __name__ == "__main__":
+    main()
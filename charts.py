@@ -0,0 +1,207 @@
+"""
+Headless (Agg) charts of the regime history of every region.
+
+    python charts.py --output charts --format png svg
+    python charts.py --regions FR DE --start 1990-01 --workers 4
+
+Three figures per region, written as <output>/<REGION>_<chart>.<format>:
+
+    history      inflation and growth YoY, background shaded by regime
+    durations    histogram of the completed regime durations, per regime
+    allocation   target weights of the regime of each month (WEIGHT_TABLE)
+
+The series are fetched and reduced in the parent process: lines are
+decimated to at most `max_points` (min / max of each bucket, so peaks
+survive), regimes and allocations are sent as runs. Only these small arrays
+travel to the process pool that draws and writes the files; matplotlib is
+imported in the workers only. Figures use fixed margins and PNGs a low zlib
+level, which dominate the drawing time of such small figures otherwise.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+import profiling
+
+
+CHARTS = ("history", "durations", "allocation")
+FORMATS = ("png", "svg")
+
+# couleurs par code de régime (history.REGIMES)
+REGIME_COLORS = ["#9ecae1", "#a1d99b", "#fdae6b", "#fc9272"]
+ASSET_COLORS = {"Actions": "#3182bd", "Or": "#e6ab02", "Cash": "#969696", "Obligations": "#31a354"}
+
+
+def decimal_years(index):
+    """
+    Dates as fractional years (any datetime64 resolution, also outside 1677-2262).
+    """
+    months = np.asarray(index.values).astype("datetime64[M]").astype(np.int64)
+    return 1970 + months / 12
+
+
+def downsample(x, y, max_points=2000):
+    """
+    Min / max decimation: keeps the lowest and highest point of each of
+    max_points // 2 buckets, in their original order.
+    """
+    n = len(x)
+    if n <= max_points:
+        return x, y
+    size = -(-n // (max_points // 2))
+    filled = np.where(np.isnan(y), np.nanmean(y), y)
+    # dernier seau complété avec sa dernière valeur
+    buckets = np.pad(filled, (0, -n % size), mode="edge").reshape(-1, size)
+    offsets = np.arange(0, buckets.size, size)[:, None]
+    keep = np.sort(np.column_stack([buckets.argmin(axis=1), buckets.argmax(axis=1)]) + offsets, axis=1).ravel()
+    keep = np.unique(np.minimum(keep, n - 1))
+    return x[keep], y[keep]
+
+
+def chart_data(region, history, max_points=2000):
+    """
+    Reduced arrays of one region (from history.regime_history) for render_region.
+    """
+    from durations import run_lengths
+
+    x = decimal_years(history.index)
+    code = history["regime"].cat.codes.to_numpy()
+    values, lengths, starts = run_lengths(code)
+    return {
+        "region": region,
+        "inflation": downsample(x, history["inflation"].to_numpy(dtype=float), max_points),
+        "growth": downsample(x, history["growth"].to_numpy(dtype=float), max_points),
+        "runs": (values, x[starts], np.append(x[starts[1:]], x[-1] + 1 / 12) if len(x) else x, lengths),
+    }
+
+
+def _history(plt, data, regimes):
+    fig, axes = plt.subplots(2, 1, figsize=(12, 6), sharex=True)
+    fig.subplots_adjust(left=0.07, right=0.98, top=0.94, bottom=0.06, hspace=0.08)
+    values, begin, end, _ = data["runs"]
+    for ax, name in zip(axes, ("inflation", "growth")):
+        for code, label in enumerate(regimes):
+            spans = [(b, e - b) for b, e in zip(begin[values == code], end[values == code])]
+            ax.broken_barh(spans, (0, 1), transform=ax.get_xaxis_transform(), color=REGIME_COLORS[code], label=label, linewidth=0)
+        x, y = data[name]
+        ax.plot(x, y, color="black", linewidth=0.8)
+        ax.axhline(2, color="grey", linestyle="--", linewidth=0.6)
+        ax.set_ylabel(f"{name} YoY %")
+    axes[0].set_title(f"{data['region']} — regime history")
+    axes[0].legend(loc="upper left", fontsize="small", ncol=2)
+    return fig
+
+
+def _durations(plt, data, regimes):
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    fig.subplots_adjust(left=0.1, right=0.97, top=0.92, bottom=0.12)
+    values, _, _, lengths = data["runs"]
+    # le dernier run est en cours : non compté
+    values, lengths = values[:-1], lengths[:-1]
+    bins = np.arange(1, max(lengths.max(initial=1), 1) + 2) - 0.5
+    stacked = [lengths[values == code] for code in range(len(regimes))]
+    ax.hist(stacked, bins=bins, stacked=True, histtype="stepfilled", color=REGIME_COLORS[:len(regimes)], label=regimes)
+    ax.set_xlabel("months")
+    ax.set_ylabel("completed regimes")
+    ax.set_title(f"{data['region']} — regime durations")
+    ax.legend(fontsize="small")
+    return fig
+
+
+def _allocation(plt, data, regimes):
+    from backtest import WEIGHT_TABLE
+    from regime_duration import ASSETS
+
+    fig, ax = plt.subplots(figsize=(12, 3.5))
+    fig.subplots_adjust(left=0.07, right=0.98, top=0.88, bottom=0.12)
+    values, begin, end, _ = data["runs"]
+    # code history -> index QUADRANTS = 3 - code ; une marche par run
+    weights = WEIGHT_TABLE[3 - values] * 100
+    x = np.append(begin, end[-1:]) if len(begin) else begin
+    weights = np.vstack([weights, weights[-1:]]) if len(weights) else weights.reshape(0, len(ASSETS))
+    ax.stackplot(x, weights.T, step="post", labels=ASSETS, colors=[ASSET_COLORS[asset] for asset in ASSETS])
+    ax.set_ylim(0, 100)
+    ax.set_ylabel("% allocation")
+    ax.set_title(f"{data['region']} — allocation")
+    ax.legend(loc="upper left", fontsize="small", ncol=len(ASSETS))
+    return fig
+
+
+def render_region(data, directory, formats=("png",), charts=CHARTS, dpi=100):
+    """
+    Draws and writes the charts of one region; returns the written paths.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from history import REGIMES
+
+    draw = {"history": _history, "durations": _durations, "allocation": _allocation}
+    paths = []
+    for chart in charts:
+        # marges fixes plutôt que tight_layout (qui redessine les graduations)
+        fig = draw[chart](plt, data, REGIMES)
+        for fmt in formats:
+            path = os.path.join(directory, f"{data['region']}_{chart}.{fmt}")
+            options = {"pil_kwargs": {"compress_level": 1}} if fmt == "png" else {}
+            fig.savefig(path, format=fmt, dpi=dpi, **options)
+            paths.append(path)
+        plt.close(fig)
+    return paths
+
+
+def render_all(histories, directory, formats=("png",), charts=CHARTS, max_workers=None, max_points=2000):
+    """
+    Renders every region of `histories` (dict region -> regime_history
+    DataFrame) in a process pool (max_workers=1: in this process).
+    Returns a dict region -> written paths.
+    """
+    unknown = (set(formats) - set(FORMATS)) | (set(charts) - set(CHARTS))
+    if unknown:
+        raise ValueError(f"Unknown chart format or type: {sorted(unknown)}")
+    os.makedirs(directory, exist_ok=True)
+    with profiling.stage("prepare"):
+        tasks = [chart_data(region, history, max_points) for region, history in histories.items()]
+    with profiling.stage("draw"):
+        if max_workers == 1 or len(tasks) <= 1:
+            return {data["region"]: render_region(data, directory, formats, charts) for data in tasks}
+        with ProcessPoolExecutor(max_workers, initializer=profiling.disable) as pool:
+            futures = {data["region"]: pool.submit(render_region, data, directory, formats, charts) for data in tasks}
+            return {region: future.result() for region, future in futures.items()}
+
+
+def main(argv=None):
+    from cli import parse_start
+
+    parser = argparse.ArgumentParser(description="Writes the regime charts of every region.")
+    parser.add_argument("--regions", nargs="+", metavar="REGION", help="régions (défaut : toutes)")
+    parser.add_argument("--start", default=datetime(2000, 1, 1), type=parse_start, help="début des séries, YYYY-MM[-DD]")
+    parser.add_argument("--output", default="charts", help="dossier de sortie")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=FORMATS, help="formats des fichiers")
+    parser.add_argument("--charts", nargs="+", default=list(CHARTS), choices=CHARTS, help="graphiques à produire")
+    parser.add_argument("--workers", default=None, type=int, help="processus de rendu (défaut : nombre de CPU)")
+    parser.add_argument("--max-points", default=2000, type=int, help="points par courbe après décimation")
+    parser.add_argument("--offline", action="store_true", help="ne lit que le cache local (MRPA_OFFLINE=1)")
+    profiling.add_argument(parser)
+    args = parser.parse_args(argv)
+    if args.offline:
+        os.environ["MRPA_OFFLINE"] = "1"
+
+    with profiling.from_args(args):
+        from history import regime_history
+        from MRPA import get_macro_data_batch
+
+        data = get_macro_data_batch(args.regions, args.start)
+        histories = {region: regime_history(*series) for region, series in data.items()}
+        written = render_all(histories, args.output, args.format, args.charts, args.workers, args.max_points)
+    print(f"{sum(len(paths) for paths in written.values())} files written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+Argument helpers shared by the command-line front-ends and the service.
+Kept free of heavy imports, like paths.py.
+"""
+
+import argparse
+from datetime import datetime
+
+
+def parse_start(text):
+    """
+    Parses a start date given as YYYY-MM or YYYY-MM-DD.
+    """
+    for fmt in ("%Y-%m-%d", "%Y-%m"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"invalid date {text!r}, expected YYYY-MM or YYYY-MM-DD")
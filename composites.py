@@ -0,0 +1,147 @@
+"""
+Composite regions (euro-area core, periphery, custom baskets) aggregated
+from the already fetched series of their member countries.
+
+    data = get_macro_data_batch(["FR", "DE", "IT", "GR"], start)
+    data.update(build(data))                                # EA_CORE, EA_PERIPHERY, EA4
+    panel = MemberPanel(data)
+    panel.composites({"FR_DE": {"FR": 0.4, "DE": 0.6}})     # what-if, sans I/O
+
+The member series of each kind are joined once into a wide, date-aligned
+(T, n_members) array (MemberPanel). Every composite is then a row of a
+(n_composites, T, n_members) weight tensor, reduced against that array with
+one einsum, so re-weighting only recomputes the weights and the reduction.
+
+Price and volume indices (cpi, gdp) are in different bases and units, so
+they are chained: the composite change of each period is the weighted mean
+of the member changes, cumulated into an index (100 just before the first
+change).
+Rates (policy, unemp) are weighted means of the levels. At each date the
+weights are renormalised over the members that have a value.
+
+Weights are fixed ({member: weight}), "equal", or "gdp": the real GDP level
+of each member `lag` months earlier (previous-year weights by default),
+which makes them time-varying. A member only enters a GDP-weighted basket
+once that lagged level is known, so such composites start `lag` months
+after the first GDP observation. The euro-area members of SERIES all report
+chain-linked volumes in euros, so their levels are comparable.
+"""
+
+import numpy as np
+import pandas as pd
+
+from transforms import as_series
+
+
+KINDS = ("cpi", "gdp", "policy", "unemp")
+CHAINED = ("cpi", "gdp")
+
+COMPOSITES = {
+    "EA_CORE": ["FR", "DE"],
+    "EA_PERIPHERY": ["IT", "GR"],
+    "EA4": ["FR", "DE", "IT", "GR"],
+}
+
+
+def members_of(composites):
+    """
+    Member regions needed by the composites, in order of first appearance.
+    """
+    return list(dict.fromkeys(member for basket in composites.values() for member in basket))
+
+
+class MemberPanel:
+    """
+    Wide date-aligned arrays of the member series, one (T, n_members) array per kind.
+    """
+
+    def __init__(self, data, members=None):
+        self.members = list(members or data)
+        self.dates, self.values = {}, {}
+        for i, kind in enumerate(KINDS):
+            wide = pd.concat({member: as_series(data[member][i]) for member in self.members}, axis=1).sort_index()
+            self.dates[kind] = wide.index
+            self.values[kind] = wide.to_numpy(dtype=float)
+        self._column = {member: j for j, member in enumerate(self.members)}
+
+    def _membership(self, composites):
+        # (n_composites, n_members) : poids fixes, 1 pour les paniers pondérés par `weights`, 0 ailleurs
+        fixed = np.zeros((len(composites), len(self.members)))
+        weighted = np.zeros(len(composites), dtype=bool)
+        for c, basket in enumerate(composites.values()):
+            unknown = [member for member in basket if member not in self._column]
+            if unknown:
+                raise ValueError(f"Composite members not in the panel: {', '.join(unknown)}")
+            if isinstance(basket, dict):
+                for member, weight in basket.items():
+                    fixed[c, self._column[member]] = weight
+            else:
+                fixed[c, [self._column[member] for member in basket]] = 1
+                weighted[c] = True
+        return fixed, weighted
+
+    def gdp_weights(self, dates, lag=12):
+        """
+        Real GDP level of every member `lag` months before each date
+        (T, n_members); NaN until that level is known.
+        """
+        gdp = pd.DataFrame(self.values["gdp"]).ffill().to_numpy()
+        months = pd.DatetimeIndex(dates).values.astype("datetime64[M]") - lag
+        pos = np.searchsorted(self.dates["gdp"].values.astype("datetime64[M]"), months, side="right") - 1
+        return np.where((pos >= 0)[:, None], gdp[np.maximum(pos, 0)], np.nan)
+
+    def composites(self, composites, weights="gdp", lag=12):
+        """
+        Series of each composite, as a dict name -> (cpi, gdp, pol, unrt)
+        DataFrames shaped like the FRED frames of get_macro_data.
+
+        composites  dict name -> list of members (weighted by `weights`) or
+                    dict member -> fixed weight
+        weights     "gdp" (time-varying, see gdp_weights) or "equal"
+        """
+        if weights not in ("gdp", "equal"):
+            raise ValueError(f"Unknown composite weights {weights!r}, expected 'gdp' or 'equal'.")
+        fixed, weighted = self._membership(composites)
+        out = {}
+        for kind in KINDS:
+            x = self.values[kind]
+            if kind in CHAINED:
+                # variation de chaque membre depuis sa dernière observation
+                last = pd.DataFrame(x).ffill().shift(1).to_numpy()
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    x = x / last - 1
+            base = self.gdp_weights(self.dates[kind], lag) if weights == "gdp" else np.ones_like(x)
+            w = np.where(weighted[:, None, None], base[None] * fixed[:, None, :], fixed[:, None, :])
+            w = np.where(np.isnan(x)[None] | np.isnan(w), 0, w)
+            total = w.sum(axis=-1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                value = np.einsum("ctm,tm->ct", w, np.nan_to_num(x)) / total
+            valid = total > 0
+            if kind in CHAINED:
+                # base 100 à la date qui précède la première variation pondérée
+                base = np.zeros_like(valid)
+                base[:, :-1] = valid[:, 1:] & (np.cumsum(valid, axis=-1)[:, 1:] == 1)
+                value = 100 * np.cumprod(1 + np.where(valid, value, 0), axis=-1)
+                valid |= base
+            out[kind] = np.where(valid, value, np.nan)
+
+        result = {}
+        for c, name in enumerate(composites):
+            frames = []
+            for kind in KINDS:
+                series = pd.Series(out[kind][c], index=self.dates[kind], name=f"{name}_{kind}").dropna()
+                series.index.name = "DATE"
+                frames.append(series.to_frame())
+            result[name] = tuple(frames)
+        return result
+
+
+def build(data, composites=COMPOSITES, weights="gdp", lag=12):
+    """
+    Composite series from the member series already in `data` (dict region
+    -> (cpi, gdp, pol, unrt)); returns a dict to merge into it.
+    """
+    missing = [member for member in members_of(composites) if member not in data]
+    if missing:
+        raise ValueError(f"Fetch the composite members first: {', '.join(missing)}")
+    return MemberPanel(data, members_of(composites)).composites(composites, weights, lag)
@@ -0,0 +1,16 @@
+import pytest
+
+import fred_cache
+import result_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """
+    Every test gets its own empty cache directory, offline, without the result cache.
+    """
+    monkeypatch.setenv("MRPA_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("MRPA_OFFLINE", "1")
+    monkeypatch.setenv("MRPA_RESULT_CACHE", "0")
+    monkeypatch.setattr(fred_cache, "_default_cache", None)
+    monkeypatch.setattr(result_cache, "_default_result_cache", None)
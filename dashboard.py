@@ -0,0 +1,178 @@
+"""
+Multi-region dashboard: evaluates every region of SERIES (or a subset) in a
+single run and prints one cross-country regime table.
+
+    python dashboard.py                          # toutes les régions
+    python dashboard.py --regions FR DE IT --start 2000-01
+    python dashboard.py --offline                # uniquement depuis le cache
+    python dashboard.py --cached                 # derniers résultats, sans pandas
+    python dashboard.py --format ndjson          # un objet JSON par région, sans rich
+    python dashboard.py --history --format parquet --output history.parquet
+    python dashboard.py --regions US --composites EA_CORE EA_PERIPHERY
+
+Arguments are parsed before pandas, rich and the fetch layer are imported,
+so ``--help`` and argument errors return immediately. Shared series (the ECB
+rate of the euro-area members) are fetched once and regions are evaluated
+concurrently. Every run stores its snapshots in the cache directory; the
+--cached mode only reads that JSON file.
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+
+import profiling
+from cli import parse_start
+from paths import snapshot_path
+from results import Snapshot, history_rows, write_records
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-country macro regime dashboard.")
+    parser.add_argument("--regions", nargs="+", metavar="REGION", help="régions à évaluer (défaut : toutes)")
+    parser.add_argument("--start", default=datetime(2000, 1, 1), type=parse_start, help="début des séries, YYYY-MM[-DD]")
+    parser.add_argument("--workers", default=8, type=int, help="nombre de téléchargements / calculs simultanés")
+    parser.add_argument("--offline", action="store_true", help="ne lit que le cache local (MRPA_OFFLINE=1)")
+    parser.add_argument("--cached", action="store_true", help="affiche les derniers snapshots calculés, sans rien recalculer")
+    parser.add_argument("--format", default="table", choices=["table", "json", "ndjson", "parquet"], help="sortie (table = rich)")
+    parser.add_argument("--output", help="fichier de sortie (obligatoire pour parquet)")
+    parser.add_argument("--history", action="store_true", help="une ligne par région et par mois au lieu du dernier point")
+    parser.add_argument("--composites", nargs="*", metavar="NAME", help="ajoute des régions composites (défaut : toutes, voir composites.COMPOSITES)")
+    parser.add_argument("--weights", default="gdp", choices=["gdp", "equal"], help="pondération des composites")
+    profiling.add_argument(parser)
+    return parser, parser.parse_args(argv)
+
+
+def save_snapshots(snapshots, path=None):
+    """
+    Merges the snapshots into the JSON snapshot file.
+    """
+    path = path or snapshot_path()
+    stored = {region: snap.to_dict() for region, snap in load_snapshots(path).items()}
+    stored.update({region: snap.to_dict() for region, snap in snapshots.items()})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stored, f, ensure_ascii=False, indent=1)
+
+
+def load_snapshots(path=None):
+    """
+    Last stored Snapshot of each region ({} when nothing was computed yet).
+    """
+    path = path or snapshot_path()
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {region: Snapshot.from_dict(data) for region, data in json.load(f).items()}
+
+
+def render(snapshots):
+    """
+    Prints one rich table row per region.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Macro Regimes", show_header=True, header_style="bold magenta")
+    for column in ("Region", "Date", "CPI YoY", "Infl lvl", "Infl pos %", "GDP YoY", "Growth lvl", "GDP pos %", "Regime", "Allocation"):
+        table.add_column(column, justify="left" if column in ("Region", "Regime", "Allocation") else "right")
+    for region, snap in snapshots.items():
+        table.add_row(
+            region,
+            snap.date[:7],
+            f"{snap.inflation:,.2f} %",
+            str(snap.infl_lvl),
+            f"{snap.infl_pos_pct:.1f} %",
+            f"{snap.growth:,.2f} %",
+            str(snap.gdp_lvl),
+            f"{snap.gdp_pos_pct:.1f} %",
+            snap.regime,
+            snap.allocation,
+        )
+    Console().print(table)
+
+
+def output(snapshots, args):
+    with profiling.stage("render"):
+        if args.format == "table":
+            render(snapshots)
+        else:
+            write_records(snapshots.values(), args.format, path=args.output)
+
+
+def snapshot(region, data):
+    from MRPA import snapshot_from_data
+    from result_cache import cached
+
+    with profiling.stage("region", region):
+        return cached("snapshot", snapshot_from_data, *data, region)
+
+
+def main(argv=None):
+    parser, args = parse_args(argv)
+    with profiling.from_args(args):
+        return _main(parser, args)
+
+
+def _main(parser, args):
+    if args.format == "parquet" and not args.output:
+        parser.error("--format parquet needs --output")
+    if args.history and args.format == "table":
+        parser.error("--history needs --format json, ndjson or parquet")
+    if args.cached:
+        if args.history:
+            parser.error("--history cannot be served from the snapshot cache")
+        snapshots = load_snapshots()
+        if args.regions:
+            snapshots = {region: snapshots[region] for region in args.regions if region in snapshots}
+        if not snapshots:
+            parser.error(f"no cached snapshot in {snapshot_path()}, run without --cached first")
+        output(snapshots, args)
+        return snapshots
+    if args.offline:
+        os.environ["MRPA_OFFLINE"] = "1"
+
+    # imports lourds seulement une fois les arguments validés
+    from concurrent.futures import ThreadPoolExecutor
+
+    from MRPA import SERIES, get_macro_data_batch
+
+    regions = args.regions or list(SERIES)
+    unknown = [region for region in regions if region not in SERIES]
+    if unknown:
+        parser.error(f"unknown region(s): {', '.join(unknown)} (choose from {', '.join(SERIES)})")
+
+    fetched = regions
+    if args.composites is not None:
+        from composites import COMPOSITES, build, members_of
+
+        unknown = [name for name in args.composites if name not in COMPOSITES]
+        if unknown:
+            parser.error(f"unknown composite(s): {', '.join(unknown)} (choose from {', '.join(COMPOSITES)})")
+        baskets = {name: COMPOSITES[name] for name in args.composites or COMPOSITES}
+        # les membres sont téléchargés avec les régions demandées, une seule fois
+        fetched = list(dict.fromkeys(regions + members_of(baskets)))
+
+    data = get_macro_data_batch(fetched, args.start, max_workers=args.workers)
+    if args.composites is not None:
+        with profiling.stage("composites"):
+            data.update(build(data, baskets, args.weights))
+        regions = regions + list(baskets)
+    if args.history:
+        from history import regime_history
+
+        rows = (row for region in regions for row in history_rows(region, regime_history(*data[region])))
+        with profiling.stage("history"):
+            write_records(rows, args.format, path=args.output)
+        return None
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        snapshots = dict(zip(regions, pool.map(lambda region: snapshot(region, data[region]), regions)))
+    save_snapshots(snapshots)
+    output(snapshots, args)
+    return snapshots
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Run-length statistics of regime codes.
+
+``run_lengths`` encodes a regime-code history into runs in one vectorized
+pass; ``duration_stats`` and ``transition_matrix`` summarise them per regime.
+``DurationStats`` keeps the same statistics incrementally: ``push`` one new
+month is O(1), so a monthly update never rescans the history.
+"""
+
+from collections import Counter, defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+def run_lengths(codes):
+    """
+    Returns (values, lengths, starts) of the runs of identical codes.
+    The last run is the current, still open, regime.
+    """
+    codes = np.asarray(codes)
+    if codes.size == 0:
+        return codes, np.array([], dtype=int), np.array([], dtype=int)
+    starts = np.concatenate([[0], np.flatnonzero(codes[1:] != codes[:-1]) + 1])
+    lengths = np.diff(np.append(starts, codes.size))
+    return codes[starts], lengths, starts
+
+
+def _histogram_stats(histogram, quantiles):
+    durations = np.array(sorted(histogram))
+    sample = np.repeat(durations, [histogram[d] for d in durations])
+    row = {"count": sample.size, "mean": sample.mean(), "median": np.median(sample)}
+    for q in quantiles:
+        row[f"q{int(q * 100)}"] = np.quantile(sample, q)
+    row["histogram"] = {int(d): int(histogram[d]) for d in durations}
+    return row
+
+
+def duration_stats(codes, include_current=False, quantiles=(0.25, 0.75, 0.9)):
+    """
+    Per regime code: count, mean, median, quantiles and duration histogram
+    of the completed runs (the open run is only counted if include_current).
+    """
+    values, lengths, _ = run_lengths(codes)
+    if not include_current:
+        values, lengths = values[:-1], lengths[:-1]
+    runs = pd.DataFrame({"regime_code": values, "duration": lengths})
+    grouped = runs.groupby("regime_code")["duration"]
+
+    stats = grouped.agg(["count", "mean", "median"])
+    for q in quantiles:
+        stats[f"q{int(q * 100)}"] = grouped.quantile(q)
+    histograms = grouped.value_counts().sort_index()
+    stats["histogram"] = [histograms.loc[code].to_dict() for code in stats.index]
+    return stats
+
+
+def transition_counts(codes):
+    """
+    Counts of regime changes, as a DataFrame from-code (rows) x to-code (columns).
+    """
+    values, _, _ = run_lengths(codes)
+    labels = np.unique(values)
+    counts = np.zeros((labels.size, labels.size), dtype=int)
+    if values.size > 1:
+        np.add.at(counts, (np.searchsorted(labels, values[:-1]), np.searchsorted(labels, values[1:])), 1)
+    return pd.DataFrame(counts, index=labels, columns=labels)
+
+
+def transition_matrix(codes):
+    """
+    Row-normalised transition probabilities between regime codes.
+    """
+    counts = transition_counts(codes)
+    totals = counts.sum(axis=1).replace(0, np.nan)
+    return counts.div(totals, axis=0).fillna(0.0)
+
+
+def remaining_duration(histogram, elapsed):
+    """
+    Expected remaining months of a run that has already lasted `elapsed`
+    months, from a duration histogram {duration: count}: E[D - elapsed | D > elapsed].
+    Returns None when no past run lasted that long.
+    """
+    longer = {d: c for d, c in histogram.items() if d > elapsed}
+    if not longer:
+        return None
+    total = sum(longer.values())
+    return sum((d - elapsed) * c for d, c in longer.items()) / total
+
+
+class DurationStats:
+    """
+    Incremental run-length statistics: push() one regime code per month.
+    """
+
+    def __init__(self):
+        self.histograms = defaultdict(Counter)
+        self.transitions = defaultdict(Counter)
+        self.current = None
+        self.run_length = 0
+
+    @classmethod
+    def from_codes(cls, codes):
+        stats = cls()
+        values, lengths, _ = run_lengths(codes)
+        for value, length in zip(values[:-1].tolist(), lengths[:-1].tolist()):
+            stats.histograms[value][length] += 1
+        for a, b in zip(values[:-1].tolist(), values[1:].tolist()):
+            stats.transitions[a][b] += 1
+        if values.size:
+            stats.current, stats.run_length = values[-1].item(), int(lengths[-1])
+        return stats
+
+    def push(self, code):
+        """
+        Adds one month. Returns True when it starts a new regime.
+        """
+        if code == self.current:
+            self.run_length += 1
+            return False
+        if self.current is not None:
+            self.histograms[self.current][self.run_length] += 1
+            self.transitions[self.current][code] += 1
+        self.current, self.run_length = code, 1
+        return True
+
+    def stats(self, quantiles=(0.25, 0.75, 0.9)):
+        """
+        Same table as duration_stats (completed runs only).
+        """
+        rows = {code: _histogram_stats(h, quantiles) for code, h in sorted(self.histograms.items()) if h}
+        return pd.DataFrame.from_dict(rows, orient="index").rename_axis("regime_code")
+
+    def transition_matrix(self):
+        """
+        Same matrix as the module-level transition_matrix.
+        """
+        labels = sorted(set(self.transitions) | {b for row in self.transitions.values() for b in row})
+        counts = pd.DataFrame(
+            [[self.transitions[a][b] for b in labels] for a in labels], index=labels, columns=labels, dtype=float
+        )
+        return counts.div(counts.sum(axis=1).replace(0, np.nan), axis=0).fillna(0.0)
+
+    def expected_remaining(self):
+        """
+        Conditional remaining duration of the current run (None if unknown).
+        """
+        return remaining_duration(self.histograms.get(self.current, {}), self.run_length)
+
+    def to_dict(self):
+        """
+        JSON-serialisable state (see from_dict).
+        """
+        return {
+            "histograms": {str(code): {str(d): c for d, c in h.items()} for code, h in self.histograms.items()},
+            "transitions": {str(a): {str(b): c for b, c in row.items()} for a, row in self.transitions.items()},
+            "current": self.current,
+            "run_length": self.run_length,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        for code, h in state["histograms"].items():
+            stats.histograms[int(code)] = Counter({int(d): c for d, c in h.items()})
+        for a, row in state["transitions"].items():
+            stats.transitions[int(a)] = Counter({int(b): c for b, c in row.items()})
+        stats.current, stats.run_length = state["current"], state["run_length"]
+        return stats
@@ -0,0 +1,184 @@
+"""
+Probabilistic regime-change forecast (semi-Markov Monte Carlo).
+
+RegimeForecaster fits, from a regime-code history (the regime_code of
+detect_previous_regime), the empirical duration distribution of every regime
+and the transition matrix between regimes (durations.DurationStats). It then
+simulates n_paths forward paths at once: each step of the simulation draws
+the next duration and next regime of every path with one vectorized
+inverse-CDF lookup, so the Python loop runs once per regime change within the
+horizon, never once per path.
+
+The current run is continued from its conditional distribution
+P(D = elapsed + k | D >= elapsed). Regimes without completed runs fall back
+to the pooled durations of all regimes, regimes never left to the observed
+entries into the other regimes.
+
+    forecaster = RegimeForecaster.from_codes(regime_code)
+    result = forecaster.forecast(horizon=24, n_paths=10_000, seed=0)
+    result["change_within"][6]      # P(changement de régime d'ici 6 mois)
+    result["next_regime"]           # probabilité de chaque régime suivant
+"""
+
+import numpy as np
+import pandas as pd
+
+from durations import DurationStats
+
+
+class _Sampler:
+    """
+    Walker / Vose alias tables of the rows of a (n_rows, n_values) weight
+    matrix: drawing one value for each of a batch of rows is two array
+    lookups, whatever the number of values.
+    """
+
+    def __init__(self, weights):
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        n_rows, self.width = weights.shape
+        self.prob = np.ones((n_rows, self.width))
+        self.alias = np.tile(np.arange(self.width), (n_rows, 1))
+        for r, row in enumerate(weights):
+            if row.sum() == 0:
+                row = np.eye(self.width)[-1]
+            scaled = row * self.width / row.sum()
+            small = [i for i in range(self.width) if scaled[i] < 1]
+            large = [i for i in range(self.width) if scaled[i] >= 1]
+            while small and large:
+                s, l = small.pop(), large.pop()
+                self.prob[r, s], self.alias[r, s] = scaled[s], l
+                scaled[l] -= 1 - scaled[s]
+                (small if scaled[l] < 1 else large).append(l)
+
+    def draw(self, rows, u):
+        u = u * self.width
+        col = u.astype(np.int64)
+        return np.where(u - col < self.prob[rows, col], col, self.alias[rows, col])
+
+
+class RegimeForecaster:
+    """
+    Duration distributions and transition matrix of a regime-code history.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        codes = set(stats.histograms) | set(stats.transitions) | {b for row in stats.transitions.values() for b in row}
+        if stats.current is not None:
+            codes.add(stats.current)
+        self.regimes = np.array(sorted(codes))
+        if not stats.histograms:
+            raise ValueError("Cannot forecast from a regime history without any regime change.")
+        position = {code: i for i, code in enumerate(self.regimes.tolist())}
+        n = self.regimes.size
+
+        # durées : (n_regimes, max_duration + 1), colonne d = nombre de runs de d mois
+        max_duration = max([d for h in stats.histograms.values() for d in h] + [stats.run_length, 1])
+        counts = np.zeros((n, max_duration + 1))
+        for code, histogram in stats.histograms.items():
+            for duration, count in histogram.items():
+                counts[position[code], duration] += count
+        pooled = counts.sum(axis=0)
+        empty = counts.sum(axis=1) == 0
+        counts[empty] = pooled
+        self.duration_counts = counts
+        self._durations = _Sampler(counts)
+
+        transitions = np.zeros((n, n))
+        for a, row in stats.transitions.items():
+            for b, count in row.items():
+                transitions[position[a], position[b]] += count
+        entries = transitions.sum(axis=0)
+        for i in np.flatnonzero(transitions.sum(axis=1) == 0):
+            # jamais quitté : entrées observées des autres régimes, sinon uniforme
+            pooled = entries.copy() if entries.sum() > entries[i] else np.ones(n)
+            pooled[i] = 0
+            transitions[i] = pooled
+        self.transition_matrix = pd.DataFrame(
+            transitions / transitions.sum(axis=1, keepdims=True), index=self.regimes, columns=self.regimes
+        )
+        self._transitions = _Sampler(transitions)
+        self.current = position.get(stats.current)
+        self.elapsed = stats.run_length
+
+    @classmethod
+    def from_codes(cls, codes):
+        return cls(DurationStats.from_codes(np.asarray(codes)))
+
+    def remaining_weights(self, elapsed=None):
+        """
+        Weights of the months the current run still lasts, given that it has
+        lasted `elapsed` months: P(D = elapsed + k | D >= elapsed), k = 0, 1, ...
+        """
+        elapsed = self.elapsed if elapsed is None else elapsed
+        tail = self.duration_counts[self.current, elapsed:]
+        if tail.sum() == 0:
+            tail = self.duration_counts.sum(axis=0)[elapsed:]
+        if tail.sum() == 0:
+            tail = np.array([1.0])                  # plus long que tout l'historique : changement imminent
+        return tail / tail.sum()
+
+    def simulate(self, horizon=24, n_paths=10_000, rng=None):
+        """
+        Regime index (position in self.regimes) of every path for each of the
+        next `horizon` months, shape (n_paths, horizon), and the remaining
+        months of the current run of each path.
+        """
+        rng = np.random.default_rng(rng)
+        remaining = _Sampler(self.remaining_weights()).draw(np.zeros(n_paths, dtype=np.int64), rng.random(n_paths))
+
+        # segments[k] : régime et fin (en mois) du k-ième run de chaque chemin
+        regimes = [np.full(n_paths, self.current)]
+        ends = [remaining]
+        while ends[-1].min() < horizon:
+            nxt = self._transitions.draw(regimes[-1], rng.random(n_paths))
+            duration = self._durations.draw(nxt, rng.random(n_paths))
+            regimes.append(nxt)
+            ends.append(ends[-1] + np.maximum(duration, 1))
+        regimes, ends = np.column_stack(regimes), np.column_stack(ends)
+
+        # segment en cours au mois h = nombre de fins de segment <= h
+        cells = np.arange(n_paths)[:, None] * (horizon + 1) + np.minimum(ends, horizon)
+        segment = np.bincount(cells.ravel(), minlength=n_paths * (horizon + 1)).reshape(n_paths, horizon + 1)
+        segment = np.cumsum(segment[:, :horizon], axis=1)
+        return np.take_along_axis(regimes, segment, axis=1), remaining
+
+    def forecast(self, horizon=24, n_paths=10_000, seed=None):
+        """
+        Monte Carlo summary:
+
+            current             current regime code and months already spent in it
+            expected_remaining  mean remaining months of the current run
+            change_within       Series: P(regime change within N months), N = 1..horizon
+            next_regime         Series: probability of each next regime
+            occupancy           DataFrame (month ahead x regime) of regime probabilities
+        """
+        paths, remaining = self.simulate(horizon, n_paths, seed)
+        n = self.regimes.size
+        first_change = paths[np.arange(n_paths), np.minimum(remaining, horizon - 1)]
+        changed = remaining < horizon
+        next_counts = np.bincount(first_change[changed], minlength=n)
+        # au-delà de l'horizon, le régime suivant suit la ligne de la matrice de transition
+        next_probs = next_counts / n_paths + (1 - changed.mean()) * self.transition_matrix.iloc[self.current].to_numpy()
+
+        occupancy = np.stack([np.bincount(paths[:, h], minlength=n) for h in range(horizon)]) / n_paths
+        months = pd.RangeIndex(1, horizon + 1, name="months")
+        return {
+            "current": (self.regimes[self.current].item(), self.elapsed),
+            "expected_remaining": float(remaining.mean()),
+            "change_within": pd.Series((remaining[:, None] < months.to_numpy()[None, :]).mean(axis=0), index=months),
+            "next_regime": pd.Series(next_probs, index=self.regimes, name="probability"),
+            "occupancy": pd.DataFrame(occupancy, index=months, columns=self.regimes),
+        }
+
+
+def forecast_regions(codes, horizon=24, n_paths=10_000, seed=None):
+    """
+    Forecasts several regions (dict region -> regime codes) with independent
+    but reproducible random streams. Returns a dict region -> forecast().
+    """
+    streams = np.random.SeedSequence(seed).spawn(len(codes))
+    return {
+        region: RegimeForecaster.from_codes(region_codes).forecast(horizon, n_paths, np.random.default_rng(stream))
+        for (region, region_codes), stream in zip(codes.items(), streams)
+    }
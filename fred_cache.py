@@ -0,0 +1,233 @@
+"""
+Local on-disk store for FRED series.
+
+Each series is kept in a SQLite file keyed by its FRED code. A cached series
+is only refreshed once it is older than the TTL, and the refresh only asks
+FRED for observations from the last cached date onwards. In offline mode
+everything is served from the cache and a missing series is an error.
+
+Environment variables (used by ``default_cache``):
+    MRPA_CACHE_DIR   dossier du cache (défaut : ~/.cache/mrpa)
+    MRPA_CACHE_TTL   durée de validité en heures (défaut : 12)
+    MRPA_OFFLINE     "1" pour ne jamais appeler FRED
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import profiling
+from fetch import FredFetcher, with_retry
+from paths import DEFAULT_CACHE_DIR, cache_dir
+
+
+DEFAULT_TTL = timedelta(hours=12)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    code  TEXT NOT NULL,
+    date  TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (code, date)
+);
+CREATE TABLE IF NOT EXISTS vintages (
+    code           TEXT NOT NULL,
+    date           TEXT NOT NULL,
+    realtime_start TEXT NOT NULL,
+    value          REAL,
+    PRIMARY KEY (code, date, realtime_start)
+);
+CREATE TABLE IF NOT EXISTS series (
+    code       TEXT PRIMARY KEY,
+    start      TEXT NOT NULL,
+    last_date  TEXT,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+
+def _day(value):
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+class FredCache:
+    """
+    SQLite-backed cache of FRED observations with incremental refresh.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, offline=False, fetcher=None):
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, "fred.sqlite")
+        self.ttl = ttl
+        self.offline = offline
+        self.fetcher = fetcher or with_retry(FredFetcher())
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # le context manager de sqlite3 valide la transaction mais ne ferme pas la connexion
+        with closing(sqlite3.connect(self.path, timeout=30)) as con, con:
+            yield con
+
+    def _meta(self, con, code):
+        row = con.execute(
+            "SELECT start, last_date, fetched_at FROM series WHERE code = ?", (code,)
+        ).fetchone()
+        if row is None:
+            return None
+        start, last_date, fetched_at = row
+        return start, last_date, datetime.fromisoformat(fetched_at)
+
+    def _store(self, con, code, frame):
+        if frame is None or frame.empty:
+            return
+        values = frame.iloc[:, 0]
+        rows = [
+            (code, _day(date), None if pd.isna(value) else float(value))
+            for date, value in values.items()
+        ]
+        con.executemany(
+            "INSERT OR REPLACE INTO observations (code, date, value) VALUES (?, ?, ?)",
+            rows,
+        )
+
+    def _refresh(self, code, start, end):
+        # network calls happen outside the lock so that concurrent refreshes
+        # of different codes (fetch.fetch_series) do not serialize
+        now = datetime.now()
+        with self._connect() as con:
+            meta = self._meta(con, code)
+
+        frames = []
+        if meta is None:
+            frames.append(self.fetcher(code, start, now))
+            cached_start, fetched_at = _day(start), now
+        else:
+            cached_start, last_date, fetched_at = meta
+            if _day(start) < cached_start:
+                # backfill the part of the window that was never requested
+                frames.append(self.fetcher(code, start, pd.Timestamp(cached_start)))
+                cached_start = _day(start)
+            if now - fetched_at > self.ttl and (last_date is None or _day(end) > last_date):
+                since = pd.Timestamp(last_date) if last_date else start
+                frames.append(self.fetcher(code, since, now))
+                fetched_at = now
+            elif not frames:
+                profiling.count("cache_hits")
+                return
+        profiling.count("cache_misses")
+
+        with self._lock, self._connect() as con:
+            for frame in frames:
+                self._store(con, code, frame)
+            last = con.execute(
+                "SELECT MAX(date) FROM observations WHERE code = ?", (code,)
+            ).fetchone()[0]
+            con.execute(
+                "INSERT OR REPLACE INTO series (code, start, last_date, fetched_at) VALUES (?, ?, ?, ?)",
+                (code, cached_start, last, fetched_at.isoformat()),
+            )
+
+    def is_fresh(self, code, start=None):
+        """
+        True when the series can be served without any network call.
+        """
+        with self._connect() as con:
+            meta = self._meta(con, code)
+        if meta is None:
+            return False
+        cached_start, _, fetched_at = meta
+        if start is not None and _day(start) < cached_start:
+            return False
+        return datetime.now() - fetched_at <= self.ttl
+
+    def get(self, code, start, end=None):
+        """
+        Returns the series between start and end, fetching only what is missing.
+        """
+        end = end or datetime.now()
+        with profiling.stage("cache", code):
+            if self.offline:
+                profiling.count("cache_hits")
+            else:
+                self._refresh(code, start, end)
+
+            with self._connect() as con:
+                rows = con.execute(
+                    "SELECT date, value FROM observations WHERE code = ? AND date >= ? AND date <= ? ORDER BY date",
+                    (code, _day(start), _day(end)),
+                ).fetchall()
+        if not rows and self.offline:
+            raise ValueError(f"Series {code} is not in the local cache ({self.path}) and offline mode is on.")
+
+        dates, values = zip(*rows) if rows else ((), ())
+        index = pd.DatetimeIndex(pd.to_datetime(list(dates)), name="DATE")
+        return pd.DataFrame({code: list(values)}, index=index, dtype="float64")
+
+    def seed(self, code, frame, fetched_at=None):
+        """
+        Writes a series straight into the cache (fixtures, offline tests).
+        """
+        fetched_at = fetched_at or datetime.now()
+        with self._lock, self._connect() as con:
+            self._store(con, code, frame)
+            first, last = con.execute(
+                "SELECT MIN(date), MAX(date) FROM observations WHERE code = ?", (code,)
+            ).fetchone()
+            con.execute(
+                "INSERT OR REPLACE INTO series (code, start, last_date, fetched_at) VALUES (?, ?, ?, ?)",
+                (code, first, last, fetched_at.isoformat()),
+            )
+
+    def seed_vintages(self, code, table):
+        """
+        Stores published vintages of a series (ALFRED layout: columns date,
+        realtime_start, value), for the point-in-time queries of asof.py.
+        """
+        rows = [
+            (code, _day(date), _day(start), None if pd.isna(value) else float(value))
+            for date, start, value in table[["date", "realtime_start", "value"]].itertuples(index=False)
+        ]
+        with self._lock, self._connect() as con:
+            con.executemany(
+                "INSERT OR REPLACE INTO vintages (code, date, realtime_start, value) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def vintages(self, code):
+        """
+        Stored vintages of a series (empty DataFrame when there are none).
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT date, realtime_start, value FROM vintages WHERE code = ? ORDER BY date, realtime_start",
+                (code,),
+            ).fetchall()
+        table = pd.DataFrame(rows, columns=["date", "realtime_start", "value"])
+        table["date"] = pd.to_datetime(table["date"])
+        table["realtime_start"] = pd.to_datetime(table["realtime_start"])
+        return table
+
+
+_default_cache = None
+
+
+def default_cache():
+    """
+    Process-wide cache configured from the MRPA_* environment variables.
+    """
+    global _default_cache
+    if _default_cache is None:
+        directory = cache_dir()
+        ttl = timedelta(hours=float(os.environ.get("MRPA_CACHE_TTL", DEFAULT_TTL.total_seconds() / 3600)))
+        offline = os.environ.get("MRPA_OFFLINE", "") not in ("", "0")
+        _default_cache = FredCache(os.path.join(directory, "fred.sqlite"), ttl=ttl, offline=offline)
+    return _default_cache
@@ -0,0 +1,75 @@
+"""
+Full historical regime time series.
+
+Evaluates, for every month of the fetched window, what compute_latest_snapshot
+evaluates for the last observation only: inflation and growth YoY, their
+levels, the position % inside each level, the macro regime and the
+allocation — in one vectorized pass over the aligned monthly frame.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bands import GROWTH_LEVELS, INFLATION_LEVELS, classify, position_pct
+from MRPA import detect_macro_regime, get_macro_data, portflio_macro_alocation
+from transforms import monthly_frame
+
+
+# Quadrant code = 2 * (inflation level >= 2) + (growth level >= 2)
+_QUADRANT_LEVELS = [(0, 0), (0, 2), (2, 0), (2, 2)]
+REGIMES = [detect_macro_regime(i, g) for i, g in _QUADRANT_LEVELS]
+ALLOCATIONS = [portflio_macro_alocation(i, g) for i, g in _QUADRANT_LEVELS]
+
+
+def quadrant_code(infl_lvl, gdp_lvl):
+    """
+    Vectorized quadrant index (0-3) of the REGIMES / ALLOCATIONS tables.
+    """
+    return 2 * (np.asarray(infl_lvl) >= 2) + (np.asarray(gdp_lvl) >= 2)
+
+
+def regime_history(cpi, gdp, pol, unrt, signals=False):
+    """
+    Returns a date-indexed DataFrame with one row per month:
+    inflation, growth, infl_lvl, gdp_lvl, infl_pos_pct, gdp_pos_pct,
+    regime and allocation — plus the trend signals of signals.signal_frame
+    when signals=True.
+    """
+    monthly = monthly_frame(cpi, gdp, pol, unrt)
+    frame = monthly[["cpi_yoy", "gdp_yoy"]].dropna()
+    inflation = frame["cpi_yoy"].to_numpy()
+    growth = frame["gdp_yoy"].to_numpy()
+
+    infl_lvl = classify(inflation, INFLATION_LEVELS)
+    gdp_lvl = classify(growth, GROWTH_LEVELS)
+    code = quadrant_code(infl_lvl, gdp_lvl)
+
+    history = pd.DataFrame(
+        {
+            "inflation": inflation,
+            "growth": growth,
+            "infl_lvl": infl_lvl.astype(np.int8),
+            "gdp_lvl": gdp_lvl.astype(np.int8),
+            "infl_pos_pct": position_pct(inflation, infl_lvl, INFLATION_LEVELS),
+            "gdp_pos_pct": position_pct(growth, gdp_lvl, GROWTH_LEVELS),
+            "regime": pd.Categorical.from_codes(code, REGIMES),
+            "allocation": pd.Categorical.from_codes(code, ALLOCATIONS),
+        },
+        index=frame.index,
+    )
+    if signals:
+        from signals import signal_frame
+
+        trends = signal_frame(monthly["cpi_yoy"].dropna(), monthly["gdp_yoy"].dropna(), monthly["unrt_chg"])
+        history = history.join(trends, how="left")
+    return history
+
+
+def compute_history(region="FR", start=datetime(2000, 1, 1), cache=None):
+    """
+    Fetches a region (through the cache) and returns its regime history.
+    """
+    cpi, gdp, pol, unrt = get_macro_data(region, start, cache=cache)
+    return regime_history(cpi, gdp, pol, unrt)
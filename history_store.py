@@ -0,0 +1,252 @@
+"""
+Memory-mapped columnar store of the raw series and derived indicators of
+every region, on one common monthly date axis.
+
+    python history_store.py build --regions FR DE US --start 1990-01
+    store = HistoryStore.open()              # lecture seule, zéro copie
+    store.column("cpi_yoy", "FR")            # vue float32 sur le fichier
+    store.history("FR")                      # = history.regime_history
+
+On disk (``paths.store_dir()`` by default):
+
+    meta.json    regions, columns, first month, valid span of each region
+    values.npy   float32 (n_float_columns, n_regions, n_months)
+    codes.npy    int8    (n_code_columns, n_regions, n_months), -1 = missing
+
+Every (column, region) series is contiguous, so slices are views on the
+mapping. Processes that open the same store share its pages through the OS
+page cache instead of each holding DataFrames, lists and NumPy copies.
+YoY and position values are computed in float64 before being stored as
+float32; levels, 0.5-point steps and regime codes are stored as int8.
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bands import (
+    GROWTH_BANDS,
+    GROWTH_LEVELS,
+    GROWTH_STEPS,
+    INFLATION_BANDS,
+    INFLATION_LEVELS,
+    INFLATION_STEPS,
+    band_index,
+    classify,
+    position_pct,
+)
+from paths import store_dir
+from transforms import month_ends, monthly_frame
+
+
+FLOAT_COLUMNS = [
+    "cpi", "cpi_yoy", "gdp", "gdp_yoy", "gdp_qoq", "pol", "pol_mean",
+    "unrt", "unrt_mean", "unrt_yoy", "unrt_chg", "infl_pos_pct", "gdp_pos_pct",
+]
+
+# infl_step / gdp_step : numéro de palier (band_index de INFLATION_STEPS / GROWTH_STEPS)
+# regime_code          : infl_band * 10 + gdp_band (detect_previous_regime)
+# quadrant_code        : history.quadrant_code des niveaux infl_lvl / gdp_lvl (index de REGIMES)
+CODE_COLUMNS = ["infl_lvl", "gdp_lvl", "infl_step", "gdp_step", "regime_code", "quadrant_code"]
+
+MISSING = -1
+
+
+def indicators(cpi, gdp, pol, unrt):
+    """
+    Month-end frame of a region with every FLOAT_COLUMNS and CODE_COLUMNS
+    column (codes are MISSING where inflation or growth is unknown).
+    """
+    from history import quadrant_code
+
+    frame = monthly_frame(cpi, gdp, pol, unrt)
+    inflation = frame["cpi_yoy"].to_numpy(dtype=float)
+    growth = frame["gdp_yoy"].to_numpy(dtype=float)
+    known = ~(np.isnan(inflation) | np.isnan(growth))
+
+    infl_lvl = classify(inflation, INFLATION_LEVELS)
+    gdp_lvl = classify(growth, GROWTH_LEVELS)
+    infl_step = band_index(inflation, INFLATION_STEPS)
+    gdp_step = band_index(growth, GROWTH_STEPS)
+    regime_code = (
+        classify(np.asarray(INFLATION_STEPS["labels"])[infl_step], INFLATION_BANDS) * 10
+        + classify(np.asarray(GROWTH_STEPS["labels"])[gdp_step], GROWTH_BANDS)
+    )
+    quadrant = quadrant_code(infl_lvl, gdp_lvl)
+
+    frame["infl_pos_pct"] = np.where(known, position_pct(inflation, infl_lvl, INFLATION_LEVELS), np.nan)
+    frame["gdp_pos_pct"] = np.where(known, position_pct(growth, gdp_lvl, GROWTH_LEVELS), np.nan)
+    for name, codes in zip(CODE_COLUMNS, (infl_lvl, gdp_lvl, infl_step, gdp_step, regime_code, quadrant)):
+        frame[name] = np.where(known, codes, MISSING).astype(np.int8)
+    return frame
+
+
+def build(data, path=None):
+    """
+    Writes the store of `data` (dict region -> (cpi, gdp, pol, unrt)) and
+    returns it opened read-only. An existing store at `path` is replaced.
+    """
+    path = path or store_dir()
+    frames = {region: indicators(*series) for region, series in data.items()}
+    months = [frame.index.values.astype("datetime64[M]") for frame in frames.values()]
+    first = min(m[0] for m in months)
+    n_months = int(max(m[-1] for m in months) - first) + 1
+
+    os.makedirs(path, exist_ok=True)
+    tmp = {name: os.path.join(path, f".{name}.npy") for name in ("values", "codes")}
+    values = np.lib.format.open_memmap(tmp["values"], "w+", np.float32, (len(FLOAT_COLUMNS), len(frames), n_months))
+    codes = np.lib.format.open_memmap(tmp["codes"], "w+", np.int8, (len(CODE_COLUMNS), len(frames), n_months))
+    values[:] = np.nan
+    codes[:] = MISSING
+
+    spans = {}
+    for r, (region, frame) in enumerate(frames.items()):
+        offset = int(months[r][0] - first)
+        window = slice(offset, offset + len(frame))
+        values[:, r, window] = frame[FLOAT_COLUMNS].to_numpy(dtype=np.float32).T
+        codes[:, r, window] = frame[CODE_COLUMNS].to_numpy(dtype=np.int8).T
+        known = np.flatnonzero(frame["regime_code"].to_numpy() != MISSING)
+        spans[region] = [offset + int(known[0]), offset + int(known[-1]) + 1] if known.size else [offset, offset]
+    values.flush()
+    codes.flush()
+    del values, codes
+
+    meta = {
+        "first_month": str(first),
+        "n_months": n_months,
+        "regions": list(frames),
+        "float_columns": FLOAT_COLUMNS,
+        "code_columns": CODE_COLUMNS,
+        "spans": spans,
+    }
+    for name, tmp_path in tmp.items():
+        os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+    return HistoryStore(path)
+
+
+class HistoryStore:
+    """
+    Read-only view of a store written by build().
+    """
+
+    def __init__(self, path=None):
+        self.path = path or store_dir()
+        with open(os.path.join(self.path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.regions = meta["regions"]
+        self.spans = {region: tuple(span) for region, span in meta["spans"].items()}
+        self._rows = {region: i for i, region in enumerate(self.regions)}
+        self._float = {name: i for i, name in enumerate(meta["float_columns"])}
+        self._code = {name: i for i, name in enumerate(meta["code_columns"])}
+        self.values = np.load(os.path.join(self.path, "values.npy"), mmap_mode="r")
+        self.codes = np.load(os.path.join(self.path, "codes.npy"), mmap_mode="r")
+        months = np.datetime64(meta["first_month"], "M") + np.arange(meta["n_months"])
+        in_ns_range = months.size == 0 or (months[0] >= np.datetime64("1678-01") and months[-1] < np.datetime64("2262-01"))
+        unit = "ns" if in_ns_range else "s"
+        self.dates = month_ends(pd.DatetimeIndex(months.astype(f"datetime64[{unit}]"), name="DATE"))
+
+    @classmethod
+    def open(cls, path=None):
+        return cls(path)
+
+    def column(self, name, region=None, valid=False):
+        """
+        Zero-copy view of a column: (n_regions, n_months), or (n_months,)
+        for one region — only its valid span when valid=True.
+        """
+        if name in self._float:
+            data = self.values[self._float[name]]
+        elif name in self._code:
+            data = self.codes[self._code[name]]
+        else:
+            raise ValueError(f"Unknown column {name!r}.")
+        if region is None:
+            return data
+        data = data[self._rows[region]]
+        return data[slice(*self.spans[region])] if valid else data
+
+    def index(self, region=None):
+        """
+        Date axis of the store, or of the valid span of a region.
+        """
+        return self.dates if region is None else self.dates[slice(*self.spans[region])]
+
+    def series(self, name, region, valid=True):
+        return pd.Series(self.column(name, region, valid), index=self.index(region) if valid else self.dates, name=name, copy=False)
+
+    def frame(self, region, columns=None, valid=True):
+        columns = columns or list(self._float) + list(self._code)
+        return pd.DataFrame({name: self.column(name, region, valid) for name in columns}, index=self.index(region) if valid else self.dates)
+
+    def steps(self, region):
+        """
+        0.5-point inflation and growth steps of the valid span (sweep input).
+        """
+        infl = np.asarray(INFLATION_STEPS["labels"], dtype=float)[self.column("infl_step", region, valid=True)]
+        gdp = np.asarray(GROWTH_STEPS["labels"], dtype=float)[self.column("gdp_step", region, valid=True)]
+        return infl, gdp
+
+    def history(self, region):
+        """
+        Same DataFrame as history.regime_history, rebuilt from the store.
+        """
+        from history import ALLOCATIONS, REGIMES
+
+        # MISSING (-1) dans la période valide : NaN pour from_codes
+        code = self.column("quadrant_code", region, valid=True).astype(np.int64)
+        return pd.DataFrame(
+            {
+                "inflation": self.column("cpi_yoy", region, valid=True),
+                "growth": self.column("gdp_yoy", region, valid=True),
+                "infl_lvl": self.column("infl_lvl", region, valid=True),
+                "gdp_lvl": self.column("gdp_lvl", region, valid=True),
+                "infl_pos_pct": self.column("infl_pos_pct", region, valid=True),
+                "gdp_pos_pct": self.column("gdp_pos_pct", region, valid=True),
+                "regime": pd.Categorical.from_codes(code, REGIMES),
+                "allocation": pd.Categorical.from_codes(code, ALLOCATIONS),
+            },
+            index=self.index(region),
+        )
+
+
+def build_from_cache(regions=None, start=datetime(2000, 1, 1), path=None, cache=None, max_workers=8):
+    """
+    Fetches the regions through the FRED cache and builds their store.
+    """
+    from MRPA import get_macro_data_batch
+
+    return build(get_macro_data_batch(regions, start, cache=cache, max_workers=max_workers), path)
+
+
+def main(argv=None):
+    from cli import parse_start
+
+    parser = argparse.ArgumentParser(description="Builds or inspects the columnar history store.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--path", help="dossier du store (défaut : <cache>/store)")
+    parser.add_argument("--regions", nargs="+", metavar="REGION", help="régions (défaut : toutes)")
+    parser.add_argument("--start", default=datetime(2000, 1, 1), type=parse_start, help="début des séries, YYYY-MM[-DD]")
+    parser.add_argument("--offline", action="store_true", help="ne lit que le cache local (MRPA_OFFLINE=1)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.offline:
+            os.environ["MRPA_OFFLINE"] = "1"
+        store = build_from_cache(args.regions, args.start, args.path)
+    else:
+        store = HistoryStore(args.path)
+    size = store.values.nbytes + store.codes.nbytes
+    print(f"{store.path}: {len(store.regions)} regions x {len(store.dates)} months, {size / 2**20:.1f} MiB")
+    for region in store.regions:
+        dates = store.index(region)
+        print(f"  {region:<4} {str(dates[0])[:7]} .. {str(dates[-1])[:7]}" if len(dates) else f"  {region:<4} -")
+
+
+if __name__ == "__main__":
+    main()
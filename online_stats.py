@@ -0,0 +1,175 @@
+"""
+Streaming statistics for z-scores and tanh adjustments.
+
+Three accumulators share the same interface (push, mean, std, zscore):
+
+    RunningStats   Welford mean / sample variance over everything seen so far
+    EWStats        exponentially weighted mean / variance
+    WindowStats    mean / sample variance over the last `size` values
+
+The accumulators serve incremental updates (streaming.RegimeState).
+``zscores`` returns the same point-in-time z-scores for a whole series with
+the vectorized pandas kernels (expanding / ewm / rolling). Its last value,
+like ``RunningStats().extend(x).zscore(x[-1])`` (batch merge, no Python
+loop), equals the batch formula ``(x[-1] - x.mean()) / x.std()``.
+"""
+
+from collections import deque
+from math import sqrt
+
+import numpy as np
+import pandas as pd
+
+
+class _Stats:
+    # interface commune : push, mean, variance, std, zscore
+
+    @property
+    def std(self):
+        variance = self.variance
+        return sqrt(variance) if variance == variance else float("nan")
+
+    def zscore(self, x):
+        # écart-type nul ou inconnu : z-score indéfini
+        std = self.std
+        return (x - self.mean) / std if std > 0 else float("nan")
+
+
+class RunningStats(_Stats):
+    """
+    Welford running mean / sample variance.
+    """
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n, self.mean, self.m2 = n, mean, m2
+
+    def push(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def extend(self, values):
+        """
+        Adds a batch of values at once (Chan et al. merge of the batch mean
+        and sum of squared deviations); NaN values are skipped.
+        """
+        x = np.asarray(values, dtype=float)
+        x = x[~np.isnan(x)]
+        if not x.size:
+            return self
+        n, mean = x.size, x.mean()
+        m2 = float(((x - mean) ** 2).sum())
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+
+class EWStats(_Stats):
+    """
+    Exponentially weighted mean / variance (pandas ewm with adjust=False, bias=True).
+    """
+
+    def __init__(self, alpha=None, halflife=None, n=0, mean=0.0, var=0.0):
+        if alpha is None:
+            if halflife is None:
+                raise ValueError("EWStats needs alpha or halflife.")
+            alpha = 1 - 0.5 ** (1 / halflife)
+        self.alpha, self.n, self.mean, self.var = alpha, n, mean, var
+
+    def push(self, x):
+        self.n += 1
+        if self.n == 1:
+            self.mean, self.var = x, 0.0
+            return
+        delta = x - self.mean
+        self.mean += self.alpha * delta
+        self.var = (1 - self.alpha) * (self.var + self.alpha * delta * delta)
+
+    @property
+    def variance(self):
+        return self.var
+
+
+class WindowStats(_Stats):
+    """
+    Mean / sample variance over the last `size` values (Welford add and
+    remove), undefined until the window is full.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.mean, self.m2 = 0.0, 0.0
+
+    @property
+    def n(self):
+        return len(self.values)
+
+    def push(self, x):
+        if len(self.values) == self.size:
+            old = self.values.popleft()
+            if self.values:
+                delta = old - self.mean
+                self.mean -= delta / len(self.values)
+                self.m2 -= delta * (old - self.mean)
+            else:
+                self.mean, self.m2 = 0.0, 0.0
+        self.values.append(x)
+        delta = x - self.mean
+        self.mean += delta / len(self.values)
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        return max(self.m2, 0.0) / (self.n - 1) if self.n == self.size and self.n > 1 else float("nan")
+
+
+def accumulator(kind="expanding", window=None, alpha=None, halflife=None):
+    """
+    Empty accumulator of `kind`: "expanding" (RunningStats), "ewm" (EWStats,
+    alpha or halflife) or "rolling" (WindowStats, window).
+    """
+    if kind == "expanding":
+        return RunningStats()
+    if kind == "ewm":
+        return EWStats(alpha, halflife)
+    if kind == "rolling":
+        if not window or window < 1:
+            raise ValueError("Rolling z-scores need a window of at least one value.")
+        return WindowStats(window)
+    raise ValueError(f"Unknown z-score kind: {kind!r}")
+
+
+def zscores(values, kind="expanding", window=None, alpha=None, halflife=None):
+    """
+    Full z-score series of `values` (Series, single-column DataFrame or
+    array), each point using only the values up to it: the z-scores that
+    pushing the values one by one into accumulator(kind, ...) would give,
+    computed with the pandas window kernels. NaN values are skipped and stay NaN.
+    """
+    if isinstance(values, pd.DataFrame):
+        values = values.iloc[:, 0]
+    series = pd.Series(values, dtype=float) if not isinstance(values, pd.Series) else values.astype(float)
+    accumulator(kind, window, alpha, halflife)      # mêmes paramètres, mêmes erreurs
+
+    # les accumulateurs ignorent les NaN : fenêtres calculées sur les seules valeurs connues
+    clean = series.dropna()
+    if kind == "expanding":
+        stats = clean.expanding()
+        mean, std = stats.mean(), stats.std()
+    elif kind == "ewm":
+        stats = clean.ewm(alpha=alpha, halflife=halflife, adjust=False)
+        mean, std = stats.mean(), np.sqrt(stats.var(bias=True))
+    else:
+        stats = clean.rolling(window)
+        mean, std = stats.mean(), stats.std()
+    z = ((clean - mean) / std).where(std > 0)
+    return z.reindex(series.index).rename(series.name)
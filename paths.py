@@ -0,0 +1,37 @@
+"""
+Locations of the local cache files. Kept free of heavy imports so that the
+cached-snapshot path of the CLI can use it without loading pandas.
+"""
+
+import os
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mrpa")
+
+
+def cache_dir():
+    """
+    Cache directory (MRPA_CACHE_DIR or ~/.cache/mrpa).
+    """
+    return os.environ.get("MRPA_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def snapshot_path():
+    """
+    JSON file holding the last computed snapshot of each region.
+    """
+    return os.path.join(cache_dir(), "snapshots.json")
+
+
+def store_dir():
+    """
+    Directory of the memory-mapped history store (history_store.py).
+    """
+    return os.path.join(cache_dir(), "store")
+
+
+def result_dir():
+    """
+    Directory of the content-addressed cache of derived results (result_cache.py).
+    """
+    return os.path.join(cache_dir(), "results")
@@ -0,0 +1,277 @@
+"""
+Per-stage instrumentation of the pipeline: wall time, call counts, peak
+memory (tracemalloc) and counters (cache hits/misses, network bytes).
+
+    python MRPA.py --profile                 # tableau récapitulatif sur stderr
+    python dashboard.py --profile run        # + run.json et run.pstats
+
+    import profiling
+    with profiling.profile(memory=True) as prof:
+        compute_latest_snapshot("FR")
+    prof.print_summary()
+
+Stages nest: a stage opened inside another one is recorded under its path
+("region[FR]/data_optimization"), so per-region and per-series figures come
+out of the same table. Each thread has its own stack (fetch workers record
+their own "cache[CODE]" roots); tracemalloc peaks are process-wide.
+
+When no profiler is active, ``stage`` returns a shared no-op context and
+``count`` returns immediately, so the instrumentation costs one global lookup.
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+
+_active = None
+_NULL = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start", "base", "peak")
+
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self)
+        return False
+
+
+class Profiler:
+    """
+    Collects stage timings and counters; see the module docstring.
+    """
+
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.stages = {}        # path -> [calls, seconds, peak bytes]
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cprofile = None
+        if cprofile:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+        if memory:
+            import tracemalloc
+
+            self._tracemalloc = tracemalloc
+
+    def start(self):
+        if self.memory and not self._tracemalloc.is_tracing():
+            self._tracemalloc.start()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        return self
+
+    def stop(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self.memory and self._tracemalloc.is_tracing():
+            self._tracemalloc.stop()
+        return self
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, frame):
+        stack = self._stack()
+        frame.name = f"{stack[-1].name}/{frame.name}" if stack else frame.name
+        if self.memory:
+            current, peak = self._tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            self._tracemalloc.reset_peak()
+            frame.base = frame.peak = current
+        stack.append(frame)
+        if frame.name not in self.stages:
+            with self._lock:
+                self.stages.setdefault(frame.name, [0, 0.0, 0])
+        frame.start = time.perf_counter()
+
+    def _exit(self, frame):
+        elapsed = time.perf_counter() - frame.start
+        stack = self._stack()
+        stack.pop()
+        peak = 0
+        if self.memory:
+            frame.peak = max(frame.peak, self._tracemalloc.get_traced_memory()[1])
+            peak = frame.peak - frame.base
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, frame.peak)
+        with self._lock:
+            row = self.stages[frame.name]
+            row[0] += 1
+            row[1] += elapsed
+            row[2] = max(row[2], peak)
+
+    def stage(self, name, label=None):
+        return _Stage(self, name if label is None else f"{name}[{label}]")
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        return {
+            "stages": {
+                path: {"calls": calls, "seconds": seconds, "peak_bytes": peak}
+                for path, (calls, seconds, peak) in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def save_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def dump_stats(self, path):
+        """
+        Writes the cProfile statistics (open with pstats / snakeviz).
+        """
+        if self._cprofile is None:
+            raise ValueError("The profiler was created without cprofile=True.")
+        self._cprofile.dump_stats(path)
+
+    def _ordered(self):
+        # parents before children, siblings in order of first call
+        first = {path: i for i, path in enumerate(self.stages)}
+        parts = lambda path: path.split("/")
+        return sorted(
+            self.stages.items(),
+            key=lambda item: [first["/".join(parts(item[0])[:k + 1])] for k in range(len(parts(item[0])))],
+        )
+
+    def print_summary(self, file=None):
+        from rich.console import Console
+        from rich.table import Table
+
+        table = Table(title="Pipeline profile", show_header=True, header_style="bold magenta")
+        for column in ("Stage", "Calls", "Wall ms", "ms / call", "Peak MiB"):
+            table.add_column(column, justify="left" if column == "Stage" else "right")
+        for path, (calls, seconds, peak) in self._ordered():
+            depth = path.count("/")
+            table.add_row(
+                "  " * depth + path.rsplit("/", 1)[-1],
+                str(calls),
+                f"{seconds * 1e3:,.1f}",
+                f"{seconds * 1e3 / calls:,.2f}",
+                f"{peak / 2**20:,.2f}" if self.memory else "-",
+            )
+        console = Console(file=file or sys.stderr)
+        console.print(table)
+        if self.counters:
+            counters = Table(title="Counters", show_header=True, header_style="bold magenta")
+            counters.add_column("Counter", justify="left")
+            counters.add_column("Value", justify="right")
+            for name, value in sorted(self.counters.items()):
+                counters.add_row(name, f"{value:,}")
+            console.print(counters)
+
+
+def stage(name, label=None):
+    """
+    Context manager timing one pipeline stage (no-op when profiling is off).
+    """
+    if _active is None:
+        return _NULL
+    return _active.stage(name, label)
+
+
+def count(name, n=1):
+    """
+    Adds `n` to a counter of the active profiler (no-op when profiling is off).
+    """
+    if _active is not None:
+        _active.count(name, n)
+
+
+def profiled(name=None):
+    """
+    Decorator: records every call of the function as a stage.
+    """
+    def decorate(func):
+        stage_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.stage(stage_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def enable(memory=False, cprofile=False):
+    """
+    Starts a process-wide profiler and returns it.
+    """
+    global _active
+    _active = Profiler(memory, cprofile).start()
+    return _active
+
+
+def disable():
+    """
+    Stops the active profiler and returns it (None if none was active).
+    """
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def active():
+    return _active
+
+
+@contextmanager
+def profile(memory=False, cprofile=False):
+    profiler = enable(memory, cprofile)
+    try:
+        yield profiler
+    finally:
+        disable()
+
+
+def add_argument(parser):
+    """
+    Adds the --profile [PREFIX] option shared by the command-line entry points.
+    """
+    parser.add_argument(
+        "--profile", nargs="?", const="", metavar="PREFIX",
+        help="temps, appels et mémoire par étape (sur stderr) ; PREFIX.json et PREFIX.pstats si donné",
+    )
+
+
+@contextmanager
+def from_args(args):
+    """
+    Profiles the body when --profile was given, then prints / exports the report.
+    """
+    if args.profile is None:
+        yield None
+        return
+    with profile(memory=True, cprofile=bool(args.profile)) as profiler:
+        yield profiler
+    profiler.print_summary()
+    if args.profile:
+        profiler.save_json(f"{args.profile}.json")
+        profiler.dump_stats(f"{args.profile}.pstats")
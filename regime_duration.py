@@ -7,14 +7,44 @@ from MRPA import (
     analyze_growth_data,
     precision_macro_regime,
 )
+from bands import GROWTH_BANDS, GROWTH_STEPS, INFLATION_BANDS, INFLATION_STEPS, classify
+from results import RegimeAnalysis
+from signals import PERSISTENCE_LABELS, TREND_LABELS, persistence_codes, trend_codes
+from transforms import monthly_frame, to_monthly, yoy
+from cli import parse_start
+from forecast import RegimeForecaster
+from result_cache import cached
+import profiling
+import argparse
 from datetime import datetime
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from rich.console import Console
 from rich.table  import Table
 from rich.panel  import Panel
 
+ASSETS = ["Actions", "Or", "Cash", "Obligations"]
+
+QUADRANTS = [
+    'Inflation + / Croissance +',
+    'Inflation + / Croissance -',
+    'Deflation + / Croissance +',
+    'Deflation + /Croissance -',
+    'Zone grise',
+]
+
+# Seuils (en paliers de 0.5 point) au-dessus desquels inflation / croissance sont "+"
+QUADRANT_THRESHOLDS = {"inflation": 2, "growth": 2}
+
+# Allocation (%) par quadrant
+QUADRANT_WEIGHTS = {
+    'Inflation + / Croissance +': {"Actions": 33, "Or": 33, "Cash": 33, "Obligations": 0},
+    'Inflation + / Croissance -': {"Actions": 0, "Or": 50, "Cash": 50, "Obligations": 0},
+    'Deflation + / Croissance +': {"Actions": 50, "Or": 0, "Cash": 0, "Obligations": 50},
+    'Deflation + /Croissance -': {"Actions": 0, "Or": 0, "Cash": 50, "Obligations": 50},
+    'Zone grise': {"Actions": 0, "Or": 0, "Cash": 0, "Obligations": 0},
+}
+
 # Get data
 # Get last infl level and growth level
 # Def current regime
@@ -23,44 +53,33 @@ from rich.panel  import Panel
 # Repeat until the end of the data
 
 
-def get_long_macro_data():
+def get_long_macro_data(region="FR", start=datetime(2000, 1, 1)):
     """
-    Fetches long-term macroeconomic data for France and returns each series.
+    Fetches long-term macroeconomic data (France by default) and returns each series.
     """
-    cpi, gdp, pol, unrt = get_macro_data(region="FR", start=datetime(2000, 1, 1))
+    cpi, gdp, pol, unrt = get_macro_data(region=region, start=start)
     return cpi, gdp, pol, unrt
 
 
-def long_data_optimization():
+@profiling.profiled()
+def long_data_optimization(cpi=None, gdp=None, pol=None, unrt=None):
     """
     Optimizes long-term macroeconomic data for France.
+    Pass already fetched series to avoid downloading them a second time.
+    The "lists" are date-indexed Series (see transforms.monthly_frame).
     """
-    cpi, gdp, pol, unrt = get_long_macro_data()
+    if cpi is None:
+        cpi, gdp, pol, unrt = get_long_macro_data()
     latest_infl, latest_gdp, *_ = data_optimization(cpi, gdp, pol, unrt)
 
-    
-    inflation_list = []
-    gdp_list = []
+    frame = monthly_frame(cpi, gdp, pol, unrt)
 
-    
-
-    for i in range(13, len(cpi)):
-        inflation_list.append(((cpi.iloc[i - 1].item() / cpi.iloc[i - 13].item()) - 1) * 100)
-       
-        
-    for i in range(4, len(gdp)):
-        gdp_list.append(((gdp.iloc[i - 1].item() / gdp.iloc[i - 4].item()) - 1) * 100)
-
-    gdp_m = gdp.resample("ME").ffill()
-    gdp_m_list = []
-    for i in range(13, len(gdp_m)):
-        gdp_m_list.append(((gdp_m.iloc[i - 1].item() / gdp_m.iloc[i - 13].item()) - 1) * 100)
-    
-    unrt_m = unrt.resample("ME").ffill()
-    unrt_m_list = []
-    for i in range(13, len(unrt_m)):
-        unrt_m_list.append(((unrt_m.iloc[i - 1].item() / unrt_m.iloc[i - 13].item()) - 1) * 100)
-    unrt_chg = unrt_m.diff(3)
+    inflation_list = frame["cpi_yoy"].dropna()
+    gdp_list = yoy(gdp, 4).dropna()
+    gdp_m = to_monthly(gdp, quarterly=True)
+    gdp_m_list = frame["gdp_yoy"].dropna()
+    unrt_m_list = frame["unrt_yoy"].dropna()
+    unrt_chg = frame["unrt_chg"][frame["unrt"].notna()]      # période du chômage seulement
 
     return latest_infl, latest_gdp, inflation_list, gdp_list, gdp_m_list, gdp_m, unrt_m_list, unrt_chg
 
@@ -90,74 +109,28 @@ def detect_curent_regime(inflation_level, growth_level):
 
 
 
-def detect_previous_regime(inflation_list, gdp_list, gdp_m_list, unrt_chg):
-
-    infl_lvl_list = []
-    gdp_lvl_list= []
-    gdp_m_lvl_list = []
-
-    for i in range(len(inflation_list)):
-        
-        if (inflation_list[i]) < 0:
-            infl_lvl_list.append(0)
-        elif 0 <= (inflation_list[i]) < 0.5:
-            infl_lvl_list.append(0.5) 
-        elif 0.5 <= (inflation_list[i]) < 1:
-            infl_lvl_list.append(1)
-        elif 1 <= (inflation_list[i]) < 1.5:
-            infl_lvl_list.append(1.5)  
-        elif 1.5 <= (inflation_list[i]) < 2:
-            infl_lvl_list.append(2)
-        elif 2 <= (inflation_list[i]) < 2.5:
-            infl_lvl_list.append(2.5)   
-        elif 2.5 <= (inflation_list[i]) < 3:
-            infl_lvl_list.append(3)
-        elif 3 <= (inflation_list[i]) < 3.5:
-            infl_lvl_list.append(3.5)
-        elif 3.5 <= (inflation_list[i]) < 4:
-            infl_lvl_list.append(4)  
-        elif 4 <= (inflation_list[i]) < 4.5:
-            infl_lvl_list.append(4.5)   
-        else:
-            infl_lvl_list.append(5)
-
-
-    for i in range(len(gdp_m_list)):
-        if gdp_m_list[i] < -2:
-            gdp_m_lvl_list.append(-2)
-        elif -1 <= gdp_m_list[i] < 0:
-            gdp_m_lvl_list.append(0)
-        elif 0 <= gdp_m_list[i] < 0.5:
-            gdp_m_lvl_list.append(0.5)
-        elif 0.5 <= gdp_m_list[i] < 1:
-            gdp_m_lvl_list.append(1)
-        elif 1 <= gdp_m_list[i] < 1.5:
-            gdp_m_lvl_list.append(1.5)    
-        elif 1.5 <= gdp_m_list[i] < 2:
-            gdp_m_lvl_list.append(2)
-        elif 2 <= gdp_m_list[i] < 2.5:
-            gdp_m_lvl_list.append(2.5)
-        elif 2.5 <= gdp_m_list[i] < 3:
-            gdp_m_lvl_list.append(3)
-        elif 3 <= gdp_m_list[i] < 3.5:
-            gdp_m_lvl_list.append(3.5)  
-        elif 3.5 <= gdp_m_list[i] < 4:
-            gdp_m_lvl_list.append(4)  
-        else:
-            gdp_m_lvl_list.append(5)
-
+@profiling.profiled()
+def detect_previous_regime(inflation_list, gdp_list, gdp_m_list, unrt_chg, short=1, long=2, periods=2):
+    """
+    Regime codes, durations and the trend signals of the last month
+    (signals.trend_codes with `short` / `long`, persistence_codes with `periods`).
+    """
 
-    s_infl = pd.Series(infl_lvl_list)          # index par défaut 0…n-1
-    s_gdp  = pd.Series(gdp_m_lvl_list)
+    # 1) Paliers de 0.5 point puis bandes de régime (voir bands.py)
+    infl_lvl_list = classify(inflation_list, INFLATION_STEPS)
+    gdp_m_lvl_list = classify(gdp_m_list, GROWTH_STEPS)
+    if isinstance(inflation_list, pd.Series) and isinstance(gdp_m_list, pd.Series):
+        # séries datées : paliers remis sur leurs dates, puis alignés sur les dates communes
+        infl_lvl_list = pd.Series(infl_lvl_list, index=inflation_list.index, name=inflation_list.name)
+        gdp_m_lvl_list = pd.Series(gdp_m_lvl_list, index=gdp_m_list.index, name=gdp_m_list.name)
+        infl_lvl_list, gdp_m_lvl_list = infl_lvl_list.align(gdp_m_lvl_list, join="inner")
 
-    min_len = min(len(s_infl), len(s_gdp))     # tronque la série la plus longue
-    infl = s_infl.iloc[-min_len:].values
-    gdp  = s_gdp.iloc[-min_len:].values
+    min_len = min(len(infl_lvl_list), len(gdp_m_lvl_list))     # tronque la série la plus longue
+    infl = np.asarray(infl_lvl_list)[-min_len:]
+    gdp  = np.asarray(gdp_m_lvl_list)[-min_len:]
 
-    
-    # 1) Vectorise les bandes
-    infl_band = np.digitize(infl, [-np.inf, 0, 1, 2, 3, 4, np.inf]) - 1
-    gdp_band  = np.digitize(gdp, [-np.inf, -2, 0, 2, 4, np.inf]) - 1
+    infl_band = classify(infl, INFLATION_BANDS)
+    gdp_band  = classify(gdp, GROWTH_BANDS)
 
     # 2) Code unique
     regime_code = infl_band*10 + gdp_band        # 00, 01, …, 55
@@ -171,57 +144,30 @@ def detect_previous_regime(inflation_list, gdp_list, gdp_m_list, unrt_chg):
     else :predi = avg_dur - durations[-1]
     pct_avg_duration = durations[-1] * 100 / avg_dur
 
-    
-    cond_infl_down = inflation_list[-1] < inflation_list[-2]
-    cond_infl_down_plus = inflation_list[-1] < inflation_list[-3]
-    cond_infl_up = inflation_list[-1] > inflation_list[-2]
-    cond_infl_up_plus = inflation_list[-1] > inflation_list[-3]
-
-    cond_gdp_down = gdp_m_list[-1] < gdp_m_list[-2]
-    cond_gdp_down_plus = gdp_m_list[-1] < gdp_m_list[-3]
-    cond_gdp_up = gdp_m_list[-1] > gdp_m_list[-2]
-    cond_gdp_up_plus = gdp_m_list[-1] > gdp_m_list[-3]
-
-    si1 = cond_infl_down
-    si2 = cond_infl_up
-    si3 = cond_infl_down & cond_infl_down_plus
-    si4 = cond_infl_up & cond_infl_up_plus
-
-    sg1 = cond_infl_down
-    sg2 = cond_gdp_up
-    sg3 = cond_gdp_down & cond_gdp_down_plus
-    sg4 = cond_gdp_up & cond_gdp_up_plus
-
-    seasonality_infl_codes = np.select([si1, si2, si3, si4],
-                           ['Inflation moving down', 'Inflation moving up', 'Inflation moving down ++', 'Inflation moving up ++'],
-                           default='No seasonality')
-    seasonality_gdp_codes = np.select([sg1, sg2, sg3, sg4],
-                           ['GDP moving down', 'GDP moving up', 'GDP moving down ++', 'GDP moving up ++'],
-                           default='No seasonality')
-    
+    # signaux de tendance du dernier mois (signals.signal_frame pour tout l'historique)
+    window = max(short, long) + 1
+    seasonality_infl_codes = TREND_LABELS["inflation"][trend_codes(np.asarray(inflation_list, dtype=float)[-window:], short, long)[-1] + 2]
+    seasonality_gdp_codes = TREND_LABELS["gdp"][trend_codes(np.asarray(gdp_m_list, dtype=float)[-window:], short, long)[-1] + 2]
+
     if pct_avg_duration > 100 :
         prediction = (f"Regime should have changed {predi:.2f} months ago, incoming change anytime soon.")
     else :
         prediction = (f"Still have : {predi:.2f} months to go.")
 
-    su1 = (unrt_chg.iloc[-1] < 0) & (unrt_chg.iloc[-2] < 0)
-    su2 = (unrt_chg.iloc[-1] > 0) & (unrt_chg.iloc[-2] > 0)
-    seasonality_unrt_codes = np.select([su1, su2],
-        ['Unemployment falling', 'Unemployment rising'],
-        default='No trend')
+    seasonality_unrt_codes = PERSISTENCE_LABELS["unemployment"][persistence_codes(np.asarray(unrt_chg, dtype=float)[-periods:], periods)[-1] + 1]
     unrt_trend = np.where(unrt_chg < 0, "Unemp ↓", "Unemp ↑")
 
     
-    return infl_lvl_list, gdp_m_lvl_list, regime_code, change_idx, durations, avg_dur, predi, pct_avg_duration, seasonality_infl_codes, seasonality_gdp_codes, infl, prediction, seasonality_unrt_codes, unrt_trend
-
+    return RegimeAnalysis(infl_lvl_list, gdp_m_lvl_list, regime_code, change_idx, durations, avg_dur, predi, pct_avg_duration, seasonality_infl_codes, seasonality_gdp_codes, infl, prediction, seasonality_unrt_codes, unrt_trend)
 
 
-def advanced_portfolio_allocation(infl_lvl_list, gdp_m_lvl_list, latest_infl, latest_gdp):
 
-    Actions = 0
-    Or = 0
-    Cash =0
-    Obligations = 0
+@profiling.profiled()
+def advanced_portfolio_allocation(infl_lvl_list, gdp_m_lvl_list, latest_infl, latest_gdp, table=None):
+    """
+    Quadrant of each month and weights (%) of the current one, from
+    QUADRANT_WEIGHTS or from `table` (same layout, e.g. risk_parity.allocation_table).
+    """
 
     # --- alignement des tableaux pour qu’ils aient la même longueur ---
     s_infl = pd.Series(infl_lvl_list)          # index par défaut 0…n-1
@@ -231,79 +177,110 @@ def advanced_portfolio_allocation(infl_lvl_list, gdp_m_lvl_list, latest_infl, la
     infl = s_infl.iloc[-min_len:].values
     gdp  = s_gdp.iloc[-min_len:].values
     
-    cond_infl_plus  = infl >= 2
-    cond_infl_minus = infl <= 1.9999
-    cond_gdp_plus   = gdp  >= 2
-    cond_gdp_minus  = gdp  <= 1.9999
+    cond_infl_plus  = infl >= QUADRANT_THRESHOLDS["inflation"]
+    cond_infl_minus = infl <  QUADRANT_THRESHOLDS["inflation"]
+    cond_gdp_plus   = gdp  >= QUADRANT_THRESHOLDS["growth"]
+    cond_gdp_minus  = gdp  <  QUADRANT_THRESHOLDS["growth"]
 
     q1 =  cond_infl_plus  & cond_gdp_plus
     q2 =  cond_infl_plus  & cond_gdp_minus
     q3 =  cond_infl_minus & cond_gdp_plus
     q4 =  cond_infl_minus & cond_gdp_minus 
 
-    quadrant_codes = np.select([q1, q2, q3, q4],
-                           ['Inflation + / Croissance +', 'Inflation + / Croissance -', 'Deflation + / Croissance +', 'Deflation + /Croissance -'],
-                           default='Zone grise')
+    quadrant_codes = np.select([q1, q2, q3, q4], QUADRANTS[:4], default=QUADRANTS[4])
     current_quad = quadrant_codes[-1]
 
-    if current_quad == 'Inflation + / Croissance +' :
-        #print("Actions, Or, Cash")
-        Actions, Or, Cash = 33, 33, 33
-    elif current_quad == 'Inflation + / Croissance -' :
-        #print("Or, Cash")
-        Or, Cash = 50, 50
-    elif current_quad == 'Deflation + / Croissance +' :
-        #print("Actions, Obligations")
-        Actions, Obligations = 50, 50
-    elif current_quad ==  'Deflation + /Croissance -' :
-        #print("Cash, Obligations")
-        Cash, Obligations = 50, 50
+    weights = (table or QUADRANT_WEIGHTS)[current_quad]
+    Actions, Or, Cash, Obligations = (weights[asset] for asset in ASSETS)
 
    # infl_pos_pct, gdp_pos_pct = precision_macro_regime(infl_lvl, gdp_lvl)
 
     return quadrant_codes, current_quad, Or, Cash, Actions, Obligations
 
 
+def regime_analysis(cpi, gdp, pol, unrt):
+    """
+    long_data_optimization, detect_previous_regime and
+    advanced_portfolio_allocation of one region, in one cacheable result.
+    """
+    optimized = long_data_optimization(cpi, gdp, pol, unrt)
+    latest_infl, latest_gdp, inflation_list, gdp_list, gdp_m_list, _, _, unrt_chg = optimized
+    analysis = detect_previous_regime(inflation_list, gdp_list, gdp_m_list, unrt_chg)
+    allocation = advanced_portfolio_allocation(analysis.infl_lvl_list, analysis.gdp_m_lvl_list, latest_infl, latest_gdp)
+    return optimized, analysis, allocation
+
+
 if __name__ == "__main__":
-    
-    cpi, gdp, pol, unrt = get_long_macro_data()
-    latest_infl, latest_gdp, inflation_list, gdp_list, gdp_m_list, gdp_m, unrt_m_list, unrt_chg = long_data_optimization()
-    infl_lvl, gdp_lvl = detect_inflation_level(latest_infl), detect_growth_level(latest_gdp)
-    current_regime = detect_curent_regime(infl_lvl, gdp_lvl)
-    infl_lvl_list, gdp_m_lvl_list, regime_code, change_idx, durations, avg_dur, predi, pct_avg_duration, seasonality_infl_codes, seasonality_gdp_codes, infl, prediction, seasonality_unrt_codes, unrt_trend = detect_previous_regime(inflation_list, gdp_list, gdp_m_list, unrt_chg)
-    quadrant_codes, current_quad, Or, Cash, Actions, Obligations = advanced_portfolio_allocation(infl_lvl_list, gdp_m_lvl_list, latest_infl, latest_gdp )
-    
-    #plt.plot(inflation_list)
-    #plt.ylabel('Regime List')
-    #plt.show()
-
-    console = Console()
-
-    table = Table(title="Macro Dashboard", show_header=True, header_style="bold magenta")
-    table.add_column("Metric",  justify="left")
-    table.add_column("Value",   justify="right")
-    table.add_row("Latest CPI YoY",  f"{latest_infl:,.2f} %")
-    table.add_row("Inflation level", str(infl_lvl))
-    table.add_row("Latest GDP YoY",  f"{latest_gdp:,.2f} %")
-    table.add_row("Growth level",    str(gdp_lvl))
-    table.add_row("AVG Regime Time",    str(avg_dur))
-    table.add_row("Since Last Regime Change",    str(durations[-1]))
-
-    console.print(table)
-    console.print(Panel(f"[bold yellow]Macro Regime[/bold yellow]\n{current_quad}", expand=False))
-    console.print(Panel(f"[bold yellow]Current % of the avg duration[/bold yellow]\nWe're at {pct_avg_duration:.2f}% of the average duration.", expand=True))
-    console.print(Panel(f"[bold yellow]Prediction[/bold yellow]\n{prediction}", expand=True))
-    console.print(Panel(f"[bold yellow]Seasonality Inflation[/bold yellow]\n{seasonality_infl_codes}", expand=False))
-    console.print(Panel(f"[bold yellow]Seasonality GDP[/bold yellow]\n{seasonality_gdp_codes}", expand=False))
-    console.print(Panel(f"[bold yellow]Seasonality Unemployment[/bold yellow]\n{seasonality_unrt_codes}", expand=False))
-
-    table = Table(title="Recommended Portfolio", show_header=True, header_style="bold green")
-    table.add_column("Type",  justify="left")
-    table.add_column("% Allocation",   justify="right")
-    table.add_row("Actions :",  f"{Actions:,.2f} %")
-    table.add_row("Gold :", f"{Or:,.2f} %")
-    table.add_row("Obligations :",  f"{Obligations:,.2f} %")
-    table.add_row("Cash :",    f"{Cash:,.2f} %")
-    console.print(table)
-    
-    
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Regime durations of one region.")
+    parser.add_argument("--country", default="FR", choices=sorted(SERIES), help="région (clé de SERIES)")
+    parser.add_argument("--start", default=datetime(2000, 1, 1), type=parse_start, help="début des séries, YYYY-MM[-DD]")
+    parser.add_argument("--paths", default=10_000, type=int, help="chemins Monte Carlo de la prévision")
+    parser.add_argument("--seed", default=None, type=int, help="graine du générateur aléatoire")
+    parser.add_argument("--returns", help="rendements mensuels des actifs (CSV/Parquet) : poids estimés par régime")
+    parser.add_argument("--method", default="risk_parity", choices=["risk_parity", "min_variance"], help="méthode d'allocation avec --returns")
+    profiling.add_argument(parser)
+    args = parser.parse_args()
+
+    with profiling.from_args(args):
+        cpi, gdp, pol, unrt = get_long_macro_data(args.country, args.start)
+        # servi par le cache de résultats si les séries n'ont pas changé
+        optimized, analysis, allocation = cached("regime_analysis", regime_analysis, cpi, gdp, pol, unrt)
+        latest_infl, latest_gdp, inflation_list, gdp_list, gdp_m_list, gdp_m, unrt_m_list, unrt_chg = optimized
+        infl_lvl, gdp_lvl = detect_inflation_level(latest_infl), detect_growth_level(latest_gdp)
+        current_regime = detect_curent_regime(infl_lvl, gdp_lvl)
+        infl_lvl_list, gdp_m_lvl_list, regime_code, change_idx, durations, avg_dur, predi, pct_avg_duration, seasonality_infl_codes, seasonality_gdp_codes, infl, prediction, seasonality_unrt_codes, unrt_trend = analysis
+        quadrant_codes, current_quad, Or, Cash, Actions, Obligations = allocation
+        if args.returns:
+            from backtest import load_returns
+            from risk_parity import allocation_table
+
+            with profiling.stage("allocation"):
+                dates = gdp_m_lvl_list.index[-len(quadrant_codes):]
+                table = allocation_table(pd.Series(quadrant_codes, index=dates), load_returns(args.returns), args.method)
+                quadrant_codes, current_quad, Or, Cash, Actions, Obligations = advanced_portfolio_allocation(infl_lvl_list, gdp_m_lvl_list, latest_infl, latest_gdp, table)
+        with profiling.stage("forecast"):
+            forecast = RegimeForecaster.from_codes(regime_code).forecast(horizon=12, n_paths=args.paths, seed=args.seed)
+
+        #plt.plot(inflation_list)
+        #plt.ylabel('Regime List')
+        #plt.show()
+
+        with profiling.stage("render"):
+            console = Console()
+
+            table = Table(title="Macro Dashboard", show_header=True, header_style="bold magenta")
+            table.add_column("Metric",  justify="left")
+            table.add_column("Value",   justify="right")
+            table.add_row("Latest CPI YoY",  f"{latest_infl:,.2f} %")
+            table.add_row("Inflation level", str(infl_lvl))
+            table.add_row("Latest GDP YoY",  f"{latest_gdp:,.2f} %")
+            table.add_row("Growth level",    str(gdp_lvl))
+            table.add_row("AVG Regime Time",    str(avg_dur))
+            table.add_row("Since Last Regime Change",    str(durations[-1]))
+
+            console.print(table)
+            console.print(Panel(f"[bold yellow]Macro Regime[/bold yellow]\n{current_quad}", expand=False))
+            console.print(Panel(f"[bold yellow]Current % of the avg duration[/bold yellow]\nWe're at {pct_avg_duration:.2f}% of the average duration.", expand=True))
+            console.print(Panel(f"[bold yellow]Prediction[/bold yellow]\n{prediction}", expand=True))
+            change, next_regime = forecast["change_within"], forecast["next_regime"].sort_values(ascending=False)
+            console.print(Panel(
+                f"[bold yellow]Regime change probability[/bold yellow]\n"
+                f"Within 3 / 6 / 12 months : {change[3]:.0%} / {change[6]:.0%} / {change[12]:.0%}\n"
+                f"Most likely next regimes : " + ", ".join(f"{code:02d} ({p:.0%})" for code, p in next_regime.head(3).items()),
+                expand=True,
+            ))
+            console.print(Panel(f"[bold yellow]Seasonality Inflation[/bold yellow]\n{seasonality_infl_codes}", expand=False))
+            console.print(Panel(f"[bold yellow]Seasonality GDP[/bold yellow]\n{seasonality_gdp_codes}", expand=False))
+            console.print(Panel(f"[bold yellow]Seasonality Unemployment[/bold yellow]\n{seasonality_unrt_codes}", expand=False))
+
+            table = Table(title="Recommended Portfolio", show_header=True, header_style="bold green")
+            table.add_column("Type",  justify="left")
+            table.add_column("% Allocation",   justify="right")
+            table.add_row("Actions :",  f"{Actions:,.2f} %")
+            table.add_row("Gold :", f"{Or:,.2f} %")
+            table.add_row("Obligations :",  f"{Obligations:,.2f} %")
+            table.add_row("Cash :",    f"{Cash:,.2f} %")
+            console.print(table)
+
+
@@ -0,0 +1,220 @@
+"""
+Content-addressed cache of derived results.
+
+The classification, duration, signal and allocation steps are pure
+functions of the fetched series, of the thresholds of bands.py and of the
+quadrant thresholds and weights of regime_duration. ``cached`` keys a result
+on a fingerprint of its input buffers (values, index, dtype, shape), of those
+tables and of RESULT_VERSION, and stores it on disk: an unchanged region is
+served without recomputing anything.
+
+    optimized, analysis, allocation = cached("regime_analysis", regime_analysis, cpi, gdp, pol, unrt)
+
+Entries are pickles under ``paths.result_dir()``, one file per key. A hit
+touches the file, and writes evict the least recently used entries beyond
+`max_bytes`. Hashing uses xxhash (xxh3_128) when installed, blake2b
+otherwise.
+
+Environment variables (used by ``default_result_cache``):
+    MRPA_RESULT_CACHE      "0" pour tout recalculer
+    MRPA_RESULT_CACHE_MB   taille maximale en Mio (défaut : 256)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+import profiling
+from paths import result_dir
+
+
+# à incrémenter quand le calcul d'un résultat caché change sans que ses entrées changent
+RESULT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+try:
+    import xxhash
+
+    def _hasher():
+        return xxhash.xxh3_128()
+except ImportError:
+    def _hasher():
+        return hashlib.blake2b(digest_size=16)
+
+
+def _config():
+    from bands import GROWTH_BANDS, GROWTH_LEVELS, GROWTH_STEPS, INFLATION_BANDS, INFLATION_LEVELS, INFLATION_STEPS
+    from regime_duration import QUADRANT_THRESHOLDS, QUADRANT_WEIGHTS, QUADRANTS
+
+    thresholds = [INFLATION_LEVELS, GROWTH_LEVELS, INFLATION_STEPS, GROWTH_STEPS, INFLATION_BANDS, GROWTH_BANDS]
+    allocation = [QUADRANTS, QUADRANT_WEIGHTS, QUADRANT_THRESHOLDS]
+    return json.dumps([RESULT_VERSION, thresholds, allocation], sort_keys=True, default=str).encode()
+
+
+def _update(h, value):
+    import pandas as pd
+
+    if isinstance(value, pd.DataFrame):
+        h.update(b"frame")
+        _update(h, [str(column) for column in value.columns])
+        _update(h, value.index)
+        for column in range(value.shape[1]):
+            _update(h, value.iloc[:, column].to_numpy())
+    elif isinstance(value, pd.Series):
+        h.update(b"series")
+        _update(h, str(value.name))
+        _update(h, value.index)
+        _update(h, value.to_numpy())
+    elif isinstance(value, pd.Index):
+        _update(h, value.to_numpy())
+    elif isinstance(value, np.ndarray):
+        if value.dtype == object:
+            _update(h, value.tolist())
+            return
+        h.update(f"array{value.dtype.str}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).view(np.uint8).ravel())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update(h, item)
+    elif isinstance(value, dict):
+        _update(h, sorted(value.items(), key=lambda item: repr(item[0])))
+    elif value is None or isinstance(value, (str, int, float, bool, date, datetime)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    else:
+        raise ValueError(f"Cannot fingerprint a {type(value).__name__}.")
+
+
+def fingerprint(*values):
+    """
+    Hex digest of the values (arrays, Series, DataFrames, scalars and
+    containers of them), of the classification thresholds and of the
+    quadrant allocation table.
+    """
+    h = _hasher()
+    h.update(_config())
+    for value in values:
+        _update(h, value)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of pickled results keyed by fingerprint, with LRU size eviction.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or result_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def get(self, key, default=None):
+        try:
+            with open(self._file(key), "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            profiling.count("result_cache_misses")
+            return default
+        try:
+            os.utime(self._file(key))          # dernier accès, pour l'éviction LRU
+        except OSError:
+            pass
+        self.hits += 1
+        profiling.count("result_cache_hits")
+        return value
+
+    def put(self, key, value):
+        tmp = os.path.join(self.path, f".{key}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._file(key))
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def entries(self):
+        """
+        (last access, size, path) of every entry, least recently used first.
+        """
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in max_bytes.
+        """
+        with self._lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_default_result_cache = None
+
+
+def default_result_cache():
+    """
+    Process-wide result cache configured from the environment (None when
+    MRPA_RESULT_CACHE=0).
+    """
+    global _default_result_cache
+    if os.environ.get("MRPA_RESULT_CACHE", "1") == "0":
+        return None
+    if _default_result_cache is None:
+        max_bytes = int(float(os.environ.get("MRPA_RESULT_CACHE_MB", DEFAULT_MAX_BYTES / 2**20)) * 2**20)
+        _default_result_cache = ResultCache(max_bytes=max_bytes)
+    return _default_result_cache
+
+
+def cached(name, func, *args, cache=None):
+    """
+    func(*args), served from the result cache when `name` was already
+    computed from identical inputs. cache=False always recomputes.
+    """
+    cache = default_result_cache() if cache is None else cache
+    if not cache:
+        return func(*args)
+    return cache.get_or_compute(fingerprint(name, *args), lambda: func(*args))
@@ -0,0 +1,112 @@
+"""
+Typed result records and headless writers (JSON, NDJSON, Parquet).
+
+Snapshot is the latest state of a region, HistoryRow one month of its
+history. Both are slotted dataclasses with to_dict()/from_dict() so that
+machine consumers get a stable schema instead of screen-scraping rich output.
+"""
+
+import json
+import math
+import sys
+from collections import namedtuple
+from dataclasses import asdict, dataclass, fields
+
+
+@dataclass(slots=True)
+class Snapshot:
+    region: str
+    date: str
+    inflation: float
+    growth: float
+    infl_lvl: int
+    gdp_lvl: int
+    infl_pos_pct: float
+    gdp_pos_pct: float
+    inflation_adj: float
+    growth_adj: float
+    regime: str
+    allocation: str
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{f.name: data.get(f.name) for f in fields(cls)})
+
+
+@dataclass(slots=True)
+class HistoryRow:
+    region: str
+    date: str
+    inflation: float
+    growth: float
+    infl_lvl: int
+    gdp_lvl: int
+    infl_pos_pct: float
+    gdp_pos_pct: float
+    regime: str
+    allocation: str
+
+    def to_dict(self):
+        return asdict(self)
+
+
+# Résultat de regime_duration.detect_previous_regime (reste un tuple de 14 éléments)
+RegimeAnalysis = namedtuple("RegimeAnalysis", [
+    "infl_lvl_list", "gdp_m_lvl_list", "regime_code", "change_idx", "durations", "avg_dur", "predi",
+    "pct_avg_duration", "seasonality_infl_codes", "seasonality_gdp_codes", "infl", "prediction",
+    "seasonality_unrt_codes", "unrt_trend",
+])
+
+
+def history_rows(region, history):
+    """
+    Yields one HistoryRow per month of a history.regime_history DataFrame.
+    """
+    columns = [f.name for f in fields(HistoryRow)][2:]
+    for date, *values in history[columns].itertuples():
+        values[2], values[3] = int(values[2]), int(values[3])
+        yield HistoryRow(region, str(date.date()), *values)
+
+
+def _json_dict(record):
+    # NaN / inf ne sont pas du JSON valide : écrits null
+    return {
+        key: None if isinstance(value, float) and not math.isfinite(value) else value
+        for key, value in record.to_dict().items()
+    }
+
+
+def write_records(records, fmt="json", stream=None, path=None):
+    """
+    Writes records (Snapshot / HistoryRow) to the file at `path`, else to
+    `stream` (default: stdout), as:
+
+        json     one JSON array
+        ndjson   one JSON object per line, streamed as records come in
+        parquet  a Parquet file at `path` (needs pandas and pyarrow)
+
+    Missing values (NaN) are written as null in JSON.
+    """
+    if fmt == "parquet":
+        if path is None:
+            raise ValueError("The parquet format needs an output path.")
+        import pandas as pd
+
+        pd.DataFrame([record.to_dict() for record in records]).to_parquet(path, index=False)
+        return
+    if fmt not in ("json", "ndjson"):
+        raise ValueError(f"Unknown output format: {fmt!r}")
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            return write_records(records, fmt, f)
+
+    stream = stream or sys.stdout
+    if fmt == "ndjson":
+        for record in records:
+            stream.write(json.dumps(_json_dict(record), ensure_ascii=False, allow_nan=False) + "\n")
+    else:
+        json.dump([_json_dict(record) for record in records], stream, ensure_ascii=False, indent=1, allow_nan=False)
+        stream.write("\n")
@@ -0,0 +1,183 @@
+"""
+Regime-conditional allocation: per-quadrant covariance of the asset returns
+and risk-parity / minimum-variance weights, instead of the fixed
+QUADRANT_WEIGHTS table.
+
+Quadrant histories of any leading shape (regions, threshold variants, ...)
+are one-hot encoded and reduced against the returns with einsum, so every
+(variant, rebalance date, quadrant) covariance is estimated in one pass and
+every weight vector is solved in one stacked ``np.linalg.solve`` per Newton
+step — no Python loop over regions, dates or quadrants.
+
+    returns = backtest.load_returns("returns.csv")
+    codes = backtest.quadrant_index(infl_lvl, gdp_lvl)        # (..., T)
+    table = regime_weights(returns.to_numpy(), codes)         # (..., 5, A)
+    weights = rolling_regime_weights(returns.to_numpy(), codes, rebalance=12)
+    backtest.backtest(weights, returns.to_numpy())
+
+Quadrants with fewer than `min_obs` months fall back to the covariance of
+all months, and to the WEIGHT_TABLE row when even that is shorter; "Zone grise" (index 4) keeps its WEIGHT_TABLE row (no position).
+Minimum-variance weights are the closed form Σ⁻¹1 / 1ᵀΣ⁻¹1 (fully invested,
+short positions allowed); risk-parity weights are long-only by construction.
+"""
+
+import numpy as np
+
+from backtest import WEIGHT_TABLE
+
+
+N_QUADRANTS = len(WEIGHT_TABLE)
+METHODS = ("risk_parity", "min_variance")
+
+
+def _one_hot(codes, n=N_QUADRANTS):
+    codes = np.asarray(codes)
+    return (codes[..., None] == np.arange(n)).astype(float)
+
+
+def _blocks(x, size):
+    # (..., T, k) -> (..., D, size, k), months padded with zeros to a whole number of blocks
+    pad = -x.shape[-2] % size
+    x = np.pad(x, [(0, 0)] * (x.ndim - 2) + [(0, pad), (0, 0)])
+    return x.reshape(x.shape[:-2] + (-1, size, x.shape[-1]))
+
+
+def _moments(returns, codes, block=None):
+    # (..., T) codes, (T, A) or (..., T, A) returns -> count (..., R), sum (..., R, A) and
+    # cross-products (..., R, A, A) of each quadrant, reduced directly (no (..., T, R, A, A)
+    # tensor); with `block`, of each block of `block` months: (..., D, R, ...)
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    onehot = _one_hot(codes)
+    if block is not None:
+        onehot, returns = _blocks(onehot, block), _blocks(returns, block)
+    first = np.einsum("...tr,...ta->...ra", onehot, returns)
+    second = np.einsum("...tr,...ta,...tb->...rab", onehot, returns, returns, optimize=True)
+    return onehot.sum(axis=-2), first, second
+
+
+def _covariance(count, first, second, shrinkage):
+    # sample covariance (ddof=1) from the sums, shrunk towards its diagonal
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = first / count[..., None]
+        cov = (second - count[..., None, None] * mean[..., :, None] * mean[..., None, :]) / (count[..., None, None] - 1)
+        diagonal = np.eye(cov.shape[-1]) * np.diagonal(cov, axis1=-2, axis2=-1)[..., None, :]
+    return (1 - shrinkage) * cov + shrinkage * diagonal
+
+
+def regime_covariances(returns, codes, shrinkage=0.1, min_obs=12):
+    """
+    Covariance matrix of the returns (T, A) in each quadrant of the codes
+    (..., T): array (..., 5, A, A). Quadrants seen fewer than min_obs months
+    use the covariance of all months.
+    """
+    return _fallback(*_moments(returns, codes), shrinkage, min_obs)
+
+
+def _fallback(count, first, second, shrinkage, min_obs):
+    cov = _covariance(count, first, second, shrinkage)
+    pooled = _covariance(count.sum(axis=-1, keepdims=True), first.sum(axis=-2, keepdims=True),
+                         second.sum(axis=-3, keepdims=True), shrinkage)
+    pooled = np.where((count.sum(axis=-1, keepdims=True) >= min_obs)[..., None, None], pooled, np.nan)
+    return np.where((count >= min_obs)[..., None, None], cov, pooled)
+
+
+def min_variance_weights(cov):
+    """
+    Fully invested minimum-variance weights of stacked covariances (..., A, A).
+    """
+    ones = np.ones(cov.shape[:-1] + (1,))
+    x = np.linalg.solve(cov, ones)[..., 0]
+    return x / x.sum(axis=-1, keepdims=True)
+
+
+def risk_parity_weights(cov, iterations=50, tol=1e-10):
+    """
+    Equal-risk-contribution weights of stacked covariances (..., A, A).
+
+    Solves Σy = 1/y (y > 0) by Newton steps on all matrices at once, each
+    step being one batched solve of (Σ + diag(1/y²)) dy = 1/y - Σy; the
+    weights are y / sum(y).
+    """
+    cov = np.asarray(cov, dtype=float)
+    y = 1 / np.sqrt(np.diagonal(cov, axis1=-2, axis2=-1))
+    for _ in range(iterations):
+        residual = 1 / y - np.einsum("...ab,...b->...a", cov, y)
+        if np.nanmax(np.abs(residual * y)) < tol:
+            break
+        jacobian = cov + np.eye(cov.shape[-1]) / (y * y)[..., None, :]
+        step = np.linalg.solve(jacobian, residual[..., None])[..., 0]
+        # pas amorti pour rester dans y > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            limit = np.where(step < 0, -0.9 * y / step, np.inf).min(axis=-1, keepdims=True)
+        y = y + np.minimum(1, limit) * step
+    return y / y.sum(axis=-1, keepdims=True)
+
+
+def solve_weights(cov, method="risk_parity"):
+    """
+    Weights (..., A) of stacked covariances with `method` (see METHODS). Non
+    positive-definite or unestimated matrices give NaN weights.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown allocation method {method!r}, expected one of {METHODS}.")
+    cov = np.asarray(cov, dtype=float)
+    eigenvalues = np.linalg.eigvalsh(np.nan_to_num(cov))
+    valid = np.isfinite(cov).all(axis=(-2, -1)) & (eigenvalues[..., 0] > 0)
+    # matrices invalides remplacées par l'identité le temps du calcul
+    safe = np.where(valid[..., None, None], cov, np.eye(cov.shape[-1]))
+    weights = risk_parity_weights(safe) if method == "risk_parity" else min_variance_weights(safe)
+    return np.where(valid[..., None], weights, np.nan)
+
+
+def _with_table(weights, table):
+    # quadrants sans estimation (et la zone grise) : ligne de la table fixe
+    weights = weights.copy()
+    weights[..., N_QUADRANTS - 1, :] = table[N_QUADRANTS - 1]
+    return np.where(np.isnan(weights), np.broadcast_to(table, weights.shape), weights)
+
+
+def regime_weights(returns, codes, method="risk_parity", shrinkage=0.1, min_obs=12, table=WEIGHT_TABLE):
+    """
+    Weights (..., 5, A) of each quadrant estimated on the whole history:
+    a drop-in replacement of WEIGHT_TABLE for backtest.weights_from_codes.
+    """
+    cov = regime_covariances(returns, codes, shrinkage, min_obs)
+    return _with_table(solve_weights(cov, method), np.asarray(table, dtype=float))
+
+
+def rolling_regime_weights(returns, codes, rebalance=12, method="risk_parity", shrinkage=0.1, min_obs=12,
+                           table=WEIGHT_TABLE):
+    """
+    Target weights (..., T, A) of the quadrant of each month, re-estimated
+    every `rebalance` months from the returns of the previous months only
+    (expanding window, no look-ahead). Before min_obs months the table
+    weights are used.
+    """
+    n = np.shape(codes)[-1]
+    count, first, second = _moments(returns, codes, rebalance)                          # (..., D, 5, ...)
+
+    # sommes des blocs précédant chaque date de rééquilibrage (cumul exclusif)
+    def before(m, axis):
+        return np.cumsum(m, axis=axis) - m
+
+    cov = _fallback(before(count, -2), before(first, -3), before(second, -4), shrinkage, min_obs)
+    estimated = _with_table(solve_weights(cov, method), np.asarray(table, dtype=float))   # (..., D, 5, A)
+
+    period = np.arange(n) // rebalance
+    per_month = np.take(estimated, period, axis=-3)                                       # (..., T, 5, A)
+    codes = np.broadcast_to(np.asarray(codes), per_month.shape[:-2])
+    return np.take_along_axis(per_month, codes[..., None, None], axis=-2)[..., 0, :]
+
+
+def allocation_table(quadrant_codes, returns, method="risk_parity", shrinkage=0.1, min_obs=12):
+    """
+    Weights in % by QUADRANTS label and asset, in the layout of
+    QUADRANT_WEIGHTS (advanced_portfolio_allocation's `table` argument),
+    from a date-indexed Series of quadrants and a returns DataFrame.
+    """
+    from backtest import align_quadrants
+    from regime_duration import ASSETS, QUADRANTS
+
+    codes = align_quadrants(quadrant_codes, returns.index)
+    weights = regime_weights(returns[ASSETS].to_numpy(), codes, method, shrinkage, min_obs) * 100
+    return {quadrant: dict(zip(ASSETS, row.tolist())) for quadrant, row in zip(QUADRANTS, weights)}
@@ -0,0 +1,170 @@
+"""
+Start-date sensitivity of the snapshot.
+
+data_optimization z-scores the 3-month means of the policy and unemployment
+rates against the mean / std of the whole fetched window, so its tanh
+adjustments depend on the `start` given to get_macro_data (2023-10 in MRPA,
+2000 in regime_duration). ``surface`` evaluates every (start, as-of) pair
+at once from prefix sums and sums of squares of the series fetched from the
+earliest start: O(n) preparation, then O(1) per cell instead of one re-slice
+and re-computation per pair.
+
+    python sensitivity.py --country FR --first 1990-01 --step 12
+    surfaces = region_surface("FR", starts, asof)
+    surfaces["inflation_adj"]               # DataFrame start x asof
+
+Each cell equals data_optimization on the series restricted to
+[start, asof]; it is NaN where that window holds fewer than two 3-month
+means. The quadrant is the QUADRANTS index of regime_duration from the
+0.5-point steps, like asof.regimes (backtest.quadrant_index), and 4 "Zone
+grise" when the window is too short for a YoY; it only depends on the start
+through that availability.
+"""
+
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bands import GROWTH_LEVELS, GROWTH_STEPS, INFLATION_LEVELS, INFLATION_STEPS, classify
+from transforms import as_series
+
+
+def _positions(series, starts, asof):
+    # first observation >= start, last observation <= asof
+    index = series.index.values
+    first = np.searchsorted(index, pd.DatetimeIndex(starts).values, side="left")
+    last = np.searchsorted(index, pd.DatetimeIndex(asof).values, side="right") - 1
+    return first[:, None], last[None, :]
+
+
+def _zscore_surface(mean3, first, last):
+    """
+    z-score of mean3[last] against the mean / sample std of mean3 over
+    [first + 2, last] for every (first, last) pair, NaN values skipped like
+    online_stats.zscores.
+    """
+    x = np.asarray(mean3, dtype=float)
+    known = ~np.isnan(x)
+    # centrées pour limiter l'annulation dans sum(x²) - n·mean²
+    centered = np.where(known, x - (x[known].mean() if known.any() else 0.0), 0.0)
+    count = np.concatenate([[0], np.cumsum(known)])
+    total = np.concatenate([[0.0], np.cumsum(centered)])
+    squares = np.concatenate([[0.0], np.cumsum(centered * centered)])
+
+    # rolling(3) sur la fenêtre téléchargée : premier point valide en first + 2
+    lo = first + 2
+    hi = np.maximum(last, lo - 1) + 1
+    n = count[hi] - count[lo]
+    s = total[hi] - total[lo]
+    ss = squares[hi] - squares[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / n
+        std = np.sqrt(np.maximum(ss - n * mean * mean, 0) / (n - 1))
+        latest = centered[np.clip(last, 0, None)]
+        z = (latest - mean) / std
+    valid = (n >= 2) & (last >= lo) & known[np.clip(last, 0, None)]
+    return np.where(valid, z, np.nan)
+
+
+def _change_surface(data, first, last, periods):
+    # variation de data_optimization : dernière valeur vs `periods` observations avant, dans [start, asof]
+    values = np.asarray(as_series(data), dtype=float)
+    lastc = np.clip(last, 0, None)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        change = (values[lastc] / values[np.clip(lastc - periods, 0, None)] - 1) * 100
+    valid = (last - periods >= first) & ~np.isnan(change)
+    return np.where(valid, change, np.nan)
+
+
+def surface(cpi, gdp, pol, unrt, starts, asof):
+    """
+    Start x as-of matrices (dict of DataFrames) of the data_optimization
+    outputs: z_fed, z_unrate, inflation_adj, growth_adj, infl_lvl, gdp_lvl
+    and quadrant (levels are -1 where unknown, quadrant 4 unless both are known).
+    """
+    from backtest import quadrant_index
+
+    starts, asof = pd.DatetimeIndex(starts, name="start"), pd.DatetimeIndex(asof, name="asof")
+    out = {}
+    for name, data in (("z_fed", pol), ("z_unrate", unrt)):
+        series = as_series(data)
+        first, last = _positions(series, starts, asof)
+        out[name] = _zscore_surface(series.rolling(3).mean().to_numpy(), first, last)
+    out["inflation_adj"] = np.tanh(out["z_fed"])
+    out["growth_adj"] = np.tanh(-out["z_unrate"])
+
+    inflation = _change_surface(cpi, *_positions(as_series(cpi), starts, asof), 12)
+    growth = _change_surface(gdp, *_positions(as_series(gdp), starts, asof), 4)
+    known = ~(np.isnan(inflation) | np.isnan(growth))
+    out["infl_lvl"] = np.where(np.isnan(inflation), -1, classify(np.nan_to_num(inflation), INFLATION_LEVELS)).astype(np.int8)
+    out["gdp_lvl"] = np.where(np.isnan(growth), -1, classify(np.nan_to_num(growth), GROWTH_LEVELS)).astype(np.int8)
+    # paliers de 0.5 point et ordre QUADRANTS, comme asof.regimes
+    quadrant = quadrant_index(classify(np.nan_to_num(inflation), INFLATION_STEPS), classify(np.nan_to_num(growth), GROWTH_STEPS))
+    out["quadrant"] = np.where(known, quadrant, 4).astype(np.int8)
+    return {name: pd.DataFrame(values, index=starts, columns=asof) for name, values in out.items()}
+
+
+def region_surface(region, starts, asof, cache=None):
+    """
+    surface() of a region, fetched once from the earliest start.
+    """
+    from MRPA import get_macro_data
+
+    starts = pd.DatetimeIndex(starts)
+    return surface(*get_macro_data(region, starts.min().to_pydatetime(), cache=cache), starts, asof)
+
+
+def summary(surfaces, reference=None):
+    """
+    One row per start: mean absolute gap of the adjustments to those of the
+    `reference` start (default: the earliest), share of as-of dates where
+    their sign agrees, and share of as-of dates with a known quadrant.
+    """
+    reference = surfaces["inflation_adj"].index[0] if reference is None else pd.Timestamp(reference)
+    rows = {}
+    for name, prefix in (("inflation_adj", "inflation"), ("growth_adj", "growth")):
+        matrix = surfaces[name]
+        gap = matrix - matrix.loc[reference]
+        both = matrix.notna() & matrix.loc[reference].notna()
+        rows[f"{prefix}_gap"] = gap.abs().where(both).mean(axis=1)
+        rows[f"{prefix}_sign"] = (np.sign(matrix) == np.sign(matrix.loc[reference])).where(both).mean(axis=1)
+    rows["quadrant_known"] = ((surfaces["infl_lvl"] >= 0) & (surfaces["gdp_lvl"] >= 0)).mean(axis=1)
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    from cli import parse_start
+    from MRPA import SERIES
+
+    parser = argparse.ArgumentParser(description="Start-date sensitivity of the tanh adjustments of one region.")
+    parser.add_argument("--country", default="FR", choices=sorted(SERIES), help="région (clé de SERIES)")
+    parser.add_argument("--first", default=datetime(1990, 1, 1), type=parse_start, help="première date de début candidate")
+    parser.add_argument("--last", default=datetime(2023, 10, 1), type=parse_start, help="dernière date de début candidate")
+    parser.add_argument("--step", default=12, type=int, help="pas en mois entre deux dates de début")
+    parser.add_argument("--asof-from", default=None, type=parse_start, help="première date d'observation (défaut : --last)")
+    parser.add_argument("--output", help="CSV long (start, asof, colonnes) de toute la surface")
+    args = parser.parse_args(argv)
+
+    from rich.console import Console
+    from rich.table import Table
+
+    starts = pd.date_range(args.first, args.last, freq=f"{args.step}MS")
+    asof = pd.date_range(args.asof_from or args.last, datetime.today(), freq="ME")
+    surfaces = region_surface(args.country, starts, asof)
+    if args.output:
+        pd.concat({name: matrix.stack(future_stack=True) for name, matrix in surfaces.items()}, axis=1).to_csv(args.output)
+
+    table = Table(title=f"Start-date sensitivity — {args.country} ({len(asof)} as-of dates)", show_header=True, header_style="bold magenta")
+    frame = summary(surfaces)
+    table.add_column("Start", justify="left")
+    for column in frame.columns:
+        table.add_column(column, justify="right")
+    for start, row in frame.iterrows():
+        table.add_row(str(start.date())[:7], *(f"{value:.3f}" for value in row))
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Long-running regime service: HTTP/JSON API over compute_latest_snapshot,
+the regime history and the regime_duration analytics.
+
+    python server.py --port 8000
+    python server.py --fixtures tests_data/    # séries CSV locales, aucun appel réseau
+
+    GET /regions                   régions disponibles
+    GET /regime/{region}           dernier snapshot + durées de régime
+    GET /history/{region}          historique mensuel (HistoryRow)
+    GET /...?start=YYYY-MM         fenêtre des séries (défaut : --start)
+
+Fetched series and computed results are kept in memory for --ttl seconds,
+at most --max-entries of them (expired entries are dropped first, then the
+oldest). Concurrent requests for the same region and window share one computation
+instead of each fetching and computing on their own.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from cli import parse_start
+from results import history_rows
+
+
+class TTLCache:
+    """
+    In-memory cache with time-to-live, a bounded number of entries and
+    request coalescing: while a key is being computed, other callers of get()
+    wait for that result.
+    """
+
+    def __init__(self, ttl=900.0, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._values = {}       # key -> (expires_at, value)
+        self._pending = {}      # key -> Future
+        self.hits = self.misses = self.coalesced = 0
+
+    def get(self, key, compute):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self.hits += 1
+                    return entry[1]
+                del self._values[key]
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = self._pending[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            now = time.monotonic()
+            self._values[key] = (now + self.ttl, value)
+            del self._pending[key]
+            self._prune(now)
+        future.set_result(value)
+        return value
+
+    def _prune(self, now):
+        # entrées expirées, puis les plus anciennes (ordre d'insertion) au-delà de max_entries
+        for key in [key for key, (expires, _) in self._values.items() if expires <= now]:
+            del self._values[key]
+        while len(self._values) > self.max_entries:
+            del self._values[next(iter(self._values))]
+
+    def __len__(self):
+        return len(self._values)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+
+class RegimeService:
+    """
+    Region data and computed results, cached in memory for `ttl` seconds.
+    `cache` is the FRED cache the series are read from (default_cache() if None).
+    """
+
+    def __init__(self, cache=None, start=datetime(2000, 1, 1), ttl=900.0, max_entries=256):
+        from fred_cache import default_cache
+
+        self.cache = cache or default_cache()
+        self.start = start
+        self.results = TTLCache(ttl, max_entries)
+
+    @property
+    def regions(self):
+        from MRPA import SERIES
+
+        return list(SERIES)
+
+    def data(self, region, start=None):
+        from MRPA import get_macro_data
+
+        start = start or self.start
+        return self.results.get(("data", region, start), lambda: get_macro_data(region, start, cache=self.cache))
+
+    def regime(self, region, start=None):
+        """
+        Latest snapshot of a region plus the duration of its current regime.
+        """
+        start = start or self.start
+        return self.results.get(("regime", region, start), lambda: self._regime(region, start))
+
+    def history(self, region, start=None):
+        """
+        Monthly regime history of a region, as a list of HistoryRow dicts.
+        """
+        start = start or self.start
+        return self.results.get(("history", region, start), lambda: self._history(region, start))
+
+    def _regime(self, region, start):
+        from MRPA import snapshot_from_data
+        from regime_duration import regime_analysis
+        from result_cache import cached
+
+        cpi, gdp, pol, unrt = self.data(region, start)
+        payload = cached("snapshot", snapshot_from_data, cpi, gdp, pol, unrt, region).to_dict()
+        _, analysis, _ = cached("regime_analysis", regime_analysis, cpi, gdp, pol, unrt)
+        payload["duration"] = {
+            "current": int(analysis.durations[-1]),
+            "average": float(analysis.avg_dur),
+            "pct_of_average": float(analysis.pct_avg_duration),
+            "prediction": analysis.prediction,
+            "inflation_trend": str(analysis.seasonality_infl_codes),
+            "gdp_trend": str(analysis.seasonality_gdp_codes),
+            "unemployment_trend": str(analysis.seasonality_unrt_codes),
+        }
+        return payload
+
+    def _history(self, region, start):
+        from history import regime_history
+
+        rows = history_rows(region, regime_history(*self.data(region, start)))
+        return [row.to_dict() for row in rows]
+
+
+class RegimeHandler(BaseHTTPRequestHandler):
+    """
+    Routes GET requests to the RegimeService of the server.
+    """
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        service = self.server.service
+        try:
+            start = parse_qs(url.query).get("start")
+            start = parse_start(start[0]) if start else None
+        except argparse.ArgumentTypeError as exc:
+            return self._send(400, {"error": str(exc)})
+
+        if parts == ["regions"]:
+            return self._send(200, service.regions)
+        if len(parts) != 2 or parts[0] not in ("regime", "history"):
+            return self._send(404, {"error": f"unknown path {url.path!r}"})
+        kind, region = parts[0], parts[1].upper()
+        if region not in service.regions:
+            return self._send(404, {"error": f"unknown region {region!r}"})
+        try:
+            payload = service.regime(region, start) if kind == "regime" else service.history(region, start)
+        except ValueError as exc:
+            return self._send(503, {"error": str(exc)})
+        except Exception as exc:
+            # toute autre erreur du calcul : réponse JSON plutôt qu'une connexion coupée
+            self.log_error("%s failed: %r", url.path, exc)
+            return self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+        self._send(200, payload)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(service, host="127.0.0.1", port=8000, verbose=False):
+    """
+    Threaded HTTP server bound to (host, port); port 0 picks a free port.
+    """
+    server = ThreadingHTTPServer((host, port), RegimeHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def fixture_cache(directory):
+    """
+    FredCache served from ``<directory>/<code>.csv`` files, in a temporary
+    SQLite file, so the service runs without any network access.
+    """
+    from fetch import CsvFixtureFetcher
+    from fred_cache import FredCache
+
+    path = os.path.join(tempfile.mkdtemp(prefix="mrpa-"), "fred.sqlite")
+    return FredCache(path, fetcher=CsvFixtureFetcher(directory))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON macro regime service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=8000, type=int)
+    parser.add_argument("--start", default=datetime(2000, 1, 1), type=parse_start, help="début des séries, YYYY-MM[-DD]")
+    parser.add_argument("--ttl", default=900.0, type=float, help="durée de vie des résultats en mémoire (secondes)")
+    parser.add_argument("--max-entries", default=256, type=int, help="nombre maximal de résultats gardés en mémoire")
+    parser.add_argument("--fixtures", metavar="DIR", help="sert les séries depuis DIR/<code>.csv (aucun appel réseau)")
+    parser.add_argument("--verbose", action="store_true", help="journalise chaque requête")
+    args = parser.parse_args(argv)
+
+    cache = fixture_cache(args.fixtures) if args.fixtures else None
+    server = make_server(RegimeService(cache, args.start, args.ttl, args.max_entries), args.host, args.port, args.verbose)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Momentum ("seasonality") signals over the full history.
+
+The signals of detect_previous_regime, computed for every month in one
+vectorized pass instead of for the last observation only:
+
+    trend_codes        -2 down ++, -1 down, 0 flat, 1 up, 2 up ++
+                       (x vs `short` and `long` observations before)
+    persistence_codes  -1 falling, 0 no trend, 1 rising
+                       (sign of the last `periods` changes)
+
+Codes are int8; ``signal_frame`` adds the labels printed by regime_duration
+as categoricals. Series keep their date index.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+TREND_LABELS = {
+    "inflation": ["Inflation moving down ++", "Inflation moving down", "No seasonality",
+                  "Inflation moving up", "Inflation moving up ++"],
+    "gdp": ["GDP moving down ++", "GDP moving down", "No seasonality", "GDP moving up", "GDP moving up ++"],
+}
+PERSISTENCE_LABELS = {
+    "unemployment": ["Unemployment falling", "No trend", "Unemployment rising"],
+}
+
+
+def _shift(x, periods):
+    out = np.full_like(x, np.nan)
+    if periods < len(x):
+        out[periods:] = x[:len(x) - periods]
+    return out
+
+
+def _wrap(values, codes):
+    if isinstance(values, pd.Series):
+        return pd.Series(codes, index=values.index, name=values.name)
+    return codes
+
+
+def trend_codes(values, short=1, long=2):
+    """
+    -2 / 2 when the value is below / above both its value `short` and `long`
+    observations earlier, -1 / 1 when only the `short` comparison holds.
+    """
+    x = np.asarray(values, dtype=float)
+    prev_short, prev_long = _shift(x, short), _shift(x, long)
+    down, up = x < prev_short, x > prev_short
+    # les conditions ++ d'abord, sinon elles ne sont jamais atteintes
+    codes = np.select([down & (x < prev_long), down, up & (x > prev_long), up], [-2, -1, 2, 1], 0)
+    return _wrap(values, codes.astype(np.int8))
+
+
+def persistence_codes(changes, periods=2):
+    """
+    -1 when the last `periods` changes are all negative, 1 when they are all
+    positive, 0 otherwise.
+    """
+    x = np.asarray(changes, dtype=float)
+    codes = np.zeros(len(x), dtype=np.int8)
+    if len(x) >= periods:
+        window = np.lib.stride_tricks.sliding_window_view(x, periods)
+        codes[periods - 1:] = np.where((window < 0).all(axis=1), -1, np.where((window > 0).all(axis=1), 1, 0))
+    return _wrap(changes, codes)
+
+
+def labels(codes, names):
+    """
+    Categorical labels of trend (-2..2) or persistence (-1..1) codes.
+    """
+    codes = np.asarray(codes)
+    offset = len(names) // 2
+    return pd.Categorical.from_codes(codes + offset, names)
+
+
+def signal_frame(inflation, gdp, unrt_chg, short=1, long=2, periods=2):
+    """
+    Date-indexed trend codes and labels of inflation YoY, GDP YoY and the
+    unemployment change, each on its own dates and joined on the union.
+    """
+    inflation_code = trend_codes(inflation, short, long)
+    gdp_code = trend_codes(gdp, short, long)
+    unrt_code = persistence_codes(unrt_chg, periods)
+    frame = pd.concat(
+        {
+            "inflation_trend": inflation_code,
+            "gdp_trend": gdp_code,
+            "unemployment_trend": unrt_code,
+        },
+        axis=1,
+    )
+    frame = frame.fillna(0).astype(np.int8)
+    frame["inflation_signal"] = labels(frame["inflation_trend"], TREND_LABELS["inflation"])
+    frame["gdp_signal"] = labels(frame["gdp_trend"], TREND_LABELS["gdp"])
+    frame["unemployment_signal"] = labels(frame["unemployment_trend"], PERSISTENCE_LABELS["unemployment"])
+    return frame
@@ -0,0 +1,161 @@
+"""
+Incremental (streaming) regime state.
+
+RegimeState holds only what the next month needs — the 13-month CPI and GDP
+windows, the 3-month policy/unemployment windows, running mean/variance of
+the rolling means for the z-scores of data_optimization, and the run-length
+statistics of the regime codes — so ``update`` with one new observation is
+O(1). The state is JSON-serialisable and can be saved and resumed by a
+scheduled job instead of recomputing the whole history.
+"""
+
+import json
+from collections import deque
+from datetime import date
+from math import tanh
+
+from bands import (
+    GROWTH_BANDS,
+    GROWTH_LEVELS,
+    GROWTH_STEPS,
+    INFLATION_BANDS,
+    INFLATION_LEVELS,
+    INFLATION_STEPS,
+    classify,
+)
+from durations import DurationStats
+from online_stats import RunningStats
+
+
+def _yoy(window):
+    if len(window) < window.maxlen or window[0] == 0:
+        return None
+    return (window[-1] / window[0] - 1) * 100
+
+
+def _mean(window):
+    return sum(window) / len(window) if len(window) == window.maxlen else None
+
+
+class RegimeState:
+    """
+    O(1) monthly update of inflation/growth levels, regime and z-scores.
+    """
+
+    def __init__(self):
+        self.date = None
+        self.cpi = deque(maxlen=13)
+        self.gdp = deque(maxlen=13)
+        self.pol = deque(maxlen=3)
+        self.unrt = deque(maxlen=3)
+        self.pol_stats = RunningStats()
+        self.unrt_stats = RunningStats()
+        self.durations = DurationStats()
+        self.latest = {}
+
+    def update(self, new_obs):
+        """
+        Adds one monthly observation: a dict with date, cpi, pol, unrt and
+        optionally gdp (quarterly — the last value is carried when missing).
+        Returns the latest snapshot. Replaying the last date is a no-op (an
+        idempotent re-run of the scheduled job); an earlier date is an error.
+        """
+        obs_date = date.fromisoformat(str(new_obs["date"])[:10]).isoformat()
+        if self.date is not None and obs_date <= self.date:
+            if obs_date == self.date:
+                return self.latest
+            raise ValueError(f"Observation of {obs_date} is older than the state ({self.date}).")
+        self.date = obs_date
+        for key in ("cpi", "gdp", "pol", "unrt"):
+            window, value = getattr(self, key), new_obs.get(key)
+            if value is None or value != value:        # absent / NaN: carry the last value
+                if not window:
+                    continue
+                value = window[-1]
+            window.append(float(value))
+
+        pol_mean, unrt_mean = _mean(self.pol), _mean(self.unrt)
+        if pol_mean is not None:
+            self.pol_stats.push(pol_mean)
+        if unrt_mean is not None:
+            self.unrt_stats.push(unrt_mean)
+
+        inflation, growth = _yoy(self.cpi), _yoy(self.gdp)
+        snapshot = {"date": self.date, "inflation": inflation, "growth": growth}
+        if inflation is not None and growth is not None:
+            infl_step = classify(inflation, INFLATION_STEPS)
+            gdp_step = classify(growth, GROWTH_STEPS)
+            code = classify(infl_step, INFLATION_BANDS) * 10 + classify(gdp_step, GROWTH_BANDS)
+            self.durations.push(code)
+            snapshot.update({
+                "infl_lvl": classify(inflation, INFLATION_LEVELS),
+                "gdp_lvl": classify(growth, GROWTH_LEVELS),
+                "regime_code": code,
+                "run_length": self.durations.run_length,
+                "expected_remaining": self.durations.expected_remaining(),
+            })
+        if self.pol_stats.n > 1 and self.unrt_stats.n > 1:
+            z_fed = self.pol_stats.zscore(pol_mean)
+            z_unrate = self.unrt_stats.zscore(unrt_mean)
+            snapshot.update({
+                "z_unrate": z_unrate,
+                "z_fed": z_fed,
+                "inflation_adj": tanh(z_fed),
+                "growth_adj": tanh(-z_unrate),
+            })
+        self.latest = snapshot
+        return snapshot
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Bootstraps a state from an aligned monthly frame (transforms.monthly_frame),
+        up to the last month where every series is known.
+        """
+        state = cls()
+        columns = frame[["cpi", "gdp", "pol", "unrt"]]
+        ends = [columns[name].last_valid_index() for name in columns]
+        if None in ends:
+            return state
+        for date, cpi, gdp, pol, unrt in columns.loc[:min(ends)].itertuples():
+            state.update({"date": date.date(), "cpi": cpi, "gdp": gdp, "pol": pol, "unrt": unrt})
+        return state
+
+    def to_dict(self):
+        return {
+            "date": self.date,
+            "cpi": list(self.cpi),
+            "gdp": list(self.gdp),
+            "pol": list(self.pol),
+            "unrt": list(self.unrt),
+            "pol_stats": [self.pol_stats.n, self.pol_stats.mean, self.pol_stats.m2],
+            "unrt_stats": [self.unrt_stats.n, self.unrt_stats.mean, self.unrt_stats.m2],
+            "durations": self.durations.to_dict(),
+            "latest": self.latest,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        state.date = data["date"]
+        state.cpi.extend(data["cpi"])
+        state.gdp.extend(data["gdp"])
+        state.pol.extend(data["pol"])
+        state.unrt.extend(data["unrt"])
+        state.pol_stats = RunningStats(*data["pol_stats"])
+        state.unrt_stats = RunningStats(*data["unrt_stats"])
+        state.durations = DurationStats.from_dict(data["durations"])
+        state.latest = data["latest"]
+        return state
+
+    def save(self, path):
+        """
+        Persists the state as JSON (resume with RegimeState.load).
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
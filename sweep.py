@@ -0,0 +1,171 @@
+"""
+Parallel parameter sweep over regime thresholds and band edges.
+
+A configuration is a dict with any of the keys of DEFAULT_CONFIG:
+
+    infl_threshold, gdp_threshold   quadrant thresholds (advanced_portfolio_allocation)
+    infl_edges, gdp_edges           regime band edges (detect_previous_regime)
+
+The 0.5-point steps of every region are computed once, written to a single
+.npy file and memory-mapped read-only by the workers of a process pool, so
+only the small configuration dicts travel between processes. sweep_store
+does the same straight from the memory-mapped HistoryStore. Each
+(region, configuration) pair is reported with its regime stability, average
+regime duration and, when asset returns are given, backtest metrics.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from backtest import backtest, quadrant_index, summary, weights_from_codes
+from bands import GROWTH_BANDS, GROWTH_STEPS, INFLATION_BANDS, INFLATION_STEPS, band_index, classify
+
+
+DEFAULT_CONFIG = {
+    "infl_threshold": 2,
+    "gdp_threshold": 2,
+    "infl_edges": tuple(INFLATION_BANDS["edges"]),
+    "gdp_edges": tuple(GROWTH_BANDS["edges"]),
+}
+
+# worker state: memory-mapped array and the row layout of each region
+_shared = {}
+
+
+def grid(**axes):
+    """
+    Cartesian product of parameter values, e.g.
+    grid(infl_threshold=[1.5, 2, 2.5], gdp_edges=[(-2, 0, 2, 4), (-1, 1, 3)]).
+    """
+    keys = list(axes)
+    return [dict(zip(keys, values)) for values in product(*(axes[key] for key in keys))]
+
+
+def regime_codes(infl_steps, gdp_steps, infl_edges, gdp_edges):
+    """
+    Regime code (infl_band * (len(gdp_edges) + 1) + gdp_band) for custom
+    band edges: unique for any number of growth bands.
+    """
+    n_gdp_bands = len(gdp_edges) + 1
+    return band_index(infl_steps, {"edges": infl_edges}) * n_gdp_bands + band_index(gdp_steps, {"edges": gdp_edges})
+
+
+def evaluate(infl_steps, gdp_steps, configs, returns=None, rebalance=1, lag=1):
+    """
+    Metrics of a list of configurations on one region. The backtests of all
+    the configurations are run as one batch (one variant per configuration).
+    """
+    configs = [{**DEFAULT_CONFIG, **config} for config in configs]
+    metrics = []
+    for config in configs:
+        codes = regime_codes(infl_steps, gdp_steps, config["infl_edges"], config["gdp_edges"])
+        changes = int(np.count_nonzero(np.diff(codes)))
+        metrics.append({
+            "changes": changes,
+            "stability": 1 - changes / max(len(codes) - 1, 1),
+            "avg_duration": len(codes) / (changes + 1),
+        })
+
+    if returns is not None:
+        infl_threshold = np.array([config["infl_threshold"] for config in configs], dtype=float)[:, None]
+        gdp_threshold = np.array([config["gdp_threshold"] for config in configs], dtype=float)[:, None]
+        quadrants = quadrant_index(infl_steps, gdp_steps, infl_threshold, gdp_threshold)
+        result = summary(backtest(weights_from_codes(quadrants), returns, rebalance, lag))
+        for i, row in enumerate(metrics):
+            row.update({key: float(value[i]) for key, value in result.items()})
+    return metrics
+
+
+def _init_worker(path, layout):
+    _shared["data"] = np.load(path, mmap_mode="r")
+    _shared["layout"] = layout
+
+
+def _run(region, configs, rebalance, lag):
+    data, (start, n, has_returns) = _shared["data"], _shared["layout"][region]
+    block = data[:, start:start + n]
+    returns = np.asarray(block[2:].T) if has_returns else None
+    return evaluate(block[0], block[1], configs, returns, rebalance, lag)
+
+
+def _init_store_worker(path, returns):
+    from history_store import HistoryStore
+
+    _shared["store"] = HistoryStore(path)
+    _shared["returns"] = returns
+
+
+def _run_store(region, configs, rebalance, lag):
+    infl_steps, gdp_steps = _shared["store"].steps(region)
+    returns = _shared["returns"].get(region)
+    return evaluate(infl_steps, gdp_steps, configs, returns, rebalance, lag)
+
+
+def _pool_sweep(regions, configs, rebalance, lag, max_workers, chunk_size, run, initializer, initargs):
+    tasks = [(region, configs[i:i + chunk_size]) for region in regions for i in range(0, len(configs), chunk_size)]
+    with ProcessPoolExecutor(max_workers, initializer=initializer, initargs=initargs) as pool:
+        futures = [pool.submit(run, region, chunk, rebalance, lag) for region, chunk in tasks]
+        results = [metrics for future in futures for metrics in future.result()]
+
+    # results come back in (region, config) order
+    keys = [(region, i) for region in regions for i in range(len(configs))]
+    rows = [{**DEFAULT_CONFIG, **configs[i], **metrics} for (_, i), metrics in zip(keys, results)]
+    return pd.DataFrame(rows, index=pd.MultiIndex.from_tuples(keys, names=["region", "config"]))
+
+
+def sweep(regions, configs, returns=None, rebalance=1, lag=1, max_workers=None, chunk_size=64):
+    """
+    Evaluates every configuration on every region.
+
+    regions  dict region -> (inflation YoY, GDP YoY), aligned arrays or Series
+    returns  optional dict region -> asset returns (T, n_assets) aligned on
+             the same months, for backtest metrics
+
+    Returns a DataFrame indexed by (region, config number) with the
+    configuration values followed by the metrics.
+    """
+    returns = returns or {}
+    n_assets = {np.shape(r)[1] for r in returns.values()}
+    if len(n_assets) > 1:
+        raise ValueError("All return arrays must have the same number of assets.")
+    n_assets = n_assets.pop() if n_assets else 0
+
+    # one (2 + n_assets, total_months) float64 array, regions side by side
+    blocks, layout, offset = [], {}, 0
+    for region, (inflation, growth) in regions.items():
+        rows = [classify(np.asarray(inflation, dtype=float), INFLATION_STEPS),
+                classify(np.asarray(growth, dtype=float), GROWTH_STEPS)]
+        n = len(rows[0])
+        if region in returns:
+            rows.extend(np.asarray(returns[region], dtype=float).T)
+        else:
+            rows.extend(np.zeros((n_assets, n)))
+        blocks.append(np.vstack(rows))
+        layout[region] = (offset, n, region in returns)
+        offset += n
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sweep.npy")
+        np.save(path, np.hstack(blocks))
+        return _pool_sweep(regions, configs, rebalance, lag, max_workers, chunk_size, _run, _init_worker, (path, layout))
+
+
+def sweep_store(store, configs, regions=None, returns=None, rebalance=1, lag=1, max_workers=None, chunk_size=64):
+    """
+    Same as sweep, reading the steps of each region from a HistoryStore
+    (history_store.py): the workers map the store file directly, nothing is
+    copied or rewritten. `returns` must be aligned on the valid span of each
+    region (store.index(region)).
+    """
+    regions = list(regions or store.regions)
+    returns = {region: np.asarray(r, dtype=float) for region, r in (returns or {}).items()}
+    for region, r in returns.items():
+        if len(r) != len(store.index(region)):
+            raise ValueError(f"Returns of {region} do not match the {len(store.index(region))} months of the store.")
+    initargs = (store.path, returns)
+    return _pool_sweep(regions, configs, rebalance, lag, max_workers, chunk_size, _run_store, _init_store_worker, initargs)
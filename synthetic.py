@@ -0,0 +1,117 @@
+"""
+Synthetic macro series in the exact shape FRED returns them.
+
+``synthetic_macro`` generates CPI (monthly index), real GDP (quarterly
+level), policy rate and unemployment (monthly, in %) for any number of years,
+as DataFrames indexed by ``DATE`` with one float column named after the FRED
+code. Inflation and growth follow regime-switching AR(1) processes so that
+the regime-duration statistics have realistic runs.
+
+The date index is datetime64[ns] while the window fits pandas' nanosecond
+range (1678-2261) and datetime64[s] beyond it, so 10,000 years of monthly
+data still go through transforms.monthly_frame. The SQLite cache stores
+dates as text and reads them back in ns, so only the in-range sizes can be
+seeded into a FredCache.
+
+    from synthetic import synthetic_macro
+    cpi, gdp, pol, unrt = synthetic_macro(years=100, seed=1)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_END = "2024-12"
+DEFAULT_CODES = ("CPI", "GDP", "POLICY", "UNRATE")
+
+# (inflation annuelle %, croissance annuelle %) des 4 quadrants
+_REGIME_MEANS = np.array([[1.0, -1.0], [1.0, 3.0], [4.0, -1.0], [4.0, 3.0]])
+
+
+def _frame(dates, values, code):
+    return pd.DataFrame({code: values}, index=pd.DatetimeIndex(dates, name="DATE"), dtype="float64")
+
+
+def monthly_dates(years, end=DEFAULT_END):
+    """
+    First day of each month of the `years` years ending at `end` (YYYY-MM).
+    """
+    last = np.datetime64(end, "M")
+    months = np.arange(last - 12 * years + 1, last + 1)
+    unit = "ns" if months[0] >= np.datetime64("1678-01", "M") else "s"
+    return months.astype(f"datetime64[{unit}]")
+
+
+def regime_path(n_months, mean_duration=24, seed=None):
+    """
+    Quadrant index (0-3) of every month: geometric run lengths of mean
+    `mean_duration` months, next quadrant drawn uniformly among the others.
+    """
+    rng = np.random.default_rng(seed)
+    lengths = rng.geometric(1 / mean_duration, size=n_months)
+    lengths = lengths[: np.searchsorted(np.cumsum(lengths), n_months) + 1]
+    steps = rng.integers(1, 4, size=lengths.size)
+    quadrants = np.cumsum(steps) % 4
+    return np.repeat(quadrants, lengths)[:n_months]
+
+
+def synthetic_macro(years=50, seed=0, end=DEFAULT_END, codes=DEFAULT_CODES, mean_duration=24):
+    """
+    Returns (cpi, gdp, pol, unrt) DataFrames covering `years` years up to `end`.
+    """
+    rng = np.random.default_rng(seed)
+    dates = monthly_dates(years, end)
+    n = dates.size
+    quadrant = regime_path(n, mean_duration, rng)
+    target = _REGIME_MEANS[quadrant]
+
+    # taux annuels AR(1) tirés vers la moyenne du régime courant
+    rates = np.empty((n, 2))
+    rates[0] = target[0]
+    shocks = rng.normal(0.0, [0.25, 0.35], size=(n, 2))
+    for t in range(1, n):
+        rates[t] = rates[t - 1] + 0.15 * (target[t] - rates[t - 1]) + shocks[t]
+    inflation, growth = rates[:, 0], rates[:, 1]
+
+    cpi = 100 * np.exp(np.cumsum(np.log1p(inflation / 100) / 12))
+    gdp_monthly = 1000 * np.exp(np.cumsum(np.log1p(growth / 100) / 12))
+    gdp = gdp_monthly[2::3]                                  # niveau du trimestre, daté au 1er mois
+
+    pol = np.clip(0.6 * inflation + 0.3 * growth + rng.normal(0.0, 0.2, n).cumsum() * 0.05, -0.75, None)
+    unrt = np.clip(7.0 - 0.4 * (growth - growth.mean()) + np.cumsum(rng.normal(0.0, 0.05, n)) * 0.1, 2.0, None)
+
+    cpi_code, gdp_code, pol_code, unrt_code = codes
+    return (
+        _frame(dates, cpi, cpi_code),
+        _frame(dates[::3][: gdp.size], gdp, gdp_code),
+        _frame(dates, np.round(pol, 2), pol_code),
+        _frame(dates, np.round(unrt, 1), unrt_code),
+    )
+
+
+def region_series(regions=None, years=50, seed=0, end=DEFAULT_END):
+    """
+    Synthetic series for every FRED code of SERIES (or of `regions`).
+    Codes shared between regions (ECBMRRFR...) get a single series.
+    Returns a dict code -> DataFrame.
+    """
+    from MRPA import SERIES
+
+    frames = {}
+    for i, region in enumerate(regions or SERIES):
+        codes = tuple(SERIES[region][kind] for kind in ("cpi", "gdp", "policy", "unemp"))
+        for code, frame in zip(codes, synthetic_macro(years, seed + i, end, codes)):
+            frames.setdefault(code, frame)
+    return frames
+
+
+def write_fixtures(directory, regions=None, years=50, seed=0, end=DEFAULT_END):
+    """
+    Writes ``<directory>/<code>.csv`` files in FRED CSV format (fetch.CsvFixtureFetcher,
+    python server.py --fixtures DIR).
+    """
+    os.makedirs(directory, exist_ok=True)
+    for code, frame in region_series(regions, years, seed, end).items():
+        frame.to_csv(os.path.join(directory, f"{code}.csv"))
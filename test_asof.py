@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from asof import AsOfEngine, AsOfSeries
+from synthetic import synthetic_macro
+
+
+def test_observation_unknown_until_every_earlier_one_is_released():
+    # février publié avant janvier : aucun des deux n'est connu avant janvier
+    series = AsOfSeries(pd.to_datetime(["2020-01-01", "2020-02-01"]), [1.0, 2.0],
+                        pd.to_datetime(["2020-03-15", "2020-03-01"]))
+    assert series.asof("2020-03-05").empty
+    dates, values = series.latest("2020-03-05")
+    assert dates.isna().all() and np.isnan(values).all()
+    assert series.asof("2020-03-20").tolist() == [1.0, 2.0]
+    assert series.latest("2020-03-20")[1].tolist() == [2.0]
+
+
+def test_vintages_return_the_value_published_at_the_date():
+    table = pd.DataFrame({
+        "date": pd.to_datetime(["2020-01-01", "2020-01-01", "2020-02-01"]),
+        "realtime_start": pd.to_datetime(["2020-02-15", "2020-04-15", "2020-03-15"]),
+        "value": [1.0, 1.5, 2.0],
+    })
+    series = AsOfSeries.from_vintages(table)
+    assert series.asof("2020-03-01").tolist() == [1.0]
+    assert series.asof("2020-03-20").tolist() == [1.0, 2.0]
+    assert series.asof("2020-05-01").tolist() == [1.5, 2.0]
+    assert series.latest(["2020-03-20", "2020-05-01"], offset=1)[1].tolist() == [1.0, 1.5]
+
+
+def test_truncate_never_returns_unpublished_observations():
+    data = synthetic_macro(years=10, seed=3)
+    engine = AsOfEngine(*data)
+    asof = pd.Timestamp("2020-06-10")
+    cpi, gdp, pol, unrt = engine.truncate(asof)
+    assert cpi.index.max() == pd.Timestamp("2020-04-01")     # avril publié le 15 mai
+    assert gdp.index.max() == pd.Timestamp("2020-01-01")     # T1 publié le 30 avril
+    assert unrt.index.max() == pd.Timestamp("2020-04-01")    # mai publié le 5 juillet
+    for known, full in zip((cpi, gdp, pol, unrt), data):
+        pd.testing.assert_series_equal(known.iloc[:, 0], full.iloc[:, 0].loc[known.index], check_names=False)
+
+
+def test_regimes_unknown_before_a_year_of_data():
+    engine = AsOfEngine(*synthetic_macro(years=5, seed=1))
+    frame = engine.regimes(pd.date_range("2020-01-31", "2024-12-31", freq="ME"))
+    assert (frame["quadrant"].iloc[:6] == 4).all()
+    assert frame["quadrant"].iloc[-12:].between(0, 3).all()
+
+
+def test_regimes_use_the_allocation_thresholds():
+    from bands import GROWTH_STEPS, INFLATION_STEPS, classify
+    from regime_duration import QUADRANTS, advanced_portfolio_allocation
+
+    engine = AsOfEngine(*synthetic_macro(years=20, seed=2))
+    frame = engine.regimes(pd.date_range("2008-01-31", "2024-12-31", freq="ME"))
+    # entre 1 % et 1,5 % : niveau >= 2 mais palier < 2 pour l'inflation
+    assert frame["inflation"].between(1, 1.5, inclusive="left").any()
+    labels, *_ = advanced_portfolio_allocation(classify(frame["inflation"].to_numpy(), INFLATION_STEPS),
+                                               classify(frame["growth"].to_numpy(), GROWTH_STEPS), None, None)
+    assert frame["quadrant"].tolist() == [QUADRANTS.index(label) for label in labels]
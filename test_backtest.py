@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import backtest, backtest_quadrants, summary, weights_from_codes
+
+
+def test_weights_drift_between_rebalancing_dates():
+    returns = np.array([[0.10, 0.0], [0.10, 0.0], [0.0, 0.0], [0.0, 0.0]])
+    result = backtest(np.full((4, 2), 0.5), returns, rebalance=2, lag=0)
+    # mois 1 : 55 / 45 après dérive, donc rendement 5.5 % au lieu de 5 %
+    np.testing.assert_allclose(result["returns"], [0.05, 0.055 / 1.05, 0, 0])
+    # rééquilibrage au mois 2 : des poids dérivés vers 50 / 50
+    drifted = 0.5 * 1.21 / (0.5 * 1.21 + 0.5)
+    np.testing.assert_allclose(result["turnover"], [0.5, 0, drifted - 0.5, 0])
+    np.testing.assert_allclose(result["equity"][-1], 0.5 * 1.21 + 0.5)
+
+
+def test_lag_and_costs():
+    returns = np.full((6, 1), 0.01)
+    result = backtest(np.ones((6, 1)), returns, lag=2, cost=0.001)
+    np.testing.assert_allclose(result["returns"][:2], 0)
+    np.testing.assert_allclose(result["returns"][2], 0.01 - 0.001 * 0.5)     # rotation aller simple
+    np.testing.assert_allclose(result["returns"][3:], 0.01)
+    assert summary(result)["turnover"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("lag", [3, 10, -1])
+def test_lag_must_leave_months(lag):
+    with pytest.raises(ValueError):
+        backtest(np.ones((3, 1)), np.zeros((3, 1)), lag=lag)
+
+
+def test_quadrants_are_carried_onto_the_returns_dates():
+    dates = pd.date_range("2020-01-31", periods=6, freq="ME")
+    returns = pd.DataFrame(np.full((6, 4), 0.01), index=dates, columns=["Actions", "Or", "Cash", "Obligations"])
+    quadrants = pd.Series(["Inflation + / Croissance +", "Zone grise"], index=pd.to_datetime(["2020-02-01", "2020-05-01"]))
+    result = backtest_quadrants(quadrants, returns, lag=0)
+    invested = weights_from_codes([4, 0, 0, 0, 4, 4]).sum(axis=-1)
+    np.testing.assert_allclose(result["returns"], 0.01 * invested)
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from bands import GROWTH_LEVELS, GROWTH_STEPS, INFLATION_LEVELS, INFLATION_STEPS, classify, describe, position_pct
+
+
+def test_exact_thresholds_start_their_band():
+    assert classify([0, 1, 2.5, 3.5, 4.5], INFLATION_LEVELS).tolist() == [1, 2, 3, 4, 5]
+    assert classify(-0.01, INFLATION_LEVELS) == 0
+    assert describe(classify(3.0, INFLATION_LEVELS), INFLATION_LEVELS) == "Dynamique des prix modérée"
+
+
+def test_no_gap_between_growth_steps():
+    # [-2, -1) tombait dans le dernier palier avec l'ancienne échelle if/elif
+    assert classify([-3, -2, -1.5, -1, 0.25, 4, 7], GROWTH_STEPS).tolist() == [-2, -1, -1, 0, 0.5, 5, 5]
+    assert classify(np.nan, INFLATION_STEPS) == 5
+
+
+def test_always_returns_arrays():
+    series = pd.Series([0.2, 1.7, 3.1], index=pd.date_range("2020-01-31", periods=3, freq="ME"))
+    levels = classify(series, GROWTH_LEVELS)
+    assert isinstance(levels, np.ndarray) and levels.tolist() == [2, 3, 4]
+    assert isinstance(classify(1.7, GROWTH_LEVELS), int)
+    assert position_pct(np.array([1.75]), np.array([3]), GROWTH_LEVELS).tolist() == [50.0]
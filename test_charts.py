@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+
+from charts import CHARTS, downsample, render_all
+from history import regime_history
+from synthetic import synthetic_macro
+
+
+def test_downsample_keeps_extremes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 50)
+    y[1234] = 10
+    xs, ys = downsample(x, y, max_points=200)
+    assert len(xs) <= 200
+    assert np.all(np.diff(xs) > 0)
+    assert ys.max() == 10 and ys.min() == y.min()
+    short = x[:50]
+    assert downsample(short, y[:50], 200)[0] is short
+
+
+def test_render_all_writes_every_chart(tmp_path):
+    histories = {region: regime_history(*synthetic_macro(years=20, seed=seed)) for seed, region in enumerate(["FR", "DE"])}
+    written = render_all(histories, str(tmp_path), formats=("png", "svg"), max_workers=1, max_points=100)
+    expected = {f"{region}_{chart}.{fmt}" for region in histories for chart in CHARTS for fmt in ("png", "svg")}
+    assert {os.path.basename(path) for paths in written.values() for path in paths} == expected
+    assert set(os.listdir(tmp_path)) == expected
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from composites import MemberPanel, build
+from synthetic import synthetic_macro
+
+
+@pytest.fixture
+def data():
+    late = tuple(frame.loc["2010":] for frame in synthetic_macro(years=25, seed=2))
+    return {"AA": synthetic_macro(years=25, seed=1), "BB": late}
+
+
+def _check_reproduces(series, member, lag_months=0):
+    composite, member = series.iloc[:, 0], member.iloc[:, 0]
+    member = member.loc[composite.index]
+    assert len(composite) >= len(member) - lag_months - 3
+    np.testing.assert_allclose(composite / composite.iloc[0], member / member.iloc[0], rtol=1e-12)
+
+
+@pytest.mark.parametrize("weights", ["equal", "gdp"])
+def test_single_member_reproduces_the_member(data, weights):
+    composite = MemberPanel(data).composites({"ONLY": ["AA"]}, weights=weights)["ONLY"]
+    for series, member, kind in zip(composite, data["AA"], ("cpi", "gdp", "policy", "unemp")):
+        if kind in ("cpi", "gdp"):
+            _check_reproduces(series, member, 12 if weights == "gdp" else 0)
+        else:
+            pd.testing.assert_series_equal(series.iloc[:, 0], member.iloc[:, 0].loc[series.index], check_names=False, check_freq=False)
+
+
+def test_equal_weights_are_the_mean_of_the_members(data):
+    same = {"AA": data["AA"], "CC": data["AA"]}
+    composite = build(same, {"PAIR": ["AA", "CC"]}, weights="equal")["PAIR"]
+    _check_reproduces(composite[0], data["AA"][0])
+    np.testing.assert_allclose(composite[3].iloc[:, 0], data["AA"][3].iloc[:, 0])
+    fixed = MemberPanel(data).composites({"MIX": {"AA": 0.25, "BB": 0.75}})["MIX"][2].iloc[:, 0]
+    pol = pd.concat([data["AA"][2].iloc[:, 0], data["BB"][2].iloc[:, 0]], axis=1).dropna()
+    np.testing.assert_allclose(fixed.loc[pol.index], pol @ [0.25, 0.75])
+
+
+def test_no_gdp_weight_before_a_member_starts(data):
+    composite = MemberPanel(data).composites({"BOTH": ["AA", "BB"]}, weights="gdp", lag=12)["BOTH"]
+    unemp = composite[3].iloc[:, 0]
+    # BB n'a pas de PIB avant 2010 : son poids n'existe qu'à partir de 2011
+    before = unemp.loc[:"2010-12"]
+    np.testing.assert_allclose(before, data["AA"][3].iloc[:, 0].loc[before.index])
+    assert not np.allclose(unemp.loc["2011-02":], data["AA"][3].iloc[:, 0].loc["2011-02":])
+    assert unemp.index[0] == data["AA"][3].index[12]
+
+
+def test_unknown_members_raise(data):
+    with pytest.raises(ValueError):
+        build(data, {"X": ["AA", "ZZ"]})
+    with pytest.raises(ValueError):
+        MemberPanel(data).composites({"X": ["AA"]}, weights="population")
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from durations import DurationStats, duration_stats, remaining_duration, run_lengths, transition_matrix
+
+
+CODES = np.array([1, 1, 2, 2, 2, 1, 3, 3, 1, 1])
+
+
+def test_run_lengths():
+    values, lengths, starts = run_lengths(CODES)
+    assert values.tolist() == [1, 2, 1, 3, 1]
+    assert lengths.tolist() == [2, 3, 1, 2, 2]
+    assert starts.tolist() == [0, 2, 5, 6, 8]
+    assert [a.size for a in run_lengths([])] == [0, 0, 0]
+
+
+def test_incremental_stats_match_the_batch_ones():
+    pushed = DurationStats()
+    for code in CODES.tolist():
+        pushed.push(code)
+    batch = DurationStats.from_codes(CODES)
+    assert pushed.to_dict() == batch.to_dict()
+    assert DurationStats.from_dict(batch.to_dict()).to_dict() == batch.to_dict()
+    assert (pushed.current, pushed.run_length) == (1, 2)
+
+    stats = pushed.stats()
+    expected = duration_stats(CODES)
+    pd.testing.assert_series_equal(stats["mean"], expected["mean"].astype(float), check_names=False)
+    pd.testing.assert_frame_equal(pushed.transition_matrix(), transition_matrix(CODES), check_dtype=False)
+
+
+def test_remaining_duration():
+    assert remaining_duration({2: 1, 4: 1}, 1) == 2.0
+    assert remaining_duration({2: 1, 4: 1}, 3) == 1.0
+    assert remaining_duration({2: 1}, 2) is None
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fetch
+from fetch import CsvFixtureFetcher, fetch_series, with_retry
+from fred_cache import FredCache
+from synthetic import region_series, write_fixtures
+
+
+class Flaky:
+    def __init__(self, failures, error=OSError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, code, start, end):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("temporary failure")
+        return code
+
+
+def test_retry_backs_off_then_succeeds(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(fetch.time, "sleep", sleeps.append)
+    flaky = Flaky(2)
+    assert with_retry(flaky, retries=3, backoff=0.5)("X", None, None) == "X"
+    assert flaky.calls == 3 and sleeps == [0.5, 1.0]
+
+
+def test_retry_gives_up(monkeypatch):
+    monkeypatch.setattr(fetch.time, "sleep", lambda seconds: None)
+    flaky = Flaky(5)
+    with pytest.raises(OSError):
+        with_retry(flaky, retries=2)("X", None, None)
+    assert flaky.calls == 3
+    # les autres erreurs ne sont pas réessayées
+    other = Flaky(1, KeyError)
+    with pytest.raises(KeyError):
+        with_retry(other)("X", None, None)
+    assert other.calls == 1
+
+
+def test_csv_fixture_round_trip(tmp_path):
+    frames = region_series(["FR"], years=5)
+    write_fixtures(str(tmp_path), regions=["FR"], years=5)
+    code, frame = next(iter(frames.items()))
+    data = CsvFixtureFetcher(str(tmp_path))(code, datetime(2000, 1, 1), datetime(2100, 1, 1))
+    assert list(data.columns) == [code] and data.index.name == "DATE"
+    assert np.allclose(data[code], frame[code])
+    window = CsvFixtureFetcher(str(tmp_path))(code, frame.index[12], frame.index[23])
+    assert len(window) == 12
+
+
+def test_shared_codes_are_fetched_once(tmp_path):
+    from MRPA import SERIES, get_macro_data_batch
+
+    calls = []
+    fixtures = CsvFixtureFetcher(str(tmp_path))
+    write_fixtures(str(tmp_path), regions=["FR", "DE"], years=20)
+
+    def counting(code, start, end):
+        calls.append(code)
+        return fixtures(code, start, end)
+
+    assert fetch_series(["A", "B", "A"], None, None, lambda code, start, end: code) == {"A": "A", "B": "B"}
+    cache = FredCache(str(tmp_path / "fred.sqlite"), fetcher=counting)
+    data = get_macro_data_batch(["FR", "DE"], datetime(2010, 1, 1), cache=cache)
+    assert sorted(calls) == sorted(set(calls))
+    assert SERIES["FR"]["policy"] == SERIES["DE"]["policy"]
+    pd.testing.assert_frame_equal(data["FR"][2], data["DE"][2])
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from forecast import RegimeForecaster, forecast_regions
+
+
+CODES = [0] * 6 + [1] * 3 + [0] * 6 + [1] * 3 + [0] * 2
+
+
+def test_remaining_weights_are_conditional_on_the_elapsed_months():
+    forecaster = RegimeForecaster.from_codes(CODES)
+    assert forecaster.elapsed == 2
+    weights = forecaster.remaining_weights()
+    # tous les runs de 0 ont duré 6 mois : encore 4 mois, sûrement
+    assert weights.sum() == pytest.approx(1)
+    assert np.flatnonzero(weights).tolist() == [4]
+
+
+def test_forecast_is_deterministic_and_consistent():
+    result = RegimeForecaster.from_codes(CODES).forecast(horizon=12, n_paths=2_000, seed=1)
+    assert result["current"] == (0, 2)
+    assert result["expected_remaining"] == 4
+    assert result["change_within"].loc[4] == 0 and result["change_within"].loc[5] == 1
+    assert result["next_regime"].loc[1] == pytest.approx(1)
+    assert np.allclose(result["occupancy"].sum(axis=1), 1)
+
+
+def test_forecast_regions_are_reproducible():
+    first = forecast_regions({"A": CODES, "B": CODES[::-1]}, horizon=12, n_paths=500, seed=3)
+    second = forecast_regions({"A": CODES, "B": CODES[::-1]}, horizon=12, n_paths=500, seed=3)
+    for region in first:
+        assert first[region]["occupancy"].equals(second[region]["occupancy"])
+
+
+def test_forecast_needs_a_regime_change():
+    with pytest.raises(ValueError):
+        RegimeForecaster.from_codes([2, 2, 2])
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import fred_cache
+
+from fred_cache import FredCache
+from synthetic import region_series
+
+
+class CountingFetcher:
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def __call__(self, code, start, end):
+        self.calls.append((code, pd.Timestamp(start), pd.Timestamp(end)))
+        return self.frames[code].truncate(pd.Timestamp(start), pd.Timestamp(end))
+
+
+@pytest.fixture
+def frames():
+    return region_series(["FR", "DE"], years=20)
+
+
+def test_fresh_series_are_served_without_fetching(tmp_path, frames):
+    fetcher = CountingFetcher(frames)
+    cache = FredCache(str(tmp_path / "fred.sqlite"), fetcher=fetcher)
+    code = next(iter(frames))
+    first = cache.get(code, datetime(2010, 1, 1))
+    second = cache.get(code, datetime(2012, 1, 1))
+    assert len(fetcher.calls) == 1
+    pd.testing.assert_frame_equal(second, first.loc["2012":], check_freq=False)
+    assert cache.is_fresh(code, datetime(2010, 1, 1)) and not cache.is_fresh(code, datetime(2005, 1, 1))
+
+    # fenêtre plus ancienne : seul le début manquant est demandé
+    cache.get(code, datetime(2008, 1, 1))
+    assert fetcher.calls[-1][1:] == (pd.Timestamp("2008-01-01"), pd.Timestamp("2010-01-01"))
+
+
+def test_stale_series_are_refreshed_from_the_last_date(tmp_path, frames):
+    fetcher = CountingFetcher(frames)
+    cache = FredCache(str(tmp_path / "fred.sqlite"), ttl=timedelta(0), fetcher=fetcher)
+    code = next(iter(frames))
+    cache.seed(code, frames[code].loc[:"2020-06"], fetched_at=datetime(2021, 1, 1))
+    data = cache.get(code, datetime(2010, 1, 1))
+    assert fetcher.calls == [(code, pd.Timestamp("2020-06-01"), fetcher.calls[0][2])]
+    assert data.index[-1] == frames[code].index[-1]
+
+
+def test_offline_mode_never_fetches(tmp_path, frames):
+    def refuse(code, start, end):
+        raise AssertionError("network call in offline mode")
+
+    code = next(iter(frames))
+    cache = FredCache(str(tmp_path / "fred.sqlite"), offline=True, fetcher=refuse)
+    cache.seed(code, frames[code], fetched_at=datetime(2000, 1, 1))
+    assert len(cache.get(code, datetime(2010, 1, 1))) == len(frames[code].loc["2010":])
+    with pytest.raises(ValueError, match="offline"):
+        cache.get("MISSING", datetime(2010, 1, 1))
+
+
+def test_connections_are_closed(tmp_path, frames, monkeypatch):
+    opened, real_connect = [], sqlite3.connect
+
+    def connect(*args, **kwargs):
+        opened.append(real_connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(fred_cache.sqlite3, "connect", connect)
+    code = next(iter(frames))
+    cache = FredCache(str(tmp_path / "fred.sqlite"), fetcher=CountingFetcher(frames))
+    cache.get(code, datetime(2010, 1, 1))
+    cache.is_fresh(code)
+    assert opened
+    for con in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            con.execute("SELECT 1")
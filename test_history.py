@@ -0,0 +1,71 @@
+import math
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bands import GROWTH_LEVELS, INFLATION_LEVELS
+from history import ALLOCATIONS, REGIMES, quadrant_code, regime_history
+from MRPA import analyze_growth_data, analyze_inflation_data, portflio_macro_alocation, precision_macro_regime, snapshot_from_data
+from regime_duration import detect_curent_regime
+from synthetic import synthetic_macro
+
+
+def _scalar_yoy(values):
+    # boucle de référence : variation sur 12 mois, dernière valeur connue reportée
+    out, last = [], math.nan
+    for t, value in enumerate(values):
+        if t >= 12 and not (math.isnan(value) or math.isnan(values[t - 12])):
+            last = (value / values[t - 12] - 1) * 100
+        out.append(last)
+    return out
+
+
+def test_quadrant_code_matches_the_scalar_tables():
+    for i in range(len(INFLATION_LEVELS) + 1):
+        for g in range(len(GROWTH_LEVELS) + 1):
+            code = quadrant_code(i, g)
+            assert REGIMES[code] == detect_curent_regime(i, g)
+            assert ALLOCATIONS[code] == portflio_macro_alocation(i, g)
+
+
+def test_regime_history_matches_the_scalar_baseline():
+    cpi, gdp, pol, unrt = synthetic_macro(years=6, seed=3)
+    cpi.iloc[30, 0] = np.nan                      # observation manquante
+    gdp = gdp.drop(gdp.index[8])                  # trimestre absent
+    history = regime_history(cpi, gdp, pol, unrt)
+
+    months = history.index.values.astype("datetime64[M]")
+    cpi_dates = cpi.index.values.astype("datetime64[M]")
+    gdp_dates = gdp.index.values.astype("datetime64[M]")
+    all_months = np.arange(cpi_dates[0], cpi_dates[-1] + 1)
+    cpi_values = dict(zip(cpi_dates, cpi.iloc[:, 0]))
+    cpi_values = [cpi_values.get(m, math.nan) for m in all_months]
+    gdp_values = [gdp.iloc[np.searchsorted(gdp_dates, m, side="right") - 1, 0] for m in all_months]
+    inflation = dict(zip(all_months, _scalar_yoy(cpi_values)))
+    growth = dict(zip(all_months, _scalar_yoy(gdp_values)))
+
+    assert not history.isna().any().any()
+    assert months[0] == all_months[12]
+    for month, row in zip(months, history.itertuples()):
+        assert row.inflation == pytest.approx(inflation[month])
+        assert row.growth == pytest.approx(growth[month])
+        infl_lvl, gdp_lvl = analyze_inflation_data(row.inflation), analyze_growth_data(row.growth)
+        assert (row.infl_lvl, row.gdp_lvl) == (infl_lvl, gdp_lvl)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            positions = precision_macro_regime(infl_lvl, gdp_lvl, row.inflation, row.growth)
+        assert (row.infl_pos_pct, row.gdp_pos_pct) == pytest.approx(positions)
+        assert row.regime == detect_curent_regime(infl_lvl, gdp_lvl)
+        assert row.allocation == portflio_macro_alocation(infl_lvl, gdp_lvl)
+
+
+def test_last_row_is_the_snapshot():
+    cpi, gdp, pol, unrt = synthetic_macro(years=6, seed=5)
+    # la dernière observation du PIB couvre le dernier mois de l'IPC
+    cpi = cpi.loc[:gdp.index[-1] + pd.offsets.MonthBegin(2)]
+    last = regime_history(cpi, gdp, pol, unrt).iloc[-1]
+    snapshot = snapshot_from_data(cpi, gdp, pol, unrt)
+    assert (last["inflation"], last["growth"]) == pytest.approx((snapshot.inflation, snapshot.growth))
+    assert last["regime"] == detect_curent_regime(snapshot.infl_lvl, snapshot.gdp_lvl)
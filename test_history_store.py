@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import history_store
+from history import regime_history
+from synthetic import synthetic_macro
+
+
+def test_history_round_trip(tmp_path):
+    data = {"AA": synthetic_macro(years=20, seed=1), "BB": synthetic_macro(years=12, seed=2, end="2020-06")}
+    store = history_store.build(data, str(tmp_path))
+    for region, series in data.items():
+        expected = regime_history(*series)
+        history = history_store.HistoryStore.open(str(tmp_path)).history(region)
+        pd.testing.assert_index_equal(history.index, expected.index, check_names=False)
+        np.testing.assert_allclose(history["inflation"], expected["inflation"], rtol=1e-6)
+        np.testing.assert_allclose(history["growth"], expected["growth"], rtol=1e-6)
+        assert (history["regime"] == expected["regime"]).all()
+        assert (history["allocation"] == expected["allocation"]).all()
+    assert store.column("cpi", "BB").shape == (len(store.dates),)
+    assert np.isnan(store.column("cpi", "BB")[-1])
+
+
+def test_missing_codes_inside_the_span_are_nan(tmp_path):
+    history_store.build({"AA": synthetic_macro(years=10, seed=4)}, str(tmp_path))
+    codes = np.load(tmp_path / "codes.npy", mmap_mode="r+")
+    store = history_store.HistoryStore(str(tmp_path))
+    start = store.spans["AA"][0]
+    codes[history_store.CODE_COLUMNS.index("quadrant_code"), 0, start + 5] = history_store.MISSING
+    codes.flush()
+    history = history_store.HistoryStore(str(tmp_path)).history("AA")
+    assert history["regime"].isna().tolist() == [i == 5 for i in range(len(history))]
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from MRPA import data_optimization, pressure_history
+from online_stats import EWStats, RunningStats, WindowStats, zscores
+from synthetic import synthetic_macro
+
+
+@pytest.fixture
+def values():
+    x = pd.Series(np.random.default_rng(0).normal(1e6, 2.0, 500))     # grande moyenne : test de stabilité
+    x.iloc[[0, 1, 50, 51]] = np.nan
+    return x
+
+
+def test_expanding_matches_batch(values):
+    expected = (values - values.expanding().mean()) / values.expanding().std()
+    np.testing.assert_allclose(zscores(values), expected, rtol=1e-6, equal_nan=True)
+    stats = RunningStats().extend(values[:200]).extend(values[200:])
+    clean = values.dropna()
+    assert stats.n == clean.size
+    assert stats.zscore(clean.iloc[-1]) == pytest.approx((clean.iloc[-1] - clean.mean()) / clean.std(), rel=1e-9)
+
+
+def test_ewm_and_rolling_match_pandas(values):
+    ewm = values.ewm(alpha=0.1, adjust=False, ignore_na=True)
+    expected = (values - ewm.mean()) / np.sqrt(ewm.var(bias=True))
+    np.testing.assert_allclose(zscores(values, "ewm", alpha=0.1)[3:], expected[3:], rtol=1e-6, equal_nan=True)
+
+    clean = values.dropna().reset_index(drop=True)
+    rolling = clean.rolling(24)
+    expected = (clean - rolling.mean()) / rolling.std()
+    np.testing.assert_allclose(zscores(clean, "rolling", window=24), expected, rtol=1e-6, equal_nan=True)
+
+
+def test_accumulators_are_resumable():
+    x = np.random.default_rng(1).normal(size=100)
+    for make in (RunningStats, lambda: EWStats(halflife=6), lambda: WindowStats(12)):
+        one, two = make(), make()
+        for value in x:
+            one.push(value)
+        for value in x[:40]:
+            two.push(value)
+        for value in x[40:]:
+            two.push(value)
+        assert one.zscore(x[-1]) == pytest.approx(two.zscore(x[-1]))
+    assert np.isnan(RunningStats().extend([2.0, 2.0, 2.0]).zscore(2.0))
+
+
+def test_data_optimization_is_the_last_point_of_pressure_history():
+    cpi, gdp, pol, unrt = synthetic_macro(years=30, seed=5)
+    *_, z_unrate, z_fed, inflation_adj, growth_adj = data_optimization(cpi, gdp, pol, unrt)
+    history = pressure_history(pol, unrt).iloc[-1]
+    assert (z_unrate, z_fed, inflation_adj, growth_adj) == pytest.approx(
+        tuple(history[["z_unrate", "z_fed", "inflation_adj", "growth_adj"]]))
+    with pytest.raises(ValueError):
+        zscores(pol, "median")
+
+
+@pytest.mark.parametrize("kind, options", [
+    ("expanding", {}),
+    ("ewm", {"alpha": 0.2}),
+    ("ewm", {"halflife": 6}),
+    ("rolling", {"window": 12}),
+    ("rolling", {"window": 1}),
+])
+def test_vectorized_zscores_match_the_accumulators(kind, options):
+    from online_stats import accumulator
+
+    x = np.random.default_rng(2).normal(3.0, 1.0, 300)
+    x[[0, 5, 6, 100]] = np.nan
+    x[150:170] = 1.5                                     # écart-type nul sur une fenêtre
+    series = pd.Series(x, index=pd.date_range("2000-01-31", periods=x.size, freq="ME"), name="x")
+
+    stats, expected = accumulator(kind, **options), np.full(x.size, np.nan)
+    for i in np.flatnonzero(~np.isnan(x)):
+        stats.push(x[i])
+        expected[i] = stats.zscore(x[i])
+    result = zscores(series, kind, **options)
+    assert result.index.equals(series.index) and result.name == "x"
+    np.testing.assert_allclose(result.to_numpy(), expected, rtol=1e-7, atol=1e-9, equal_nan=True)
@@ -0,0 +1,44 @@
+import threading
+
+import profiling
+
+
+@profiling.profiled("decorated")
+def work(n):
+    profiling.count("items", n)
+    return n
+
+
+def test_nested_stages_threads_and_counters():
+    with profiling.profile(memory=True) as prof:
+        with profiling.stage("region", "FR"):
+            with profiling.stage("fetch"):
+                work(3)
+            work(2)
+
+        def worker():
+            with profiling.stage("cache", "X"):
+                bytearray(10_000)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    report = prof.to_dict()
+
+    assert list(report["stages"]) == [
+        "region[FR]", "region[FR]/fetch", "region[FR]/fetch/decorated", "region[FR]/decorated", "cache[X]",
+    ]
+    assert report["stages"]["region[FR]"]["calls"] == 1
+    assert report["stages"]["cache[X]"]["peak_bytes"] >= 10_000
+    assert report["stages"]["region[FR]"]["seconds"] >= report["stages"]["region[FR]/fetch"]["seconds"]
+    assert report["counters"] == {"items": 5}
+    assert profiling.active() is None
+
+
+def test_disabled_profiling_is_a_no_op():
+    assert profiling.active() is None
+    assert profiling.stage("x") is profiling.stage("y")
+    with profiling.stage("x"):
+        profiling.count("ignored")
+    assert work(1) == 1
+    assert profiling.disable() is None
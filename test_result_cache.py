@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import bands
+from result_cache import ResultCache, cached, fingerprint
+
+
+def test_fingerprint_follows_the_inputs_and_thresholds(monkeypatch):
+    series = pd.Series([1.0, 2.0, 3.0], index=pd.date_range("2020-01-01", periods=3, freq="MS"))
+    key = fingerprint("f", series)
+    assert fingerprint("f", series.copy()) == key
+    assert fingerprint("g", series) != key
+    assert fingerprint("f", series.astype("float32")) != key
+    assert fingerprint("f", series.set_axis(series.index + pd.DateOffset(months=1))) != key
+    monkeypatch.setattr(bands, "INFLATION_LEVELS", [0, 3])
+    assert fingerprint("f", series) != key
+
+
+def test_fingerprint_follows_the_allocation_table(monkeypatch):
+    import regime_duration
+
+    key = fingerprint("regime_analysis", 1.0)
+    weights = {quadrant: dict(row) for quadrant, row in regime_duration.QUADRANT_WEIGHTS.items()}
+    weights["Zone grise"]["Cash"] = 100
+    monkeypatch.setattr(regime_duration, "QUADRANT_WEIGHTS", weights)
+    changed = fingerprint("regime_analysis", 1.0)
+    assert changed != key
+    monkeypatch.setattr(regime_duration, "QUADRANT_THRESHOLDS", {"inflation": 2.5, "growth": 2})
+    assert fingerprint("regime_analysis", 1.0) not in (key, changed)
+
+
+def test_cached_results_are_served_from_disk(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    calls = []
+
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    values = np.arange(5.0)
+    first = cached("square", square, values, cache=cache)
+    second = cached("square", square, values, cache=ResultCache(str(tmp_path)))
+    assert np.array_equal(first, second) and len(calls) == 1
+    cached("square", square, values, cache=False)
+    assert len(calls) == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=3100)
+    for i, key in enumerate("abc"):
+        cache.put(key, bytes(1000))
+        os.utime(cache._file(key), (i, i))
+    cache.get("a")                                     # a devient le plus récent
+    cache.put("d", bytes(1000))
+    assert cache.size() <= 3100
+    assert cache.get("b") is None and cache.get("a") is not None
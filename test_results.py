@@ -0,0 +1,73 @@
+import io
+import json
+import math
+
+import pytest
+
+import dashboard
+from fred_cache import default_cache
+from history import regime_history
+from results import HistoryRow, Snapshot, history_rows, write_records
+from synthetic import region_series, synthetic_macro
+
+
+def _snapshot(**changes):
+    values = dict(region="FR", date="2024-01-31", inflation=2.5, growth=1.0, infl_lvl=2, gdp_lvl=1,
+                  infl_pos_pct=50.0, gdp_pos_pct=20.0, inflation_adj=0.1, growth_adj=-0.2,
+                  regime="Inflation + Récession", allocation="Allouer vers de l'Or et du Cash")
+    values.update(changes)
+    return Snapshot(**values)
+
+
+def test_history_rows_follow_the_history():
+    history = regime_history(*synthetic_macro(years=5, seed=1))
+    rows = list(history_rows("FR", history))
+    assert len(rows) == len(history) and all(isinstance(row, HistoryRow) for row in rows)
+    first = rows[0].to_dict()
+    assert first["date"] == str(history.index[0].date())
+    assert first["regime"] == history["regime"].iloc[0]
+    assert type(first["infl_lvl"]) is int and first["inflation"] == history["inflation"].iloc[0]
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_json_formats_write_nan_as_null(fmt, tmp_path):
+    records = [_snapshot(), _snapshot(region="DE", inflation_adj=math.nan, growth_adj=math.inf)]
+    stream = io.StringIO()
+    write_records(records, fmt, stream)
+    path = tmp_path / f"out.{fmt}"
+    write_records(iter(records), fmt, path=str(path))
+    assert path.read_text(encoding="utf-8") == stream.getvalue()
+
+    text = stream.getvalue()
+    loaded = json.loads(text) if fmt == "json" else [json.loads(line) for line in text.splitlines()]
+    assert loaded[0] == records[0].to_dict()
+    assert loaded[1]["inflation_adj"] is None and loaded[1]["growth_adj"] is None
+    assert Snapshot.from_dict(loaded[0]) == records[0]
+
+
+def test_parquet_and_unknown_formats(tmp_path):
+    with pytest.raises(ValueError):
+        write_records([_snapshot()], "parquet")
+    with pytest.raises(ValueError):
+        write_records([_snapshot()], "csv", path=str(tmp_path / "out.csv"))
+    assert not (tmp_path / "out.csv").exists()
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    write_records([_snapshot()], "parquet", path=str(tmp_path / "out.parquet"))
+    assert pd.read_parquet(tmp_path / "out.parquet")["region"].tolist() == ["FR"]
+
+
+def test_dashboard_output_files(tmp_path, capsys):
+    cache = default_cache()
+    for code, frame in region_series(["FR", "DE"], years=10).items():
+        cache.seed(code, frame)
+
+    path = tmp_path / "snapshots.json"
+    dashboard.main(["--regions", "FR", "DE", "--start", "2015-01", "--format", "json", "--output", str(path)])
+    assert json.loads(path.read_text(encoding="utf-8"))[1]["region"] == "DE"
+
+    path = tmp_path / "history.ndjson"
+    dashboard.main(["--regions", "FR", "--start", "2015-01", "--history", "--format", "ndjson", "--output", str(path)])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) > 12 and json.loads(lines[-1])["region"] == "FR"
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from risk_parity import regime_covariances, regime_weights, rolling_regime_weights, solve_weights
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.005, 0.04, (240, 4)) * [1, 2, 0.5, 1.5]
+    codes = rng.integers(0, 4, (3, 240))
+    return returns, codes
+
+
+def test_covariances_match_numpy(data):
+    returns, codes = data
+    cov = regime_covariances(returns, codes, shrinkage=0)
+    for v in range(codes.shape[0]):
+        for q in range(4):
+            np.testing.assert_allclose(cov[v, q], np.cov(returns[codes[v] == q], rowvar=False), atol=1e-12)
+    # zone grise jamais observée : covariance de tous les mois
+    np.testing.assert_allclose(cov[0, 4], np.cov(returns, rowvar=False), atol=1e-12)
+
+
+def test_risk_contributions_are_equal(data):
+    returns, codes = data
+    cov = regime_covariances(returns, codes)[:, :4]
+    weights = solve_weights(cov)
+    contributions = weights * np.einsum("...ab,...b->...a", cov, weights)
+    np.testing.assert_allclose(contributions / contributions.sum(axis=-1, keepdims=True), 0.25, atol=1e-9)
+    assert (weights > 0).all()
+    np.testing.assert_allclose(solve_weights(cov, "min_variance").sum(axis=-1), 1)
+
+
+def test_rolling_weights_only_use_past_months(data):
+    returns, codes = data
+    weights = rolling_regime_weights(returns, codes[0], rebalance=12)
+    later = returns.copy()
+    later[120:] *= 5                                   # les mois futurs ne changent rien avant 120
+    np.testing.assert_array_equal(rolling_regime_weights(later, codes[0], rebalance=12)[:120], weights[:120])
+    # à la date 120, estimation sur les 120 premiers mois seulement
+    expected = regime_weights(returns[:120], codes[0, :120])[codes[0, 120]]
+    np.testing.assert_allclose(weights[120], expected, atol=1e-12)
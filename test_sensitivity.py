@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from asof import AsOfEngine
+from MRPA import data_optimization
+from sensitivity import summary, surface
+from synthetic import synthetic_macro
+
+
+# publication immédiate : les données d'une date sont celles du mois
+NO_LAGS = {kind: (0, 0) for kind in ("cpi", "gdp", "policy", "unemp")}
+
+
+def test_surface_cells_match_data_optimization():
+    cpi, gdp, pol, unrt = synthetic_macro(years=20, seed=4)
+    starts = pd.date_range("2008-01-01", periods=4, freq="36MS")
+    asof = pd.date_range("2018-01-31", periods=3, freq="12ME")
+    surfaces = surface(cpi, gdp, pol, unrt, starts, asof)
+    for start in starts:
+        for end in asof:
+            window = [frame.loc[start:end] for frame in (cpi, gdp, pol, unrt)]
+            _, _, z_unrate, z_fed, inflation_adj, growth_adj = data_optimization(*window)
+            assert surfaces["z_fed"].loc[start, end] == pytest.approx(z_fed)
+            assert surfaces["z_unrate"].loc[start, end] == pytest.approx(z_unrate)
+            assert surfaces["inflation_adj"].loc[start, end] == pytest.approx(inflation_adj)
+            assert surfaces["growth_adj"].loc[start, end] == pytest.approx(growth_adj)
+    assert (surfaces["quadrant"] < 4).all().all()
+    engine_quadrants = AsOfEngine(cpi, gdp, pol, unrt, lags=NO_LAGS).regimes(asof)["quadrant"]
+    assert (surfaces["quadrant"].loc[starts[0]].to_numpy() == engine_quadrants.to_numpy()).all()
+
+    table = summary(surfaces)
+    assert table.loc[starts[0], "inflation_gap"] == 0
+    assert np.allclose(table["quadrant_known"], 1)
+
+
+def test_short_windows_are_zone_grise():
+    cpi, gdp, pol, unrt = synthetic_macro(years=5, seed=1)
+    starts = pd.DatetimeIndex(["2020-01-01", "2024-06-01"])
+    surfaces = surface(cpi, gdp, pol, unrt, starts, pd.DatetimeIndex(["2024-10-31"]))
+    assert surfaces["quadrant"].iloc[:, 0].tolist()[1] == 4
+    assert surfaces["infl_lvl"].iloc[1, 0] == -1
+    assert summary(surfaces)["quadrant_known"].tolist() == [1.0, 0.0]
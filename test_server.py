@@ -0,0 +1,71 @@
+import json
+import threading
+import time
+from datetime import datetime
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from server import RegimeService, TTLCache, fixture_cache, make_server
+from synthetic import write_fixtures
+
+
+@pytest.fixture(scope="module")
+def url(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("fixtures")
+    write_fixtures(str(directory), regions=["FR", "DE"], years=30)
+    server = make_server(RegimeService(fixture_cache(str(directory)), datetime(2000, 1, 1)), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://{server.server_address[0]}:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    try:
+        with urlopen(url) as response:
+            return response.status, json.load(response)
+    except HTTPError as exc:
+        return exc.code, json.load(exc)
+
+
+def test_regime_and_history(url):
+    status, regions = get(f"{url}/regions")
+    assert status == 200 and "FR" in regions
+    status, regime = get(f"{url}/regime/fr")
+    assert status == 200
+    assert regime["region"] == "FR" and regime["duration"]["current"] >= 1
+    status, history = get(f"{url}/history/DE?start=2010-01")
+    assert status == 200
+    assert history[0]["date"] >= "2010" and history[-1]["date"] <= "2025"
+
+
+def test_errors_are_json(url):
+    assert get(f"{url}/regime/XX")[0] == 404
+    assert get(f"{url}/nowhere")[0] == 404
+    assert get(f"{url}/regime/FR?start=soon")[0] == 400
+    # région sans fixtures : FileNotFoundError du CsvFixtureFetcher
+    assert get(f"{url}/regime/US")[0] == 500
+
+
+def test_unexpected_errors_return_500(url, monkeypatch):
+    def fail(self, region, start=None):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(RegimeService, "history", fail)
+    status, payload = get(f"{url}/history/FR")
+    assert status == 500 and "KeyError" in payload["error"]
+
+
+def test_ttl_cache_expires_and_stays_bounded():
+    cache = TTLCache(ttl=0.05, max_entries=3)
+    calls = []
+    for key in range(10):
+        cache.get(key, lambda: calls.append(key))
+    assert len(cache) == 3
+    assert cache.get(9, lambda: "recomputed") is None
+    time.sleep(0.06)
+    assert cache.get(9, lambda: "recomputed") == "recomputed"
+    assert len(cache) == 1
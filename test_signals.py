@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from regime_duration import detect_previous_regime
+from signals import TREND_LABELS, persistence_codes, signal_frame, trend_codes
+from synthetic import synthetic_macro
+from transforms import monthly_frame
+
+
+SERIES = pd.Series([1.0, 2.0, 1.5, 1.5, 3.0, 2.0, 1.0, 1.2, 1.1, 0.5],
+                   index=pd.date_range("2020-01-31", periods=10, freq="ME"), name="x")
+
+
+def _scalar_trend(values, kind):
+    # règles du detect_previous_regime d'origine sur les trois derniers points,
+    # ++ testé en premier et GDP comparé à lui-même (sg1)
+    down, up = values[-1] < values[-2], values[-1] > values[-2]
+    down_plus, up_plus = values[-1] < values[-3], values[-1] > values[-3]
+    names = TREND_LABELS[kind]
+    return str(np.select([down & down_plus, up & up_plus, down, up], [names[0], names[4], names[1], names[3]],
+                         default=names[2]))
+
+
+def test_trend_codes_of_a_fixed_series():
+    codes = trend_codes(SERIES)
+    assert codes.index.equals(SERIES.index) and codes.dtype == np.int8
+    assert codes.tolist() == [0, 1, -1, 0, 2, -1, -2, 1, -1, -2]
+    assert trend_codes(SERIES.to_numpy(), short=1, long=3).tolist() == [0, 1, -1, 0, 2, -1, -2, 1, -2, -2]
+    assert persistence_codes([-1.0, -0.5, 0.2, 0.3, 0.0, -0.1]).tolist() == [0, -1, 0, 1, 0, 0]
+
+
+def test_every_month_matches_the_scalar_rules():
+    x = SERIES.to_numpy()
+    for kind in ("inflation", "gdp"):
+        labels = [TREND_LABELS[kind][code + 2] for code in trend_codes(x)[2:]]
+        assert labels == [_scalar_trend(x[:i + 1], kind) for i in range(2, len(x))]
+
+
+def test_detect_previous_regime_signals_are_the_last_row():
+    frame = monthly_frame(*synthetic_macro(years=15, seed=6))
+    inflation, gdp_m = frame["cpi_yoy"].dropna(), frame["gdp_yoy"].dropna()
+    unrt_chg = frame["unrt_chg"].dropna()
+    for short, long, periods in ((1, 2, 2), (1, 6, 3), (3, 12, 4)):
+        analysis = detect_previous_regime(inflation, None, gdp_m, unrt_chg, short, long, periods)
+        last = signal_frame(inflation, gdp_m, unrt_chg, short, long, periods)
+        assert analysis.seasonality_infl_codes == last["inflation_signal"].loc[inflation.index[-1]]
+        assert analysis.seasonality_gdp_codes == last["gdp_signal"].loc[gdp_m.index[-1]]
+        assert analysis.seasonality_unrt_codes == last["unemployment_signal"].loc[unrt_chg.index[-1]]
+    assert detect_previous_regime(inflation, None, gdp_m, unrt_chg).seasonality_gdp_codes == \
+        _scalar_trend(gdp_m.to_numpy(), "gdp")
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from streaming import RegimeState
+from synthetic import synthetic_macro
+from transforms import monthly_frame
+
+
+def test_state_round_trips_through_json(tmp_path):
+    frame = monthly_frame(*synthetic_macro(years=10, seed=2))
+    state = RegimeState.from_frame(frame.iloc[:-12])
+    path = tmp_path / "state.json"
+    state.save(path)
+    resumed = RegimeState.load(path)
+    assert json.loads(json.dumps(state.to_dict())) == resumed.to_dict()
+
+    for date, row in frame.iloc[-12:].iterrows():
+        obs = {"date": date.date(), **row[["cpi", "gdp", "pol", "unrt"]].to_dict()}
+        expected, snapshot = state.update(obs), resumed.update(obs)
+    assert snapshot == expected
+    assert RegimeState.from_frame(frame).latest == snapshot
+
+
+def test_replayed_and_older_months_are_not_counted():
+    frame = monthly_frame(*synthetic_macro(years=5, seed=1))
+    state = RegimeState.from_frame(frame)
+    before = state.to_dict()
+    date, row = next(frame.iloc[::-1].iterrows())
+    obs = {"date": date.date(), **row[["cpi", "gdp", "pol", "unrt"]].to_dict()}
+    assert state.update(obs) == before["latest"]
+    assert state.update({**obs, "date": str(date.date())}) == before["latest"]
+    assert state.to_dict() == before
+    with pytest.raises(ValueError):
+        state.update({**obs, "date": frame.index[-2].date()})
+    assert state.to_dict() == before
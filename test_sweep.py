@@ -0,0 +1,24 @@
+import numpy as np
+
+from bands import GROWTH_STEPS, INFLATION_STEPS, band_index, classify
+from sweep import evaluate, grid, regime_codes, sweep
+
+
+def test_codes_are_unique_with_many_growth_bands():
+    gdp_edges = tuple(np.arange(-4, 6.5, 0.5))             # 21 bornes, 22 bandes
+    infl, gdp = np.meshgrid([-1, 0.5, 1.5], np.arange(-5, 7, 0.5), indexing="ij")
+    codes = regime_codes(infl.ravel(), gdp.ravel(), (0, 1), gdp_edges)
+    bands = {(i, g) for i, g in zip(band_index(infl.ravel(), {"edges": (0, 1)}), band_index(gdp.ravel(), {"edges": gdp_edges}))}
+    assert len(np.unique(codes)) == len(bands) == 3 * 22
+
+
+def test_sweep_matches_evaluate():
+    rng = np.random.default_rng(0)
+    inflation = np.repeat(rng.normal(2, 1.5, 20), 12)
+    growth = np.repeat(rng.normal(1, 2, 20), 12)
+    returns = rng.normal(0.005, 0.03, (240, 4))
+    configs = grid(infl_threshold=[1.5, 2], gdp_edges=[(-2, 0, 2, 4), (-1, 1, 3)])
+    frame = sweep({"AA": (inflation, growth)}, configs, {"AA": returns}, max_workers=2)
+    expected = evaluate(classify(inflation, INFLATION_STEPS), classify(growth, GROWTH_STEPS), configs, returns)
+    assert frame["changes"].tolist() == [row["changes"] for row in expected]
+    np.testing.assert_allclose(frame["sharpe"], [row["sharpe"] for row in expected])
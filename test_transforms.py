@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from synthetic import synthetic_macro
+from transforms import monthly_frame, to_monthly
+
+
+def _until(frame, end):
+    return frame.loc[:end]
+
+
+def test_no_column_is_extended_past_its_last_observation():
+    cpi, gdp, pol, unrt = synthetic_macro(years=10, seed=2)
+    daily = pol.resample("D").ffill()                      # taux directeur quotidien, comme l'ECB
+    frame = monthly_frame(_until(cpi, "2024-06"), _until(gdp, "2024-04"), daily, _until(unrt, "2024-06"))
+    assert frame.index[-1] == pd.Timestamp("2024-12-31")
+    for column in ("cpi", "cpi_yoy", "unrt", "unrt_chg"):
+        assert frame[column].last_valid_index() == pd.Timestamp("2024-06-30")
+    # le T2 couvre avril à juin
+    assert frame["gdp"].last_valid_index() == pd.Timestamp("2024-06-30")
+    assert frame["gdp_yoy"].last_valid_index() == pd.Timestamp("2024-06-30")
+
+
+def test_gaps_inside_a_series_are_carried_forward():
+    cpi, gdp, pol, unrt = synthetic_macro(years=5, seed=0)
+    frame = monthly_frame(cpi.drop(pd.Timestamp("2023-05-01")), gdp, pol, unrt)
+    assert frame.loc["2023-05-31", "cpi"] == frame.loc["2023-04-30", "cpi"]
+
+
+def test_quarterly_values_cover_the_months_of_their_quarter():
+    gdp = pd.DataFrame({"GDP": [1.0, 2.0]}, index=pd.DatetimeIndex(["2024-01-01", "2024-04-01"], name="DATE"))
+    monthly = to_monthly(gdp, quarterly=True)
+    assert monthly.tolist() == [1.0, 1.0, 1.0, 2.0, 2.0, 2.0]
+    assert monthly.index[-1] == pd.Timestamp("2024-06-30")
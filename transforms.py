@@ -0,0 +1,107 @@
+"""
+Vectorized transforms of the raw FRED series (YoY, QoQ, rolling means).
+
+Every function keeps the date index. ``monthly_frame`` puts the four series
+of a region on one month-end axis so downstream code can work on aligned
+columns instead of positionally truncated lists.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def as_series(data):
+    """
+    Returns the single column of a FRED DataFrame as a Series (Series pass through).
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.iloc[:, 0]
+    return data
+
+
+def pct_change(data, periods):
+    """
+    Percentage change over `periods` observations, in %.
+    """
+    return as_series(data).pct_change(periods, fill_method=None) * 100
+
+
+def yoy(data, periods=12):
+    """
+    Year-over-year change in % (periods=12 for monthly, 4 for quarterly data).
+    """
+    return pct_change(data, periods)
+
+
+def month_ends(index):
+    """
+    Month-end timestamps of a DatetimeIndex, keeping its resolution
+    (datetime64[s] indexes can span more than the ns range of 1677-2262).
+    """
+    unit = np.datetime_data(index.dtype)[0]
+    months = index.values.astype("datetime64[M]")
+    return pd.DatetimeIndex(((months + 1).astype("datetime64[D]") - 1).astype(f"datetime64[{unit}]"), name=index.name)
+
+
+def to_monthly(data, quarterly=False):
+    """
+    Month-end series: quarterly values are carried over the three months of
+    their quarter (the last one included), higher frequencies (daily policy
+    rates) are averaged.
+
+    Same result as resample("ME") but grouped on datetime64[M] keys: resample
+    builds its bins one Python object per month and mislabels indexes that
+    start before 1677.
+    """
+    series = as_series(data)
+    if series.empty:
+        return series.resample("ME").mean()
+    months = series.index.values.astype("datetime64[M]")
+    grouped = series.groupby(months, sort=True)
+    full = np.arange(months.min(), months.max() + (3 if quarterly else 1))
+    if quarterly:
+        monthly = grouped.last().reindex(full).ffill()
+    else:
+        monthly = grouped.mean().reindex(full)
+    monthly.index = month_ends(pd.DatetimeIndex(full.astype(series.index.dtype), name=series.index.name))
+    return monthly
+
+
+def monthly_frame(cpi, gdp, pol, unrt):
+    """
+    Aligned month-end frame of a region:
+
+        cpi, cpi_yoy          indice des prix et inflation YoY
+        gdp, gdp_yoy, gdp_qoq PIB mensualisé, variation YoY et QoQ
+        pol, pol_mean         taux directeur et moyenne mobile 3 mois
+        unrt, unrt_mean       chômage et moyenne mobile 3 mois
+        unrt_yoy, unrt_chg    variation YoY (%) et sur 3 mois (points)
+
+    Transforms are computed on each series' own history, then the columns are
+    joined on a common axis. Gaps inside a column are carried forward, but no
+    column is extended past its last observation: the trailing rows of a
+    series that ends earlier stay NaN (use last_valid_index / dropna).
+    """
+    cpi_m = to_monthly(cpi)
+    gdp_m = to_monthly(gdp, quarterly=True)
+    pol_m = to_monthly(pol)
+    unrt_m = to_monthly(unrt)
+
+    frame = pd.concat(
+        {
+            "cpi": cpi_m,
+            "cpi_yoy": yoy(cpi_m),
+            "gdp": gdp_m,
+            "gdp_yoy": yoy(gdp_m),
+            "gdp_qoq": pct_change(gdp_m, 3),
+            "pol": pol_m,
+            "pol_mean": pol_m.rolling(3).mean(),
+            "unrt": unrt_m,
+            "unrt_mean": unrt_m.rolling(3).mean(),
+            "unrt_yoy": yoy(unrt_m),
+            "unrt_chg": unrt_m.diff(3),
+        },
+        axis=1,
+    )
+    frame.index.name = "DATE"
+    return frame.ffill(limit_area="inside")